@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""Compare upload encoders: encode time against upload bytes saved.
+
+Usage:
+    python benchmarks/bench_encoders.py [recording.wav] [--uplink-mbps 5]
+
+Without a file, a synthetic 30 second speech-like clip is used.
+"""
+import argparse
+import time
+
+import numpy as np
+
+from common import load_clip
+from src.core.encoders import ENCODERS, WavEncoder, get_encoder
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("wav", nargs="?", help="16-bit WAV file to encode")
+    parser.add_argument("--seconds", type=float, default=30.0, help="synthetic clip length")
+    parser.add_argument("--uplink-mbps", type=float, default=5.0, help="assumed upload bandwidth")
+    parser.add_argument("--repeat", type=int, default=5, help="encodes per format")
+    args = parser.parse_args()
+
+    samples, rate, channels = load_clip(args.wav, args.seconds)
+    duration = samples.size / (rate * channels)
+    bytes_per_second = args.uplink_mbps * 1e6 / 8
+    wav_bytes = len(WavEncoder().encode(samples, rate, channels))
+
+    print(f"Clip: {duration:.1f}s, {rate} Hz, {channels} ch; uplink {args.uplink_mbps} Mbps")
+    print(f"{'format':<8}{'bytes':>10}{'ratio':>8}{'encode ms':>11}{'upload ms':>11}{'net saved ms':>14}")
+    for name in ENCODERS:
+        encoder = get_encoder(name)
+        if encoder.name != name:
+            print(f"{name:<8}  unavailable")
+            continue
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            data = encoder.encode(samples, rate, channels)
+            timings.append(time.perf_counter() - start)
+        encode_ms = float(np.median(timings)) * 1000
+        upload_ms = len(data) / bytes_per_second * 1000
+        saved_ms = (wav_bytes - len(data)) / bytes_per_second * 1000 - encode_ms
+        print(f"{name:<8}{len(data):>10}{len(data) / wav_bytes:>8.2f}"
+              f"{encode_ms:>11.1f}{upload_ms:>11.1f}{saved_ms:>14.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Time transcript history writes and searches at a large size.
+
+Usage:
+    python benchmarks/bench_history.py [--entries 100000] [--no-fts]
+
+Fills a temporary history with synthetic dictations through the writer
+thread, then reports p50/p95 latency of prefix and full-text searches as
+typed into the History dialog. ``--no-fts`` measures the LIKE fallback.
+"""
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from common import percentiles
+from src.core.history import History, HistoryEntry
+
+WORDS = (
+    "meeting notes project deadline budget review customer email draft reply "
+    "schedule tomorrow morning afternoon summary action items follow up design "
+    "release feature bug fix deploy server database query latency benchmark "
+    "proposal contract invoice travel flight hotel dinner reminder call team"
+).split()
+
+QUERIES = ["m", "me", "meet", "meeting notes", "budget rev", "latency bench", "zzz", "hotel dinner call"]
+
+
+def fake_entry(rng: random.Random, created: float) -> HistoryEntry:
+    words = rng.choices(WORDS, k=rng.randint(8, 60))
+    transcript = " ".join(words)
+    return HistoryEntry(
+        text=transcript.capitalize() + ".", transcript=transcript, created=created,
+        audio_seconds=len(words) * 0.4,
+        latencies={"transcribe_ms": rng.uniform(300, 900), "post_process_ms": rng.uniform(200, 700)}
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=100000)
+    parser.add_argument("--limit", type=int, default=100, help="rows per search, as in the dialog")
+    parser.add_argument("--repeat", type=int, default=20, help="runs per query")
+    parser.add_argument("--no-fts", action="store_true", help="measure the LIKE fallback")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as directory:
+        history = History(Path(directory) / "history.sqlite3")
+        if args.no_fts:
+            history.full_text = False
+
+        start = time.perf_counter()
+        add_times = []
+        for i in range(args.entries):
+            entry = fake_entry(rng, 1.7e9 + i)
+            t = time.perf_counter()
+            history.add(entry)
+            add_times.append(time.perf_counter() - t)
+        queued = time.perf_counter() - start
+        history.flush()
+        written = time.perf_counter() - start
+        p50, p99 = percentiles(add_times, (50, 99))
+        print(f"{len(history)} entries ({'FTS5' if history.full_text else 'LIKE'}): "
+              f"written in {written:.1f}s ({args.entries / written:.0f}/s); "
+              f"add() p50 {p50 * 1e6:.1f} us, p99 {p99 * 1e6:.1f} us, queued in {queued:.2f}s")
+
+        print(f"{'query':<20}{'rows':>6}{'p50 ms':>9}{'p95 ms':>9}")
+        for query in [""] + QUERIES:
+            times = []
+            for _ in range(args.repeat):
+                t = time.perf_counter()
+                rows = history.search(query, limit=args.limit)
+                times.append(time.perf_counter() - t)
+            p50, p95 = percentiles(times, (50, 95))
+            print(f"{query or '(recent)':<20}{len(rows):>6}{p50 * 1000:>9.2f}{p95 * 1000:>9.2f}")
+        history.close()
+
+
+if __name__ == '__main__':
+    main()
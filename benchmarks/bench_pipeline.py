@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""End-to-end latency of recorder -> transcription -> clipboard against a mock API.
+
+Usage:
+    python benchmarks/bench_pipeline.py [recording.wav] [--seconds 10] [--runs 30]
+        [--latency-ms 300] [--jitter-ms 100] [--failure-rate 0] [--token-ms 15]
+        [--format flac] [--no-stream] [--speed 20]
+
+Each run replays the clip through AudioRecorder, then times what the user
+waits for after clicking stop: draining, trimming and encoding the
+recording, the Whisper request, GPT post-processing (time to first token
+and to the end of the stream) and the clipboard copy. Requests go to
+benchmarks/mock_openai.py, so no API key or network is needed and server
+latency is under control. The spans recorded inside the pipeline
+(src/core/metrics.py) are listed afterwards. Failed requests are retried by the OpenAI client
+as in the app, which shows up in the tail percentiles.
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from common import load_clip, percentiles
+from mock_openai import MockOpenAIServer
+from src.core import audio_recorder
+from src.core.audio_recorder import AudioRecorder
+from src.core.audio_source import ReplaySource
+from src.core.config import DEFAULT_SETTINGS, ConfigStore
+from src.core.encoders import get_encoder
+from src.core.metrics import get_metrics
+from src.core.transcription import TranscriptionService
+
+STAGES = ("stop", "transcribe", "first token", "post-process", "clipboard", "total")
+
+
+def copy_to_clipboard():
+    """pyperclip.copy, or None where no clipboard is available (headless CI)."""
+    try:
+        import pyperclip
+        pyperclip.copy("")
+        return pyperclip.copy
+    except Exception as e:
+        print(f"Clipboard unavailable, skipping that stage: {e}")
+        return None
+
+
+def run_once(recorder, source, service, stream: bool, copy) -> dict:
+    timings = {}
+    recorder.start_recording()
+    source.wait()
+
+    start = time.perf_counter()
+    audio = recorder.stop_recording()
+    stopped = time.perf_counter()
+    timings["stop"] = stopped - start
+
+    transcript = service.whisper_transcribe(audio)
+    transcribed = time.perf_counter()
+    timings["transcribe"] = transcribed - stopped
+
+    first = []
+    on_partial = (lambda text: first or first.append(time.perf_counter())) if stream else None
+    text = service.post_process_transcript(transcript, on_partial=on_partial)
+    processed = time.perf_counter()
+    timings["post-process"] = processed - transcribed
+    if first:
+        timings["first token"] = first[0] - transcribed
+
+    if copy is not None:
+        copy(text)
+        timings["clipboard"] = time.perf_counter() - processed
+    timings["total"] = time.perf_counter() - start
+    audio.discard()
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("wav", nargs="?", help="16-bit WAV file to replay")
+    parser.add_argument("--seconds", type=float, default=10.0, help="synthetic clip length")
+    parser.add_argument("--runs", type=int, default=30)
+    parser.add_argument("--speed", type=float, default=20.0, help="replay pace as a multiple of realtime")
+    parser.add_argument("--format", default="flac", help="upload format: wav, flac or opus")
+    parser.add_argument("--no-stream", action="store_true", help="post-process without streaming")
+    parser.add_argument("--latency-ms", type=float, default=300.0, help="mock server delay per request")
+    parser.add_argument("--jitter-ms", type=float, default=100.0, help="uniform +/- variation of the delay")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="fraction of requests that fail")
+    parser.add_argument("--token-ms", type=float, default=15.0, help="delay between streamed words")
+    args = parser.parse_args()
+
+    samples, rate, channels = load_clip(args.wav, args.seconds)
+    source = ReplaySource(samples, rate, channels, realtime=True, speed=args.speed)
+    server = MockOpenAIServer(
+        args.latency_ms, args.jitter_ms, args.failure_rate, token_ms=args.token_ms, seed=0
+    ).start()
+    copy = copy_to_clipboard()
+    metrics = get_metrics()
+    metrics.enabled = True
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        audio_recorder.TEMP_DIR = Path(temp_dir)
+        config = ConfigStore(Path(temp_dir) / "config")
+        config.set_api_key("sk-mock")
+        # Every run must reach the server, so the transcript cache and memo are off
+        settings = dict(
+            DEFAULT_SETTINGS, api_base_url=server.url, transcript_cache=False,
+            post_process_memo=False, asr_backend="api", parallel_workers=1
+        )
+        service = TranscriptionService(settings, config)
+        recorder = AudioRecorder(source=source, encoder=get_encoder(args.format), native_rate=True)
+        print(f"Clip: {source.duration:.1f}s, {rate} Hz, {channels} ch; "
+              f"server {args.latency_ms:g} +/- {args.jitter_ms:g} ms, "
+              f"{args.failure_rate:.0%} failures; {args.runs} runs")
+
+        results = {stage: [] for stage in STAGES}
+        errors = 0
+        for _ in range(args.runs):
+            try:
+                timings = run_once(recorder, source, service, not args.no_stream, copy)
+            except Exception as e:
+                errors += 1
+                print(f"Run failed: {e}")
+                continue
+            for stage, seconds in timings.items():
+                results[stage].append(seconds * 1000)
+
+        recorder.cleanup()
+        service.close()
+    server.stop()
+
+    print(f"{'stage':<14}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for stage in STAGES:
+        values = results[stage]
+        if values:
+            p50, p95, p99 = percentiles(values)
+            print(f"{stage:<14}{p50:>10.1f}{p95:>10.1f}{p99:>10.1f}{max(values):>10.1f}")
+    print(f"\n{'span':<26}{'count':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'avg bytes':>11}")
+    for name, stats in metrics.snapshot().items():
+        print(f"{name:<26}{stats['count']:>6}{stats['p50_ms']:>10.1f}{stats['p95_ms']:>10.1f}"
+              f"{stats['p99_ms']:>10.1f}{stats['mean_bytes']:>11.0f}")
+    print(f"{errors} failed runs; server saw {sum(server.requests.values())} requests, "
+          f"{sum(server.failures.values())} failed")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Measure recorder, VAD and encoder throughput on replayed audio.
+
+Usage:
+    python benchmarks/bench_recorder.py [recording.wav] [--seconds 60] [--speed 0]
+
+The clip is fed through AudioRecorder with a ReplaySource, so no microphone
+is needed. Throughput is reported as a real-time factor: seconds of audio
+processed per second of wall-clock time.
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from common import load_clip
+from src.core import audio_recorder
+from src.core.audio_recorder import AudioRecorder
+from src.core.audio_source import ReplaySource
+from src.core.encoders import ENCODERS, get_encoder
+from src.core.vad import VoiceActivityDetector
+
+
+def report(stage: str, audio_seconds: float, elapsed: float, extra: str = "") -> None:
+    rtf = audio_seconds / elapsed if elapsed > 0 else float('inf')
+    print(f"{stage:<22}{elapsed * 1000:>10.1f} ms{rtf:>12.0f}x realtime  {extra}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("wav", nargs="?", help="16-bit WAV file to replay")
+    parser.add_argument("--seconds", type=float, default=60.0, help="synthetic clip length")
+    parser.add_argument("--speed", type=float, default=0.0,
+                        help="replay pace as a multiple of realtime (1 = like a microphone, "
+                             "0 = as fast as the recorder keeps up)")
+    parser.add_argument("--record-to-disk", action="store_true", help="use the streaming WAV buffer")
+    args = parser.parse_args()
+
+    samples, rate, channels = load_clip(args.wav, args.seconds)
+    source = ReplaySource(samples, rate, channels, realtime=args.speed > 0, speed=args.speed or 1.0)
+    duration = source.duration
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        audio_recorder.TEMP_DIR = Path(temp_dir)
+        recorder = AudioRecorder(source=source, record_to_disk=args.record_to_disk)
+        recorder.vad = None
+        print(f"Clip: {duration:.1f}s, {rate} Hz, {channels} ch")
+
+        start = time.perf_counter()
+        recorder.start_recording()
+        source.wait()
+        capture = time.perf_counter() - start
+        report("capture", duration, capture, f"replayed at {args.speed:g}x" if args.speed else "unpaced")
+        stats = recorder.stats
+        print(f"{'':<22}input overflows {stats.input_overflows}, "
+              f"dropped blocks {stats.dropped_blocks}, queued {stats.queued_blocks}")
+
+        # Keep the captured samples; the disk buffer moves to a new file on stop
+        pcm = recorder.buffer.view()
+        start = time.perf_counter()
+        recorder.stop_recording().discard()
+        report("stop (wav)", duration, time.perf_counter() - start)
+
+        vad = VoiceActivityDetector(rate)
+        start = time.perf_counter()
+        result = vad.trim(pcm)
+        report("vad trim", duration, time.perf_counter() - start,
+               f"{result.removed_seconds:.1f}s removed")
+
+        for name in ENCODERS:
+            encoder = get_encoder(name)
+            if encoder.name != name:
+                continue
+            start = time.perf_counter()
+            data = encoder.encode(result.samples, rate, channels)
+            report(f"encode {name}", result.kept_seconds, time.perf_counter() - start,
+                   f"{len(data)} bytes")
+        recorder.cleanup()
+
+
+if __name__ == '__main__':
+    main()
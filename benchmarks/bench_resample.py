@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""Measure StreamingResampler throughput at common device rates.
+
+Usage:
+    python benchmarks/bench_resample.py [--seconds 10 30 120] [--block 2048]
+
+Audio is fed block by block, as the recorder's callback does, and the
+real-time factor (audio seconds per CPU second) is reported for each
+length so linear scaling is easy to check.
+"""
+import argparse
+import time
+
+import numpy as np
+
+import common  # noqa: F401  (puts the repo root on sys.path)
+from src.core.resample import StreamingResampler
+
+TARGET_RATE = 16000
+
+
+def run(rate: int, seconds: float, block: int) -> float:
+    t = np.arange(int(rate * seconds)) / rate
+    samples = (np.sin(2 * np.pi * 440 * t) * 0.3).astype(np.float32)
+    resampler = StreamingResampler(rate, TARGET_RATE)
+    start = time.perf_counter()
+    for offset in range(0, samples.size, block):
+        resampler.process(samples[offset:offset + block])
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, nargs="+", default=[10.0, 30.0, 120.0])
+    parser.add_argument("--block", type=int, default=2048, help="samples per callback block")
+    parser.add_argument("--rates", type=int, nargs="+", default=[44100, 48000])
+    args = parser.parse_args()
+
+    print(f"{'rate':>7}{'seconds':>9}{'cpu ms':>10}{'x realtime':>12}{'us/block':>10}")
+    for rate in args.rates:
+        for seconds in args.seconds:
+            elapsed = run(rate, seconds, args.block)
+            blocks = -(-int(rate * seconds) // args.block)
+            print(f"{rate:>7}{seconds:>9.0f}{elapsed * 1000:>10.1f}"
+                  f"{seconds / elapsed:>12.0f}{elapsed / blocks * 1e6:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""Shared helpers for the benchmark scripts."""
+import os
+import sys
+import wave
+
+import numpy as np
+
+# Add the project root directory to the Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+RATE = 16000
+
+
+def synthetic_speech(seconds: float, rate: int = RATE) -> np.ndarray:
+    """Amplitude-modulated harmonics with pauses, roughly shaped like speech."""
+    rng = np.random.default_rng(0)
+    t = np.arange(int(seconds * rate)) / rate
+    pitch = 120 + 30 * np.sin(2 * np.pi * 0.3 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / rate
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 8))
+    syllables = np.clip(np.sin(2 * np.pi * 4 * t), 0, None)
+    pauses = (np.sin(2 * np.pi * 0.2 * t) > -0.6).astype(np.float64)
+    signal = voiced * syllables * pauses + rng.standard_normal(t.size) * 0.001
+    return (signal / np.abs(signal).max() * 12000).astype(np.int16)
+
+
+def load_wav(path: str) -> tuple:
+    """Return (int16 samples, rate, channels) from a 16-bit WAV file."""
+    with wave.open(path, 'rb') as wf:
+        if wf.getsampwidth() != 2:
+            raise SystemExit("Only 16-bit WAV files are supported")
+        samples = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+        return samples, wf.getframerate(), wf.getnchannels()
+
+
+def load_clip(path: str, seconds: float) -> tuple:
+    """Load a WAV file, or synthesise a clip of the given length."""
+    if path:
+        return load_wav(path)
+    return synthetic_speech(seconds), RATE, 1
+
+
+def percentiles(values, points=(50, 95, 99)) -> list:
+    """The given percentiles of ``values``, or zeros if there are none."""
+    if len(values) == 0:
+        return [0.0] * len(points)
+    return [float(v) for v in np.percentile(values, points)]
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""Local stand-in for the OpenAI endpoints the app calls.
+
+Usage:
+    python benchmarks/mock_openai.py [--port 8765] [--latency-ms 300] [--jitter-ms 100]
+                                     [--failure-rate 0.05] [--token-ms 15]
+
+Then point the app at it with OPENAI_BASE_URL=http://127.0.0.1:8765/v1 (or
+the ``api_base_url`` setting). ``/audio/transcriptions`` answers with a fixed
+transcript; ``/chat/completions`` echoes the user message back, streamed a
+word at a time when asked to. Every request waits ``latency_ms`` plus up to
+``jitter_ms`` either way, and fails with ``failure_status`` at
+``failure_rate``. Only the standard library is used, so tests can import it.
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+DEFAULT_TRANSCRIPT = "this is a mock transcript of the recording it has no punctuation"
+
+_RESPONSE_FORMAT = re.compile(rb'name="response_format"\r\n\r\n(\w+)')
+
+
+class MockOpenAIServer:
+    """Threaded HTTP server imitating ``/v1/audio/transcriptions`` and ``/v1/chat/completions``."""
+
+    def __init__(
+        self,
+        latency_ms: float = 300.0,
+        jitter_ms: float = 0.0,
+        failure_rate: float = 0.0,
+        failure_status: int = 500,
+        token_ms: float = 10.0,
+        transcript: str = DEFAULT_TRANSCRIPT,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        seed: Optional[int] = None
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.failure_rate = failure_rate
+        self.failure_status = failure_status
+        self.token_ms = token_ms  # Delay between streamed chat tokens
+        self.transcript = transcript
+        self.requests = Counter()  # Path -> requests served
+        self.failures = Counter()
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), _make_handler(self))
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL to hand to the OpenAI client."""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "MockOpenAIServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="mock-openai", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "MockOpenAIServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _delay(self) -> float:
+        """Seconds to wait before answering a request."""
+        with self._random_lock:
+            jitter = self._random.uniform(-self.jitter_ms, self.jitter_ms)
+        return max(0.0, self.latency_ms + jitter) / 1000
+
+    def _should_fail(self) -> bool:
+        with self._random_lock:
+            return self._random.random() < self.failure_rate
+
+
+def _make_handler(server: MockOpenAIServer):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # Keep-alive, like the real API
+
+        def do_HEAD(self):
+            # The app's connection warm-up; the real API answers 404 without a key
+            self._send(404, b"", "application/json")
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            path = self.path.split("?")[0].rstrip("/")
+            server.requests[path] += 1
+            time.sleep(server._delay())
+            if server._should_fail():
+                server.failures[path] += 1
+                self._send_json(server.failure_status, {
+                    "error": {"message": "Mock failure", "type": "server_error", "code": None}
+                })
+            elif path.endswith("/audio/transcriptions"):
+                self._transcription(body)
+            elif path.endswith("/chat/completions"):
+                self._chat(json.loads(body))
+            else:
+                self._send_json(404, {"error": {"message": f"Unknown path {path}", "type": "invalid_request_error"}})
+
+        def _transcription(self, body: bytes):
+            match = _RESPONSE_FORMAT.search(body)
+            if match is None or match.group(1) == b"json":
+                self._send_json(200, {"text": server.transcript})
+            else:
+                self._send(200, server.transcript.encode(), "text/plain; charset=utf-8")
+
+        def _chat(self, request: dict):
+            user = next((m["content"] for m in reversed(request["messages"]) if m["role"] == "user"), "")
+            text = (user[:1].upper() + user[1:]).rstrip(".") + "." if user else ""
+            base = {"id": "chatcmpl-mock", "created": int(time.time()), "model": request.get("model", "")}
+            if not request.get("stream"):
+                time.sleep(len(text.split()) * server.token_ms / 1000)
+                self._send_json(200, dict(base, object="chat.completion", choices=[{
+                    "index": 0, "finish_reason": "stop",
+                    "message": {"role": "assistant", "content": text}
+                }], usage={"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}))
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for i, word in enumerate(text.split(" ")):
+                delta = {"content": word if i == 0 else " " + word}
+                self._send_event(dict(base, object="chat.completion.chunk", choices=[
+                    {"index": 0, "delta": delta, "finish_reason": None}
+                ]))
+                time.sleep(server.token_ms / 1000)
+            self._send_chunk(b"data: [DONE]\n\n")
+            self._send_chunk(b"")
+
+        def _send_event(self, payload: dict):
+            self._send_chunk(f"data: {json.dumps(payload)}\n\n".encode())
+
+        def _send_chunk(self, data: bytes):
+            self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+            self.wfile.flush()
+
+        def _send_json(self, status: int, payload: dict):
+            self._send(status, json.dumps(payload).encode(), "application/json")
+
+        def _send(self, status: int, body: bytes, content_type: str):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if self.command != "HEAD":
+                self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=300.0, help="delay before every response")
+    parser.add_argument("--jitter-ms", type=float, default=100.0, help="uniform +/- variation of the delay")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="fraction of requests that fail")
+    parser.add_argument("--failure-status", type=int, default=500, help="HTTP status of failed requests")
+    parser.add_argument("--token-ms", type=float, default=15.0, help="delay between streamed words")
+    args = parser.parse_args()
+
+    server = MockOpenAIServer(
+        args.latency_ms, args.jitter_ms, args.failure_rate, args.failure_status,
+        args.token_ms, port=args.port
+    )
+    print(f"Mock OpenAI API listening on {server.url} (Ctrl+C to stop)")
+    server.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -79,5 +79,6 @@ setup(
     packages=find_packages(),
     include_package_data=True,
     options={'py2app': OPTIONS},
+    entry_points={'console_scripts': ['talk-button=src.cli:main']},
     setup_requires=['py2app'],
 ) 
\ No newline at end of file
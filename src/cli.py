@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Command line entry point.
+
+    talk-button                  start the app
+    talk-button batch INPUT...   transcribe WAV/FLAC files without the UI
+"""
+import argparse
+import contextlib
+import multiprocessing
+import os
+import sys
+from pathlib import Path
+
+# Add the project root directory to the Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.core.batch import BatchResult, BatchTranscriber, find_audio_files
+from src.core.transcription import TranscriptionService
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="talk-button", description="Voice-to-text with OpenAI.")
+    commands = parser.add_subparsers(dest="command")
+    batch = commands.add_parser(
+        "batch",
+        help="transcribe a directory or glob of WAV/FLAC files",
+        description="Transcribe and post-process audio files with the app's settings, "
+                    "system prompt and transcript cache. Results are appended to a JSONL "
+                    "file; rerunning with the same output skips files already done."
+    )
+    batch.add_argument("inputs", nargs="+", help="audio files, directories or glob patterns")
+    batch.add_argument("-o", "--output", type=Path, default=Path("transcripts.jsonl"),
+                       help="JSONL file to append results to (default: transcripts.jsonl)")
+    batch.add_argument("-j", "--jobs", type=int, default=4,
+                       help="files transcribed at once (default: 4)")
+    batch.add_argument("-r", "--recursive", action="store_true", help="descend into subdirectories")
+    batch.add_argument("--raw", action="store_true", help="skip GPT post-processing")
+    batch.add_argument("-v", "--verbose", action="store_true", help="show the service's log output")
+    return parser
+
+
+def print_result(index: int, total: int, result: BatchResult) -> None:
+    name = Path(result.path).name
+    if result.status == "ok":
+        print(f"[{index}/{total}] {name}: {result.audio_seconds:.1f}s audio in "
+              f"{result.total_ms / 1000:.2f}s (transcribe {result.transcribe_ms:.0f} ms, "
+              f"post-process {result.post_process_ms:.0f} ms)", file=sys.stderr)
+    else:
+        print(f"[{index}/{total}] {name}: {result.error}", file=sys.stderr)
+
+
+def run_batch(args) -> int:
+    files = find_audio_files(args.inputs, args.recursive)
+    if not files:
+        print("No WAV or FLAC files found", file=sys.stderr)
+        return 1
+
+    service = TranscriptionService()
+    if not service.is_ready():
+        print("OpenAI API key not found. Set it in the app's settings first.", file=sys.stderr)
+        service.close()
+        return 2
+    service.asr.preload()
+
+    transcriber = BatchTranscriber(service, args.output, args.jobs, post_process=not args.raw)
+    pending = len(transcriber.pending(files))
+    print(f"{len(files)} files, {len(files) - pending} already done, "
+          f"{args.jobs} at a time -> {args.output}", file=sys.stderr)
+    done = 0
+
+    def on_result(result: BatchResult) -> None:
+        nonlocal done
+        done += 1
+        print_result(done, pending, result)
+
+    transcriber.on_result = on_result
+    try:
+        with contextlib.ExitStack() as stack:
+            if not args.verbose:
+                # The service logs with print(); keep it out of the progress output
+                stack.enter_context(contextlib.redirect_stdout(stack.enter_context(open(os.devnull, 'w'))))
+            summary = transcriber.run(files)
+    except KeyboardInterrupt:
+        print("Interrupted; run the same command again to resume", file=sys.stderr)
+        return 130
+    finally:
+        service.close()
+
+    print(f"Transcribed {summary.processed - summary.failed} files, {summary.failed} failed, "
+          f"{summary.skipped} skipped", file=sys.stderr)
+    if summary.latencies_ms:
+        print(f"{summary.audio_seconds:.1f}s of audio in {summary.wall_seconds:.1f}s: "
+              f"{summary.throughput:.1f}x realtime, {summary.files_per_minute:.1f} files/min", file=sys.stderr)
+        print(f"Per-file latency: p50 {summary.percentile(50) / 1000:.2f}s, "
+              f"p95 {summary.percentile(95) / 1000:.2f}s, max {summary.percentile(100) / 1000:.2f}s",
+              file=sys.stderr)
+    return 1 if summary.failed else 0
+
+
+def main(argv=None) -> int:
+    multiprocessing.freeze_support()
+    args = build_parser().parse_args(argv)
+    if args.command == "batch":
+        return run_batch(args)
+    from src.main import main as run_app
+    run_app()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,215 @@
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Optional
+
+import numpy as np
+
+from .encoders import EncodedAudio, decode_audio
+from .resample import StreamingResampler
+
+
+class ASRBackend:
+    """Turns encoded audio into a raw transcript.
+
+    ``model_id`` identifies the model and its settings in transcript cache
+    keys, so results from different backends are never mixed up.
+    """
+
+    name = ""
+    requires_api_key = False
+
+    @property
+    def model_id(self) -> str:
+        raise NotImplementedError
+
+    def preload(self) -> None:
+        """Start any slow setup ahead of the first transcription."""
+
+    def transcribe(self, audio: EncodedAudio, language: str) -> str:
+        raise NotImplementedError
+
+    def transcribe_chunk(self, audio: EncodedAudio, language: str) -> str:
+        """Transcribe one chunk of a long recording, alongside its other chunks."""
+        return self.transcribe(audio, language)
+
+    def close(self) -> None:
+        pass
+
+
+class HostedWhisperBackend(ASRBackend):
+    """OpenAI's hosted Whisper API."""
+
+    name = "api"
+    requires_api_key = True
+
+    def __init__(self, get_client: Callable, model: str = "whisper-1"):
+        # Called per request so a changed API key takes effect immediately
+        self.get_client = get_client
+        self.model = model
+
+    @property
+    def model_id(self) -> str:
+        return self.model
+
+    def transcribe(self, audio: EncodedAudio, language: str) -> str:
+        return self.get_client().audio.transcriptions.create(
+            model=self.model,
+            file=audio.upload_file(),
+            response_format="text",
+            language=language
+        )
+
+
+# Model loaded once by each process of LocalWhisperBackend's pool; module
+# level so the pool can reach it from pickled function references
+_worker_model = None
+
+
+def _load_worker_model(model_size: str, threads: int) -> None:
+    global _worker_model
+    import torch
+    import whisper
+    # Split the cores between processes instead of oversubscribing them
+    torch.set_num_threads(threads)
+    _worker_model = whisper.load_model(model_size, device="cpu")
+
+
+def _worker_ready() -> int:
+    return os.getpid()
+
+
+def _transcribe_in_worker(pcm: np.ndarray, language: str) -> str:
+    return _worker_model.transcribe(pcm, language=language, fp16=False)["text"].strip()
+
+
+class LocalWhisperBackend(ASRBackend):
+    """Open-source Whisper running on the CPU, with no network round trip.
+
+    The model is loaded once, from a background thread by ``preload``, and
+    stays resident. Needs the optional ``openai-whisper`` package; requests
+    made before the model is ready wait for it. With ``workers`` above one,
+    the chunks of a long recording go to a pool of processes that each hold
+    another copy of the model, so they run on separate cores. The pool only
+    starts with the first such recording; everything else uses the
+    in-process model.
+    """
+
+    name = "local"
+    RATE = 16000  # Whisper's input rate
+    MODEL_SIZES = ("tiny", "base", "small", "medium", "large")
+
+    def __init__(self, model_size: str = "base", workers: int = 1):
+        self.model_size = model_size
+        self.workers = workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._model = None
+        self._error: Optional[Exception] = None
+        self._loader: Optional[threading.Thread] = None
+        self._load_lock = threading.Lock()
+        # PyTorch models are not safe to run from several threads at once
+        self._inference_lock = threading.Lock()
+
+    @property
+    def model_id(self) -> str:
+        return f"local-whisper-{self.model_size}"
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._model is not None
+
+    def preload(self) -> None:
+        with self._load_lock:
+            if self._model is not None or self._loader is not None:
+                return
+            self._loader = threading.Thread(target=self._load, name="whisper-load", daemon=True)
+            self._loader.start()
+
+    def _start_pool(self) -> None:
+        if self._pool is not None:
+            return
+        print(f"Starting {self.workers} local Whisper processes for long recordings")
+        threads = max(1, (os.cpu_count() or 1) // self.workers)
+        self._pool = ProcessPoolExecutor(
+            self.workers, initializer=_load_worker_model, initargs=(self.model_size, threads)
+        )
+        # Start every process now so the models load in the background
+        for _ in range(self.workers):
+            self._pool.submit(_worker_ready)
+
+    def _load(self) -> None:
+        try:
+            import whisper
+            start = time.perf_counter()
+            self._model = whisper.load_model(self.model_size, device="cpu")
+            print(f"Loaded local Whisper '{self.model_size}' in {time.perf_counter() - start:.1f}s")
+        except Exception as e:
+            print(f"Error loading local Whisper model: {e}")
+            self._error = e
+
+    def _wait_for_model(self):
+        self.preload()
+        self._loader.join()
+        if self._model is None:
+            raise RuntimeError(f"Local Whisper model '{self.model_size}' is unavailable: {self._error}")
+        return self._model
+
+    def _to_pcm(self, audio: EncodedAudio) -> np.ndarray:
+        """Decode to the float32 16 kHz mono array Whisper takes."""
+        samples, rate, channels = decode_audio(audio)
+        pcm = samples.astype(np.float32) / 32768.0
+        if channels > 1:
+            pcm = pcm.reshape(-1, channels).mean(axis=1, dtype=np.float32)
+        if rate != self.RATE:
+            pcm = StreamingResampler(rate, self.RATE).process(pcm)
+        return pcm
+
+    def transcribe(self, audio: EncodedAudio, language: str) -> str:
+        model = self._wait_for_model()
+        pcm = self._to_pcm(audio)
+        with self._inference_lock:
+            result = model.transcribe(pcm, language=language, fp16=False)
+        return result["text"].strip()
+
+    def transcribe_chunk(self, audio: EncodedAudio, language: str) -> str:
+        if self.workers <= 1:
+            return self.transcribe(audio, language)
+        with self._load_lock:
+            self._start_pool()
+        try:
+            return self._pool.submit(_transcribe_in_worker, self._to_pcm(audio), language).result()
+        except Exception as e:
+            raise RuntimeError(f"Local Whisper worker failed: {e}") from e
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+ASR_BACKENDS = ("api", "local")
+
+
+def parallel_workers(settings: dict) -> int:
+    """Chunks transcribed at once, from the ``parallel_workers`` setting.
+
+    0 means one per core, up to 4, for the API. Local Whisper would need a
+    process and a model copy per worker, so there it means no chunking.
+    """
+    workers = int(settings["parallel_workers"])
+    if workers <= 0:
+        if (settings["asr_backend"] or "").lower() == LocalWhisperBackend.name:
+            return 1
+        workers = min(4, os.cpu_count() or 1)
+    return workers
+
+
+def get_asr_backend(settings: dict, get_client: Callable) -> ASRBackend:
+    """Build the backend named by the ``asr_backend`` setting, falling back to the API."""
+    name = (settings["asr_backend"] or "").lower()
+    if name == LocalWhisperBackend.name:
+        return LocalWhisperBackend(settings["local_whisper_model"], parallel_workers(settings))
+    if name != HostedWhisperBackend.name:
+        print(f"Unknown ASR backend '{name}', using the hosted API")
+    return HostedWhisperBackend(get_client)
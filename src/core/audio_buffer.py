@@ -0,0 +1,355 @@
+import struct
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+INT16_SCALE = 32767
+
+
+def float_to_int16(samples: np.ndarray, out: np.ndarray, scratch: np.ndarray) -> np.ndarray:
+    """Clip float32 samples to [-1, 1] and scale them into the int16 ``out`` slice.
+
+    ``scratch`` is reused between calls to avoid allocating per block; the
+    (possibly grown) scratch array is returned for the next call.
+    """
+    n = samples.size
+    if scratch.size < n:
+        scratch = np.empty(n, dtype=np.float32)
+    np.clip(samples, -1.0, 1.0, out=scratch[:n])
+    np.multiply(scratch[:n], INT16_SCALE, out=out, casting='unsafe')
+    return scratch
+
+
+class AudioBuffer:
+    """Preallocated, growable int16 arena for recorded audio.
+
+    The recorder's stream callback converts each float32 block straight into
+    the arena, so no per-block byte strings are kept around and stopping a
+    recording only needs a view of the samples written so far.
+    """
+
+    INITIAL_SECONDS = 60
+
+    def __init__(self, rate: int, channels: int = 1, initial_seconds: float = INITIAL_SECONDS):
+        self.rate = rate
+        self.channels = channels
+        self._data = np.empty(max(1, int(initial_seconds * rate * channels)), dtype=np.int16)
+        self._scratch = np.empty(0, dtype=np.float32)
+        self._length = 0
+
+    def __len__(self) -> int:
+        return self._length
+
+    @property
+    def capacity(self) -> int:
+        return self._data.size
+
+    @property
+    def duration(self) -> float:
+        """Length of the buffered audio in seconds."""
+        return self._length / (self.rate * self.channels)
+
+    def clear(self) -> None:
+        """Forget the buffered audio but keep the allocation for reuse."""
+        self._length = 0
+
+    def _reserve(self, extra: int) -> None:
+        needed = self._length + extra
+        if needed <= self._data.size:
+            return
+        # Double the arena so growth is amortised O(1) per sample.
+        grown = np.empty(max(needed, self._data.size * 2), dtype=np.int16)
+        grown[:self._length] = self._data[:self._length]
+        self._data = grown
+
+    def write_float(self, samples: np.ndarray) -> None:
+        """Append float32 samples in [-1, 1], converting to int16 in place."""
+        n = samples.size
+        if n == 0:
+            return
+        self._reserve(n)
+        self._scratch = float_to_int16(
+            samples, self._data[self._length:self._length + n], self._scratch
+        )
+        self._length += n
+
+    def write_int16(self, samples: np.ndarray) -> None:
+        """Append samples that are already int16."""
+        n = samples.size
+        if n == 0:
+            return
+        self._reserve(n)
+        self._data[self._length:self._length + n] = samples
+        self._length += n
+
+    def view(self) -> np.ndarray:
+        """Return the buffered samples without copying.
+
+        The view stays valid after further writes until the next ``clear``:
+        growth moves new samples into a fresh array and never rewrites
+        samples that were already written.
+        """
+        return self._data[:self._length]
+
+    def detach(self) -> np.ndarray:
+        """Hand the buffered samples over to the caller without copying.
+
+        The buffer moves on to a fresh arena of the same size, so later
+        recordings never write into the returned array.
+        """
+        samples = self._data[:self._length]
+        self._data = np.empty(self._data.size, dtype=np.int16)
+        self._length = 0
+        return samples
+
+
+class DiskAudioBuffer:
+    """int16 recording buffer that streams to a WAV file while recording.
+
+    Samples are staged in a small preallocated block and appended to the
+    file whenever it fills; the WAV header is rewritten after every append,
+    so after a crash the file is valid up to the last flushed block. RAM use
+    is bounded by the staging block no matter how long the recording is,
+    and ``view`` memory-maps the file instead of loading it.
+    """
+
+    FLUSH_SECONDS = 1.0
+    HEADER_SIZE = 44
+    # Capture files are named apart from encoded uploads so a crash's leftovers can be recovered
+    PREFIX = "capture_"
+
+    def __init__(self, directory: Path, rate: int, channels: int = 1,
+                 flush_seconds: float = FLUSH_SECONDS):
+        self.directory = directory
+        self.rate = rate
+        self.channels = channels
+        self._staging = np.empty(max(1, int(flush_seconds * rate * channels)), dtype=np.int16)
+        self._staged = 0
+        self._written = 0
+        self._scratch = np.empty(0, dtype=np.float32)
+        self._file = None
+        self.path = None
+        self._open_file()
+
+    def _open_file(self) -> None:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        self.path = self.directory / f"{self.PREFIX}{timestamp}.wav"
+        self._file = open(self.path, 'w+b')
+        self._file.write(self._header(0))
+
+    def _header(self, samples: int) -> bytes:
+        data_size = samples * 2
+        return struct.pack(
+            '<4sI4s4sIHHIIHH4sI',
+            b'RIFF', 36 + data_size, b'WAVE',
+            b'fmt ', 16, 1, self.channels, self.rate,
+            self.rate * self.channels * 2, self.channels * 2, 16,
+            b'data', data_size
+        )
+
+    def __len__(self) -> int:
+        return self._written + self._staged
+
+    @property
+    def duration(self) -> float:
+        """Length of the recorded audio in seconds."""
+        return len(self) / (self.rate * self.channels)
+
+    def _flush_staging(self) -> None:
+        self._file.write(self._staging[:self._staged])
+        self._written += self._staged
+        self._staged = 0
+        # Keep the header in step with the data so the file is always valid
+        self._file.seek(0)
+        self._file.write(self._header(self._written))
+        self._file.seek(0, 2)
+        self._file.flush()
+
+    def flush(self) -> None:
+        """Write any staged samples to the file."""
+        if self._staged:
+            self._flush_staging()
+
+    def _write(self, samples: np.ndarray, convert: bool) -> None:
+        offset = 0
+        while offset < samples.size:
+            room = self._staging.size - self._staged
+            n = min(room, samples.size - offset)
+            chunk = samples[offset:offset + n]
+            out = self._staging[self._staged:self._staged + n]
+            if convert:
+                self._scratch = float_to_int16(chunk, out, self._scratch)
+            else:
+                out[:] = chunk
+            self._staged += n
+            offset += n
+            if self._staged == self._staging.size:
+                self._flush_staging()
+
+    def write_float(self, samples: np.ndarray) -> None:
+        """Append float32 samples in [-1, 1], converting to int16."""
+        self._write(samples, convert=True)
+
+    def write_int16(self, samples: np.ndarray) -> None:
+        """Append samples that are already int16."""
+        self._write(samples, convert=False)
+
+    def view(self) -> np.ndarray:
+        """Flush and return the recorded samples as a read-only memory map."""
+        self.flush()
+        if self._written == 0:
+            return np.zeros(0, dtype=np.int16)
+        return np.memmap(
+            self.path, dtype='<i2', mode='r',
+            offset=self.HEADER_SIZE, shape=(self._written,)
+        )
+
+    def detach(self) -> Path:
+        """Flush and hand the current file over to the caller.
+
+        The buffer moves on to a fresh file and will no longer delete the
+        returned one.
+        """
+        self.flush()
+        path = self.path
+        self._file.close()
+        self._written = 0
+        self._open_file()
+        return path
+
+    def clear(self) -> None:
+        """Start a new, empty file and delete the previous one.
+
+        Memory maps returned by ``view`` stay readable after the unlink.
+        """
+        self._file.close()
+        try:
+            self.path.unlink(missing_ok=True)
+        except Exception:
+            pass
+        self._staged = 0
+        self._written = 0
+        self._open_file()
+
+    def close(self) -> None:
+        """Close and delete the current file."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            try:
+                self.path.unlink(missing_ok=True)
+            except Exception:
+                pass
+
+
+class RingBuffer:
+    """Fixed-size float32 ring that keeps only the most recent samples.
+
+    Used for pre-roll: while the warm input stream is idle, every block is
+    written here, overwriting the oldest audio, so a recording can start
+    with the moment just before the click.
+    """
+
+    def __init__(self, size: int):
+        self._data = np.zeros(max(1, size), dtype=np.float32)
+        self._pos = 0
+        self._filled = 0
+
+    def __len__(self) -> int:
+        return self._filled
+
+    def clear(self) -> None:
+        self._pos = 0
+        self._filled = 0
+
+    def write(self, samples: np.ndarray) -> None:
+        """Copy samples into the ring without allocating."""
+        size = self._data.size
+        n = samples.size
+        if n >= size:
+            self._data[:] = samples[n - size:]
+            self._pos = 0
+            self._filled = size
+            return
+        end = self._pos + n
+        if end <= size:
+            self._data[self._pos:end] = samples
+        else:
+            first = size - self._pos
+            self._data[self._pos:] = samples[:first]
+            self._data[:n - first] = samples[first:]
+        self._pos = end % size
+        self._filled = min(size, self._filled + n)
+
+    def read(self) -> np.ndarray:
+        """Return a copy of the buffered samples, oldest first."""
+        if self._filled < self._data.size:
+            return self._data[:self._filled].copy()
+        return np.concatenate((self._data[self._pos:], self._data[:self._pos]))
+
+
+class BlockQueue:
+    """Single-producer, single-consumer queue of float32 blocks in preallocated slots.
+
+    The producer (the PortAudio callback) only copies a block into the next
+    free slot and advances its counter: it never locks, allocates a buffer
+    or waits. If the consumer falls behind and every slot is full, the block
+    is dropped and counted instead. Each counter is written by one thread
+    only, which is what makes this safe without a lock.
+    """
+
+    def __init__(self, slots: int, block_size: int):
+        self._data = np.zeros((max(1, slots), block_size), dtype=np.float32)
+        self._sizes = [0] * self._data.shape[0]
+        self._written = 0  # producer only
+        self._read = 0  # consumer only
+        self.dropped = 0  # producer only
+
+    @property
+    def slots(self) -> int:
+        return self._data.shape[0]
+
+    @property
+    def written(self) -> int:
+        """Blocks queued so far."""
+        return self._written
+
+    @property
+    def read_count(self) -> int:
+        """Blocks the consumer has finished with."""
+        return self._read
+
+    def __len__(self) -> int:
+        return self._written - self._read
+
+    def has_room(self) -> bool:
+        """Whether ``push`` would find a free slot right now (producer side)."""
+        return self._written - self._read < self.slots
+
+    def push(self, data: bytes) -> bool:
+        """Copy one block of float32 bytes into a free slot; False if it was dropped."""
+        block = np.frombuffer(data, dtype=np.float32)
+        if self._written - self._read >= self.slots or block.size > self._data.shape[1]:
+            self.dropped += 1
+            return False
+        slot = self._written % self.slots
+        self._data[slot, :block.size] = block
+        self._sizes[slot] = block.size
+        self._written += 1
+        return True
+
+    def peek(self) -> Optional[np.ndarray]:
+        """Return the oldest queued block as a view, or None if the queue is empty.
+
+        The slot stays reserved until ``advance`` is called.
+        """
+        if self._read == self._written:
+            return None
+        slot = self._read % self.slots
+        return self._data[slot, :self._sizes[slot]]
+
+    def advance(self) -> None:
+        """Release the block returned by ``peek``."""
+        self._read += 1
@@ -1,110 +1,613 @@
-import pyaudio
-import wave
+import shutil
+import threading
+import time
 import numpy as np
 from pathlib import Path
-from typing import Optional
+from typing import Callable, List, Optional, Union
 from datetime import datetime
+from dataclasses import dataclass
+
+from .audio_buffer import AudioBuffer, BlockQueue, DiskAudioBuffer, RingBuffer
+from .audio_source import (
+    CONTINUE, INPUT_OVERFLOW, INPUT_UNDERFLOW, AudioSource, PyAudioSource
+)
+from .config import RECOVERED_DIR, TEMP_DIR
+from .encoders import AudioEncoder, EncodedAudio, WavEncoder, pcm_hasher
+from .metrics import get_metrics
+from .resample import StreamingResampler
+from .vad import VoiceActivityDetector
+
+
+@dataclass
+class AudioSegment:
+    """A slice of a live recording, cut at a pause."""
+    index: int
+    samples: np.ndarray
+    rate: int
+    channels: int = 1
+    is_final: bool = False
+
+    @property
+    def duration(self) -> float:
+        return self.samples.size / (self.rate * self.channels)
+
+
+@dataclass
+class CaptureStats:
+    """Audio lost on the way from the device, counted since the stream opened."""
+    input_overflows: int = 0  # PortAudio reported samples lost before the callback
+    input_underflows: int = 0
+    dropped_blocks: int = 0  # Blocks discarded because the worker fell behind
+    queued_blocks: int = 0  # Blocks waiting for the worker right now
+
+    @property
+    def lost_audio(self) -> bool:
+        return bool(self.input_overflows or self.dropped_blocks)
+
 
 class AudioRecorder:
-    """Handles audio recording functionality using PyAudio."""
+    """Handles audio recording from an AudioSource (PyAudio by default)."""
     
     CHUNK = 1024
-    FORMAT = pyaudio.paFloat32
     CHANNELS = 1
     RATE = 16000  # Compatible with Whisper's expected sample rate
     
-    def __init__(self):
-        self.audio = pyaudio.PyAudio()
-        self.stream: Optional[pyaudio.Stream] = None
-        self.frames: list[bytes] = []
-        self.is_recording = False
+    # Live segmentation: cut once a segment is long enough and the speaker pauses
+    SILENCE_RMS = 0.01
+    SEGMENT_MIN_SECONDS = 8.0
+    SEGMENT_MAX_SECONDS = 45.0
+    SEGMENT_PAUSE_MS = 500
+    
+    # Auto-stop: silence after speech that ends the recording when enabled
+    AUTO_STOP_SILENCE_MS = 1500
+    
+    # Warm mode: audio kept from just before the click
+    PREROLL_MS = 400
+    
+    # Callback-to-worker handoff: blocks the callback may queue ahead of the
+    # worker before audio is dropped, and how often an idle worker checks
+    QUEUE_SECONDS = 2.0
+    WORKER_POLL_SECONDS = 0.005
+    
+    # Disk captures are trimmed and encoded this many seconds at a time
+    CAPTURE_CHUNK_SECONDS = 30
+    
+    # Recordings recovered after a crash are kept this long, newest first
+    RECOVERED_RETENTION_SECONDS = 7 * 24 * 3600
+    RECOVERED_MAX_FILES = 20
+    
+    def __init__(
+        self,
+        encoder: Optional[AudioEncoder] = None,
+        spill_to_disk: bool = False,
+        warm: bool = False,
+        preroll_ms: int = PREROLL_MS,
+        record_to_disk: bool = False,
+        source: Optional[AudioSource] = None,
+        native_rate: bool = False
+    ):
+        self.source = source or PyAudioSource()
+        self.stream = None
+        # Format the device is opened with; everything downstream sees RATE/CHANNELS
+        self.capture_rate = self.RATE
+        self.capture_channels = self.CHANNELS
+        self.resampler: Optional[StreamingResampler] = None
+        if native_rate:
+            self._use_native_format()
         self._setup_temp_dir()
+        # Long recordings can stream to a WAV file so RAM use stays bounded
+        if record_to_disk:
+            self.buffer = DiskAudioBuffer(self.temp_dir, self.RATE, self.CHANNELS)
+        else:
+            self.buffer = AudioBuffer(self.RATE, self.CHANNELS)
+        self.is_recording = False
+        # Warm mode keeps one input stream open and fills the pre-roll between recordings
+        self.warm = warm
+        self.preroll = RingBuffer(int(preroll_ms * self.RATE * self.CHANNELS / 1000))
+        # Held by the worker per block so start/stop never see a half-processed block
+        self._state_lock = threading.Lock()
+        # The PortAudio callback only copies blocks into this queue; the
+        # worker thread does conversion, metering, VAD and segmenting
+        self._queue: Optional[BlockQueue] = None
+        self._worker: Optional[threading.Thread] = None
+        self._worker_stop = threading.Event()
+        self._worker_progress = threading.Condition()
+        self._input_overflows = 0
+        self._input_underflows = 0
+        # Upload format for saved recordings and live segments
+        self.encoder = encoder or WavEncoder()
+        # Recordings are handed over in memory unless spilling is opted into
+        self.spill_to_disk = spill_to_disk
+        # Trims silence before upload; set to None to send the raw recording
+        self.vad: Optional[VoiceActivityDetector] = VoiceActivityDetector(self.RATE)
+        # Called from the capture worker thread with each completed AudioSegment
+        self.segment_callback: Optional[Callable[[AudioSegment], None]] = None
+        # Called once from the capture worker thread after sustained silence; None disables
+        self.auto_stop_callback: Optional[Callable[[], None]] = None
+        self.auto_stop_ms = self.AUTO_STOP_SILENCE_MS
+        self._silence_power = self.SILENCE_RMS ** 2
+        self._reset_detection()
+    
+    def _reset_detection(self) -> None:
+        """Reset the pause tracking shared by segmentation and auto-stop."""
+        self._silent_samples = 0
+        self._segment_start = 0
+        self._segment_index = 0
+        self._heard_speech = False
+        self._auto_stop_pending = False
+        # Precomputed so the worker only compares integers
+        self._auto_stop_samples = int(self.auto_stop_ms * self.RATE * self.CHANNELS / 1000)
     
     def _setup_temp_dir(self) -> None:
         """Create temporary directory for audio files if it doesn't exist."""
-        self.temp_dir = Path(__file__).parent.parent.parent / "temp"
-        self.temp_dir.mkdir(exist_ok=True)
+        # Lives in the user's config dir; the install dir may be read-only
+        self.temp_dir = TEMP_DIR
+        self.temp_dir.mkdir(parents=True, exist_ok=True)
+        # Recordings left by a crash are kept, not cleaned up
+        self._prune_recovered()
+        self.recovered = self._recover_recordings()
         # Clean up any existing temporary files
-        for file in self.temp_dir.glob("*.wav"):
+        for file in self._temp_files():
             try:
                 file.unlink()
             except Exception:
                 pass
     
+    def _recover_recordings(self) -> List[Path]:
+        """Move recordings a crash left behind to RECOVERED_DIR and return their paths.
+        
+        These are capture files, which DiskAudioBuffer keeps playable up to
+        the moment of the crash, and encoded recordings spilled to disk that
+        never made it into the job store or to the API.
+        """
+        recovered = []
+        leftovers = [*self.temp_dir.glob(f"{DiskAudioBuffer.PREFIX}*.wav"), *self.temp_dir.glob("recording_*")]
+        for file in sorted(leftovers):
+            try:
+                if file.stat().st_size <= DiskAudioBuffer.HEADER_SIZE:
+                    file.unlink()
+                    continue
+                RECOVERED_DIR.mkdir(parents=True, exist_ok=True)
+                target = RECOVERED_DIR / file.name
+                shutil.move(str(file), str(target))
+                recovered.append(target)
+                print(f"Recovered interrupted recording: {target}")
+            except Exception as e:
+                print(f"Error recovering {file}: {e}")
+        return recovered
+    
+    def _prune_recovered(self) -> None:
+        """Delete recovered recordings nobody took within the retention period, or beyond the cap.
+        
+        With durable_jobs they go to the job store at once; otherwise they
+        would pile up here.
+        """
+        if not RECOVERED_DIR.exists():
+            return
+        cutoff = time.time() - self.RECOVERED_RETENTION_SECONDS
+        files = sorted(RECOVERED_DIR.iterdir(), key=lambda f: f.stat().st_mtime, reverse=True)
+        for index, file in enumerate(files):
+            try:
+                if index >= self.RECOVERED_MAX_FILES or file.stat().st_mtime < cutoff:
+                    file.unlink()
+            except Exception as e:
+                print(f"Error pruning {file}: {e}")
+    
+    def _temp_files(self):
+        """Spilled recordings and segments in the temp directory."""
+        for pattern in ("recording_*", "segment_*"):
+            yield from self.temp_dir.glob(pattern)
+    
+    def _use_native_format(self) -> None:
+        """Capture at the device's own rate and convert to RATE/CHANNELS in the worker.
+        
+        Asking PortAudio for 16 kHz on a 44.1/48 kHz device makes the host
+        API resample with whatever quality it has; doing it here is cheaper
+        and predictable.
+        """
+        native = self.source.native_format()
+        if native is None:
+            return
+        self.capture_rate, self.capture_channels = native
+        if self.capture_rate != self.RATE:
+            self.resampler = StreamingResampler(self.capture_rate, self.RATE)
+        print(f"Capturing at {self.capture_rate} Hz, {self.capture_channels} ch")
+    
+    def _open_stream(self) -> None:
+        # Keep roughly the same block duration at the capture rate
+        chunk = round(self.CHUNK * self.capture_rate / self.RATE)
+        if self.resampler is not None:
+            self.resampler.reset()
+        slots = int(np.ceil(self.QUEUE_SECONDS * self.capture_rate / chunk))
+        self._queue = BlockQueue(slots, chunk * self.capture_channels)
+        # Replayed audio waits for the worker instead of being dropped
+        self.source.set_backpressure(self._queue.has_room)
+        self._input_overflows = 0
+        self._input_underflows = 0
+        self._start_worker()
+        try:
+            self.stream = self.source.open(
+                self.capture_rate, self.capture_channels, chunk, self._audio_callback
+            )
+            self.stream.start_stream()
+        except Exception:
+            self.stream = None
+            self._stop_worker()
+            raise
+    
+    def _start_worker(self) -> None:
+        self._worker_stop.clear()
+        self._worker = threading.Thread(
+            target=self._run_worker, args=(self._queue,), name="capture-worker", daemon=True
+        )
+        self._worker.start()
+    
+    def _stop_worker(self) -> None:
+        """Process whatever is still queued, then end the worker thread."""
+        if self._worker is None:
+            return
+        self._worker_stop.set()
+        self._worker.join()
+        self._worker = None
+    
+    def _run_worker(self, queue: BlockQueue) -> None:
+        """Drain the callback queue until stopped and empty."""
+        while True:
+            block = queue.peek()
+            if block is None:
+                if self._worker_stop.is_set():
+                    return
+                time.sleep(self.WORKER_POLL_SECONDS)
+                continue
+            try:
+                self._handle_block(block)
+            except Exception as e:
+                print(f"Error processing audio block: {e}")
+            queue.advance()
+            with self._worker_progress:
+                self._worker_progress.notify_all()
+    
+    def _drain(self, timeout: float = 2.0) -> None:
+        """Wait until the worker has processed every block queued so far."""
+        queue = self._queue
+        if queue is None or self._worker is None:
+            return
+        target = queue.written
+        with self._worker_progress:
+            self._worker_progress.wait_for(lambda: queue.read_count >= target, timeout)
+    
+    @property
+    def stats(self) -> CaptureStats:
+        """Overflow, underflow and drop counters for the current stream."""
+        queue = self._queue
+        return CaptureStats(
+            input_overflows=self._input_overflows,
+            input_underflows=self._input_underflows,
+            dropped_blocks=queue.dropped if queue is not None else 0,
+            queued_blocks=len(queue) if queue is not None else 0
+        )
+    
+    def open_warm_stream(self) -> None:
+        """Open the input stream ahead of time and start filling the pre-roll."""
+        if self.stream is None:
+            self.preroll.clear()
+            self._open_stream()
+    
     def start_recording(self) -> None:
         """Start recording audio from the microphone."""
         if self.is_recording:
             return
-            
-        self.frames = []
-        self.stream = self.audio.open(
-            format=self.FORMAT,
-            channels=self.CHANNELS,
+        
+        with self._state_lock:
+            self.buffer.clear()
+            self._reset_detection()
+            self._auto_stop_pending = self.auto_stop_callback is not None
+            if self.warm and self.stream is not None:
+                # The stream is already running; begin with the pre-roll
+                self.buffer.write_float(self.preroll.read())
+                self.preroll.clear()
+            self.is_recording = True
+        
+        if self.stream is None:
+            try:
+                self._open_stream()
+            except Exception:
+                self.is_recording = False
+                raise
+    
+    def _audio_callback(self, in_data, frame_count, time_info, status):
+        """PortAudio callback: count status flags and queue the block.
+        
+        This runs on the real-time audio thread, so it does a fixed amount of
+        work and never prints, locks or allocates a buffer.
+        """
+        if status & INPUT_OVERFLOW:
+            self._input_overflows += 1
+        if status & INPUT_UNDERFLOW:
+            self._input_underflows += 1
+        self._queue.push(in_data)
+        return (in_data, CONTINUE)
+    
+    def _handle_block(self, block: np.ndarray) -> None:
+        """Worker side of the callback: convert a queued block and record it."""
+        block = self._convert_input(block)
+        if not block.size:
+            return
+        with self._state_lock:
+            if self.is_recording:
+                self._process_block(block)
+            elif self.warm:
+                self.preroll.write(block)
+    
+    def _convert_input(self, block: np.ndarray) -> np.ndarray:
+        """Downmix and resample a captured block to RATE/CHANNELS."""
+        if self.capture_channels != self.CHANNELS:
+            block = block.reshape(-1, self.capture_channels).mean(axis=1, dtype=np.float32)
+        if self.resampler is not None:
+            block = self.resampler.process(block)
+        return block
+    
+    def _process_block(self, block: np.ndarray) -> None:
+        """Store one block of float32 audio and track pauses in it."""
+        self.buffer.write_float(block)
+        
+        # Block energy as a single dot product, compared as mean power so
+        # there is no sqrt or temporary array per block
+        if np.dot(block, block) < self._silence_power * block.size:
+            self._silent_samples += block.size
+        else:
+            self._silent_samples = 0
+            self._heard_speech = True
+        
+        if (self._auto_stop_pending and self._heard_speech
+                and self._silent_samples >= self._auto_stop_samples):
+            self._auto_stop_pending = False
+            auto_stop = self.auto_stop_callback
+            if auto_stop is not None:
+                auto_stop()
+        
+        # Read once: the GUI thread may clear the callback at any time
+        callback = self.segment_callback
+        if callback is not None:
+            self._maybe_cut_segment(callback)
+    
+    def _maybe_cut_segment(self, callback: Callable[[AudioSegment], None]) -> None:
+        """Emit the current segment if it is long enough and the speaker paused."""
+        samples_per_second = self.RATE * self.CHANNELS
+        length = (len(self.buffer) - self._segment_start) / samples_per_second
+        pause_ms = self._silent_samples * 1000 / samples_per_second
+        
+        if length >= self.SEGMENT_MAX_SECONDS or (
+            length >= self.SEGMENT_MIN_SECONDS and pause_ms >= self.SEGMENT_PAUSE_MS
+        ):
+            self._emit_segment(callback, is_final=False)
+    
+    def _emit_segment(self, callback: Callable[[AudioSegment], None], is_final: bool) -> bool:
+        end = len(self.buffer)
+        if end <= self._segment_start:
+            return False
+        segment = AudioSegment(
+            index=self._segment_index,
+            # A copy: the buffer is reused by the next recording while this
+            # segment may still be waiting for its upload
+            samples=self.buffer.view()[self._segment_start:end].copy(),
             rate=self.RATE,
-            input=True,
-            frames_per_buffer=self.CHUNK,
-            stream_callback=self._audio_callback
+            channels=self.CHANNELS,
+            is_final=is_final
         )
-        self.is_recording = True
-        self.stream.start_stream()
+        self._segment_start = end
+        self._segment_index += 1
+        callback(segment)
+        return True
     
-    def _audio_callback(self, in_data, frame_count, time_info, status):
-        """Callback function for audio stream processing."""
-        if status:
-            print(f"Audio stream status: {status}")
-        self.frames.append(in_data)
-        return (in_data, pyaudio.paContinue)
-    
-    def stop_recording(self) -> Optional[Path]:
-        """Stop recording and save the audio file."""
+    def stop_segmented_recording(self) -> int:
+        """Stop a live-segmented recording and emit the remaining audio.
+        
+        Returns the total number of segments emitted for this recording.
+        """
         if not self.is_recording:
-            print("Warning: stop_recording called but not recording")
+            print("Warning: stop_segmented_recording called but not recording")
+            return 0
+        
+        metrics = get_metrics()
+        with metrics.span("record.stop", live=True) as span:
+            with metrics.span("record.drain"):
+                self._close_stream()
+            span.set(audio_seconds=round(self.buffer.duration, 2))
+            callback = self.segment_callback
+            if callback is not None:
+                self._emit_segment(callback, is_final=True)
+        return self._segment_index
+    
+    def take_recording(self) -> Union[EncodedAudio, np.ndarray, None]:
+        """The whole stopped recording, handed over without copying or encoding.
+        
+        Lets a live-segmented recording be kept until its text is delivered:
+        the capture file with record_to_disk, otherwise the int16 samples,
+        which the next recording no longer writes into.
+        """
+        if not len(self.buffer):
             return None
-            
-        self.is_recording = False
-        if self.stream:
+        if isinstance(self.buffer, DiskAudioBuffer):
+            duration = self.buffer.duration
+            audio = EncodedAudio.from_path(self.buffer.detach(), WavEncoder.mime_type)
+            audio.duration = duration
+            return audio
+        return self.buffer.detach()
+    
+    def _close_stream(self) -> None:
+        """End the recording; in warm mode the stream keeps running for pre-roll."""
+        if self.stream and not self.warm:
             self.stream.stop_stream()
             self.stream.close()
             self.stream = None
-            
-        if not self.frames:
+            self._stop_worker()
+        else:
+            # Audio captured before the stop still belongs to this recording
+            self._drain()
+        with self._state_lock:
+            self.is_recording = False
+        self._report_stats()
+    
+    def _report_stats(self) -> None:
+        stats = self.stats
+        if stats.lost_audio:
+            print(f"Warning: audio lost during capture ({stats.input_overflows} input "
+                  f"overflows, {stats.dropped_blocks} blocks dropped)")
+    
+    def close_warm_stream(self) -> None:
+        """Close a warm stream that is not recording."""
+        if self.stream and not self.is_recording:
+            self.stream.stop_stream()
+            self.stream.close()
+            self.stream = None
+            self._stop_worker()
+    
+    def set_warm(self, warm: bool) -> None:
+        """Turn warm mode on or off, opening or releasing the microphone.
+        
+        A recording in progress keeps its stream; it is closed at the stop
+        once warm mode is off.
+        """
+        self.warm = warm
+        if warm:
+            self.open_warm_stream()
+        else:
+            self.close_warm_stream()
+    
+    @property
+    def spill_dir(self) -> Optional[Path]:
+        """Directory encoded audio is spilled to, or None to keep it in memory."""
+        return self.temp_dir if self.spill_to_disk else None
+    
+    def stop_recording(self) -> Optional[EncodedAudio]:
+        """Stop recording and encode the audio for upload."""
+        if not self.is_recording:
+            print("Warning: stop_recording called but not recording")
+            return None
+        
+        metrics = get_metrics()
+        with metrics.span("record.stop") as span:
+            with metrics.span("record.drain"):
+                self._close_stream()
+            audio = self._encode_recording()
+            if audio is not None:
+                span.add_bytes(audio.size)
+                span.set(audio_seconds=round(audio.duration, 2))
+        return audio
+    
+    def _encode_recording(self) -> Optional[EncodedAudio]:
+        """Trim and encode the stopped recording."""
+        if not len(self.buffer):
             print("Warning: No audio frames recorded")
             return None
             
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_path = self.temp_dir / f"recording_{timestamp}.wav"
         
-        # Convert float32 audio to int16 for better compatibility
         try:
-            print(f"Processing {len(self.frames)} audio frames...")
-            float_data = np.frombuffer(b''.join(self.frames), dtype=np.float32)
-            int_data = (float_data * 32767).astype(np.int16)
+            if isinstance(self.buffer, DiskAudioBuffer):
+                return self._encode_capture(timestamp)
+            
+            # Samples were converted to int16 as they arrived, so this is a view
+            int_data = self.buffer.view()
+            print(f"Processing {self.buffer.duration:.1f}s of audio...")
             
-            print(f"Saving audio to {output_path}")
-            with wave.open(str(output_path), 'wb') as wf:
-                wf.setnchannels(self.CHANNELS)
-                wf.setsampwidth(2)  # 16-bit audio
-                wf.setframerate(self.RATE)
-                wf.writeframes(int_data.tobytes())
+            if self.vad is not None:
+                with get_metrics().span("record.vad", int_data.nbytes):
+                    result = self.vad.trim(int_data)
+                print(f"Silence trimmed: {result.removed_seconds:.1f}s removed, "
+                      f"{result.kept_seconds:.1f}s kept")
+                if not result.has_speech:
+                    print("Warning: No speech detected")
+                    return None
+                int_data = result.samples
             
-            print(f"Audio saved successfully. File size: {output_path.stat().st_size} bytes")
-            return output_path
+            with get_metrics().span("record.encode", format=self.encoder.name) as span:
+                audio = self.encoder.encode_audio(
+                    int_data, self.RATE, self.CHANNELS,
+                    name=f"recording_{timestamp}", spill_dir=self.spill_dir
+                )
+                span.add_bytes(audio.size)
+            where = audio.path if audio.path else "memory"
+            print(f"Audio encoded as {self.encoder.name} ({audio.size} bytes) in {where}")
+            return audio
             
         except Exception as e:
-            print(f"Error saving audio file: {e}")
+            print(f"Error encoding audio: {e}")
             import traceback
             print(f"Traceback: {traceback.format_exc()}")
             return None
     
+    def _encode_capture(self, timestamp: str) -> Optional[EncodedAudio]:
+        """Trim and encode a disk capture into a file, a chunk at a time.
+        
+        The memory map is read in CAPTURE_CHUNK_SECONDS slices for both VAD
+        and encoding, so RAM use at stop doesn't grow with the recording.
+        """
+        duration = self.buffer.duration
+        if self.vad is None and isinstance(self.encoder, WavEncoder):
+            # The capture file already is the upload; nothing left to do
+            path = self.buffer.detach()
+            print(f"Recording streamed to {path}")
+            audio = EncodedAudio.from_path(path, self.encoder.mime_type)
+            audio.duration = duration
+            return audio
+        
+        samples = self.buffer.view()
+        print(f"Processing {duration:.1f}s of audio from {self.buffer.path.name}...")
+        frame = 1
+        keep = None
+        if self.vad is not None:
+            frame = self.vad.frame_length
+            with get_metrics().span("record.vad", samples.nbytes):
+                keep = self.vad.keep_frames(samples, self.CAPTURE_CHUNK_SECONDS * self.RATE // frame)
+            if not keep.any():
+                print("Warning: No speech detected")
+                return None
+        # Whole VAD frames per chunk, so each chunk's slice of the mask lines up
+        step = max(1, self.CAPTURE_CHUNK_SECONDS * self.RATE * self.CHANNELS // frame) * frame
+        digest = pcm_hasher(self.RATE, self.CHANNELS)
+        kept = 0
+        
+        def chunks():
+            nonlocal kept
+            for start in range(0, samples.size, step):
+                chunk = samples[start:start + step]
+                if keep is not None:
+                    mask = keep[start // frame:start // frame + -(-chunk.size // frame)]
+                    chunk = chunk[np.repeat(mask, frame)[:chunk.size]]
+                kept += chunk.size
+                digest.update(memoryview(np.ascontiguousarray(chunk)).cast('B'))
+                yield chunk
+        
+        directory = self.spill_dir or self.temp_dir
+        with get_metrics().span("record.encode", format=self.encoder.name) as span:
+            path = self.encoder.write_chunks(
+                directory / f"recording_{timestamp}", chunks(), self.RATE, self.CHANNELS
+            )
+            audio = EncodedAudio.from_path(path, self.encoder.mime_type)
+            audio.duration = kept / (self.RATE * self.CHANNELS)
+            audio.digest = digest.hexdigest()
+            span.add_bytes(audio.size)
+        if keep is not None:
+            print(f"Silence trimmed: {duration - audio.duration:.1f}s removed, "
+                  f"{audio.duration:.1f}s kept")
+        print(f"Audio encoded as {self.encoder.name} ({audio.size} bytes) in {path}")
+        return audio
+    
     def cleanup(self) -> None:
         """Clean up resources."""
         if self.stream:
             self.stream.stop_stream()
             self.stream.close()
-        self.audio.terminate()
+            self.stream = None
+        self._stop_worker()
+        self.source.terminate()
+        if isinstance(self.buffer, DiskAudioBuffer):
+            self.buffer.close()
         
         # Clean up temporary files
-        for file in self.temp_dir.glob("*.wav"):
+        for file in self._temp_files():
             try:
                 file.unlink()
             except Exception:
@@ -0,0 +1,200 @@
+import threading
+import time
+import wave
+from pathlib import Path
+from typing import Callable, Optional
+
+import numpy as np
+
+# PortAudio callback return flags, shared by every source
+CONTINUE = 0
+COMPLETE = 1
+
+# PortAudio input status flags passed to the callback
+INPUT_UNDERFLOW = 1
+INPUT_OVERFLOW = 2
+
+StreamCallback = Callable[[bytes, int, Optional[dict], int], tuple]
+
+
+class AudioSource:
+    """Where AudioRecorder gets its audio from.
+
+    ``open`` returns a stream with PyAudio's ``start_stream``,
+    ``stop_stream`` and ``close`` methods. Streams deliver interleaved
+    float32 blocks to ``callback(in_data, frame_count, time_info, status)``
+    from their own thread, exactly like a PortAudio callback.
+    """
+
+    def open(self, rate: int, channels: int, chunk: int, callback: StreamCallback):
+        raise NotImplementedError
+
+    def native_format(self) -> Optional[tuple]:
+        """Return the (rate, channels) the device captures natively, if known."""
+        return None
+
+    def set_backpressure(self, has_room: Optional[Callable[[], bool]]) -> None:
+        """Let a source that isn't paced by a clock wait until ``has_room()``.
+
+        A microphone can't wait for the consumer, so by default this does nothing.
+        """
+
+    def terminate(self) -> None:
+        pass
+
+
+class PyAudioSource(AudioSource):
+    """Microphone input through PyAudio/PortAudio."""
+
+    def __init__(self):
+        # Imported here so the rest of the pipeline works without PortAudio
+        import pyaudio
+        self._pyaudio = pyaudio
+        self.audio = pyaudio.PyAudio()
+
+    def open(self, rate: int, channels: int, chunk: int, callback: StreamCallback):
+        return self.audio.open(
+            format=self._pyaudio.paFloat32,
+            channels=channels,
+            rate=rate,
+            input=True,
+            frames_per_buffer=chunk,
+            stream_callback=callback
+        )
+
+    def native_format(self) -> Optional[tuple]:
+        try:
+            info = self.audio.get_default_input_device_info()
+        except Exception as e:
+            print(f"Error querying input device: {e}")
+            return None
+        channels = max(1, min(int(info.get('maxInputChannels', 1)), 2))
+        return int(info['defaultSampleRate']), channels
+
+    def terminate(self) -> None:
+        self.audio.terminate()
+
+
+class _ReplayStream:
+    """Feeds pre-recorded audio to a stream callback from a worker thread."""
+
+    BACKPRESSURE_POLL_SECONDS = 0.0005
+
+    def __init__(self, source: "ReplaySource", chunk: int, callback: StreamCallback):
+        self._source = source
+        self._chunk = chunk
+        self._callback = callback
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self.finished = threading.Event()
+
+    def start_stream(self) -> None:
+        self._stop_event.clear()
+        self.finished.clear()
+        self._thread = threading.Thread(target=self._run, name="replay-stream", daemon=True)
+        self._thread.start()
+
+    def stop_stream(self) -> None:
+        self._stop_event.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+
+    def close(self) -> None:
+        self.stop_stream()
+
+    def is_active(self) -> bool:
+        return self._thread is not None and not self.finished.is_set()
+
+    def _run(self) -> None:
+        source = self._source
+        samples = source.samples
+        step = self._chunk * source.channels
+        block_seconds = self._chunk / source.rate / source.speed
+        deadline = time.monotonic()
+        position = 0
+        try:
+            while not self._stop_event.is_set():
+                if position >= samples.size:
+                    if not source.loop:
+                        break
+                    position = 0
+                if not source.realtime and not self._wait_for_room():
+                    break
+                block = samples[position:position + step]
+                position += step
+                flag = self._callback(block.tobytes(), block.size // source.channels, None, 0)[1]
+                if flag != CONTINUE:
+                    break
+                if source.realtime:
+                    deadline += block_seconds
+                    delay = deadline - time.monotonic()
+                    if delay > 0:
+                        time.sleep(delay)
+        finally:
+            self.finished.set()
+
+    def _wait_for_room(self) -> bool:
+        """Hold an unpaced replay until the consumer can take a block; False if stopped."""
+        has_room = self._source.has_room
+        while has_room is not None and not has_room():
+            if self._stop_event.wait(self.BACKPRESSURE_POLL_SECONDS):
+                return False
+        return not self._stop_event.is_set()
+
+
+class ReplaySource(AudioSource):
+    """Replays a WAV file or NumPy array as if it came from a microphone.
+
+    With ``realtime`` the blocks are paced to the audio's duration (scaled
+    by ``speed``); otherwise they are delivered as fast as the consumer
+    takes them, waiting for room under ``set_backpressure`` instead of
+    overrunning it, which is what throughput benchmarks want.
+    """
+
+    def __init__(self, samples: np.ndarray, rate: int, channels: int = 1,
+                 realtime: bool = True, speed: float = 1.0, loop: bool = False):
+        if samples.dtype == np.int16:
+            samples = samples.astype(np.float32) / 32768.0
+        self.samples = np.ascontiguousarray(samples, dtype=np.float32).reshape(-1)
+        self.rate = rate
+        self.channels = channels
+        self.realtime = realtime
+        self.speed = speed
+        self.loop = loop
+        self.has_room: Optional[Callable[[], bool]] = None
+        self.stream: Optional[_ReplayStream] = None
+
+    @classmethod
+    def from_wav(cls, path: Path, **kwargs) -> "ReplaySource":
+        """Load a 16-bit PCM WAV file."""
+        with wave.open(str(path), 'rb') as wf:
+            if wf.getsampwidth() != 2:
+                raise ValueError(f"Only 16-bit WAV files can be replayed: {path}")
+            samples = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+            return cls(samples, wf.getframerate(), wf.getnchannels(), **kwargs)
+
+    @property
+    def duration(self) -> float:
+        return self.samples.size / (self.rate * self.channels)
+
+    def native_format(self) -> Optional[tuple]:
+        return self.rate, self.channels
+
+    def set_backpressure(self, has_room: Optional[Callable[[], bool]]) -> None:
+        self.has_room = has_room
+
+    def open(self, rate: int, channels: int, chunk: int, callback: StreamCallback):
+        if rate != self.rate or channels != self.channels:
+            raise ValueError(
+                f"Replay audio is {self.rate} Hz/{self.channels} ch, "
+                f"stream requested {rate} Hz/{channels} ch"
+            )
+        self.stream = _ReplayStream(self, chunk, callback)
+        return self.stream
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the replay has delivered all of its audio."""
+        if self.stream is None:
+            return True
+        return self.stream.finished.wait(timeout)
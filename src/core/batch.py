@@ -0,0 +1,195 @@
+import glob
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+from .encoders import EncodedAudio, read_duration
+from .transcription import TranscriptionService
+
+AUDIO_SUFFIXES = (".wav", ".flac")
+
+
+@dataclass
+class BatchResult:
+    """One line of the JSONL output."""
+    path: str
+    status: str  # "ok" or "error"
+    transcript: str = ""  # Raw ASR output
+    text: str = ""  # Post-processed text, or the transcript when skipped
+    error: str = ""
+    audio_seconds: float = 0.0
+    transcribe_ms: float = 0.0
+    post_process_ms: float = 0.0
+    total_ms: float = 0.0
+    # Size and mtime of the file when it was processed, so an edited file is redone on resume
+    size: int = 0
+    mtime_ns: int = 0
+
+
+@dataclass
+class BatchSummary:
+    processed: int = 0
+    failed: int = 0
+    skipped: int = 0  # Already done in an earlier run
+    audio_seconds: float = 0.0
+    wall_seconds: float = 0.0
+    latencies_ms: List[float] = field(default_factory=list)
+
+    @property
+    def throughput(self) -> float:
+        """Seconds of audio transcribed per second of wall-clock time."""
+        return self.audio_seconds / self.wall_seconds if self.wall_seconds > 0 else 0.0
+
+    @property
+    def files_per_minute(self) -> float:
+        return self.processed * 60 / self.wall_seconds if self.wall_seconds > 0 else 0.0
+
+    def percentile(self, p: float) -> float:
+        """Per-file latency in ms at percentile ``p`` (0-100), nearest rank."""
+        if not self.latencies_ms:
+            return 0.0
+        ordered = sorted(self.latencies_ms)
+        rank = max(0, min(len(ordered) - 1, round(p / 100 * len(ordered)) - 1))
+        return ordered[rank]
+
+
+def find_audio_files(inputs: Iterable[str], recursive: bool = False) -> List[Path]:
+    """Expand directories, globs and file names into a sorted list of WAV/FLAC files."""
+    found = set()
+    for item in inputs:
+        path = Path(item).expanduser()
+        if path.is_dir():
+            candidates = path.rglob("*") if recursive else path.iterdir()
+        elif glob.has_magic(item):
+            candidates = (Path(p) for p in glob.glob(str(path), recursive=True))
+        else:
+            candidates = [path]
+        for candidate in candidates:
+            if candidate.suffix.lower() in AUDIO_SUFFIXES and candidate.is_file():
+                found.add(candidate.resolve())
+    return sorted(found)
+
+
+def load_completed(output: Path) -> Dict[str, tuple]:
+    """Map each path already transcribed in ``output`` to its (size, mtime_ns).
+
+    Failed files are left out so they are retried, and so is a truncated
+    last line left behind by an interrupted run.
+    """
+    completed = {}
+    if not output.exists():
+        return completed
+    with open(output, encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record.get("status") == "ok":
+                completed[record["path"]] = (record.get("size"), record.get("mtime_ns"))
+    return completed
+
+
+class BatchTranscriber:
+    """Push a backlog of audio files through ``TranscriptionService``.
+
+    Up to ``jobs`` files are in flight at once. Every result is appended to
+    the ``output`` JSONL file and flushed as soon as it is ready, so an
+    interrupted run resumes where it stopped: files already recorded as
+    done, and not modified since, are skipped.
+    """
+
+    def __init__(
+        self,
+        service: TranscriptionService,
+        output: Path,
+        jobs: int = 4,
+        post_process: bool = True,
+        on_result: Optional[Callable[[BatchResult], None]] = None
+    ):
+        self.service = service
+        self.output = output
+        self.jobs = max(1, jobs)
+        self.post_process = post_process
+        self.on_result = on_result
+
+    def pending(self, files: Iterable[Path]) -> List[Path]:
+        """The files not yet transcribed by an earlier run."""
+        completed = load_completed(self.output)
+        pending = []
+        for path in files:
+            stat = path.stat()
+            if completed.get(str(path)) != (stat.st_size, stat.st_mtime_ns):
+                pending.append(path)
+        return pending
+
+    def run(self, files: List[Path]) -> BatchSummary:
+        pending = self.pending(files)
+        summary = BatchSummary(skipped=len(files) - len(pending))
+        if not pending:
+            return summary
+        self.output.parent.mkdir(parents=True, exist_ok=True)
+        start = time.perf_counter()
+        self._end_partial_line()
+        with open(self.output, 'a', encoding='utf-8') as out:
+            pool = ThreadPoolExecutor(self.jobs, thread_name_prefix="batch")
+            try:
+                futures = [pool.submit(self.transcribe_file, path) for path in pending]
+                for future in as_completed(futures):
+                    result = future.result()
+                    self._write(out, result)
+                    summary.processed += 1
+                    if result.status == "ok":
+                        summary.audio_seconds += result.audio_seconds
+                        summary.latencies_ms.append(result.total_ms)
+                    else:
+                        summary.failed += 1
+                    if self.on_result is not None:
+                        self.on_result(result)
+            finally:
+                # On Ctrl+C, drop the queued files; they are picked up on the next run
+                pool.shutdown(wait=True, cancel_futures=True)
+                summary.wall_seconds = time.perf_counter() - start
+        return summary
+
+    def transcribe_file(self, path: Path) -> BatchResult:
+        """Transcribe and post-process one file; errors are returned, not raised."""
+        stat = path.stat()
+        result = BatchResult(path=str(path), status="ok", size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+        start = time.perf_counter()
+        try:
+            audio = EncodedAudio.from_path(path)
+            audio.duration = read_duration(audio)
+            result.audio_seconds = round(audio.duration, 3)
+            result.transcript = self.service.whisper_transcribe(audio)
+            transcribed = time.perf_counter()
+            result.transcribe_ms = round((transcribed - start) * 1000, 1)
+            result.text = result.transcript
+            if self.post_process and result.transcript:
+                # Raises rather than passing the raw transcript off as done
+                result.text = self.service.post_process_transcript(
+                    result.transcript, audio_key=self.service.audio_key(audio), strict=True
+                )
+                result.post_process_ms = round((time.perf_counter() - transcribed) * 1000, 1)
+        except Exception as e:
+            result.status = "error"
+            result.error = f"{type(e).__name__}: {e}"
+        result.total_ms = round((time.perf_counter() - start) * 1000, 1)
+        return result
+
+    def _end_partial_line(self) -> None:
+        """Terminate a line cut short by an interrupted run so new records start cleanly."""
+        if not self.output.exists() or self.output.stat().st_size == 0:
+            return
+        with open(self.output, 'rb+') as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                f.write(b"\n")
+
+    def _write(self, out, result: BatchResult) -> None:
+        out.write(json.dumps(asdict(result), ensure_ascii=False) + "\n")
+        out.flush()
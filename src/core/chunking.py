@@ -0,0 +1,113 @@
+import re
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from .vad import VoiceActivityDetector
+
+
+@dataclass
+class AudioChunk:
+    """A slice of a long recording that is transcribed on its own."""
+    index: int
+    start: int  # First sample
+    end: int  # One past the last sample
+    overlaps_previous: bool = False  # Starts before the previous chunk ended
+
+    @property
+    def length(self) -> int:
+        return self.end - self.start
+
+
+def split_at_silence(
+    samples: np.ndarray,
+    rate: int,
+    target_seconds: float = 30.0,
+    max_seconds: float = 45.0,
+    overlap_seconds: float = 1.0,
+    vad: Optional[VoiceActivityDetector] = None
+) -> List[AudioChunk]:
+    """Split int16 mono audio into chunks of roughly ``target_seconds``.
+
+    Each cut is placed in the longest run of non-speech frames between
+    ``target_seconds`` and ``max_seconds`` into the chunk, so words are not
+    split. If the speaker never pauses in that window the chunk is cut at
+    ``max_seconds`` and the next one starts ``overlap_seconds`` earlier;
+    ``stitch_transcripts`` removes the words both chunks then contain.
+    """
+    vad = vad or VoiceActivityDetector(rate)
+    frame = vad.frame_length
+    total = samples.size
+    if total <= max_seconds * rate:
+        return [AudioChunk(0, 0, total)]
+
+    silent = ~vad.speech_mask(samples)
+    target_frames = int(target_seconds * rate / frame)
+    max_frames = int(max_seconds * rate / frame)
+    overlap = int(overlap_seconds * rate)
+
+    chunks = []
+    start = 0
+    overlapped = False
+    while total - start > max_seconds * rate:
+        first = start // frame
+        window = silent[first + target_frames:first + max_frames]
+        cut = _middle_of_longest_run(window)
+        if cut is not None:
+            end = (first + target_frames + cut) * frame
+            chunks.append(AudioChunk(len(chunks), start, end, overlapped))
+            start, overlapped = end, False
+        else:
+            end = (first + max_frames) * frame
+            chunks.append(AudioChunk(len(chunks), start, end, overlapped))
+            start, overlapped = end - overlap, True
+    chunks.append(AudioChunk(len(chunks), start, total, overlapped))
+    return chunks
+
+
+def _middle_of_longest_run(mask: np.ndarray) -> Optional[int]:
+    """Index in the middle of the longest run of True values, or None."""
+    if not mask.any():
+        return None
+    # Run boundaries from the changes in the padded mask
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], mask.astype(np.int8), [0]))))
+    starts, ends = edges[::2], edges[1::2]
+    longest = np.argmax(ends - starts)
+    return int((starts[longest] + ends[longest]) // 2)
+
+
+_PUNCTUATION = re.compile(r"[^\w']+")
+
+
+def _normalized_words(text: str) -> List[str]:
+    """Whitespace-separated words with case and punctuation folded away."""
+    return [_PUNCTUATION.sub("", word.casefold()) for word in text.split()]
+
+
+def stitch_transcripts(
+    texts: Sequence[str],
+    overlaps: Sequence[bool],
+    max_overlap_words: int = 12
+) -> str:
+    """Join chunk transcripts in order, dropping words repeated across an overlap.
+
+    For each chunk that ``overlaps`` its predecessor, the longest run of
+    words (ignoring case and punctuation) that ends the text so far and
+    starts the chunk is removed from the chunk.
+    """
+    result = ""
+    for text, overlapped in zip(texts, overlaps):
+        text = text.strip()
+        if not text:
+            continue
+        if overlapped and result:
+            tail = _normalized_words(result)[-max_overlap_words:]
+            words = text.split()
+            head = _normalized_words(text)[:max_overlap_words]
+            for n in range(min(len(tail), len(head)), 0, -1):
+                if tail[-n:] == head[:n]:
+                    text = " ".join(words[n:])
+                    break
+        result = f"{result} {text}".strip() if text else result
+    return result
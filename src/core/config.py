@@ -0,0 +1,217 @@
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Optional
+
+CONFIG_DIR = Path.home() / '.voice-prompt'
+SETTINGS_FILE = CONFIG_DIR / 'settings.json'
+API_KEY_FILE = CONFIG_DIR / 'config'
+SYSTEM_PROMPT_FILE = CONFIG_DIR / 'system_prompt'
+TEMP_DIR = CONFIG_DIR / 'temp'
+# Recordings cut short by a crash, moved out of TEMP_DIR at the next start
+RECOVERED_DIR = CONFIG_DIR / 'recovered'
+
+DEFAULT_SYSTEM_PROMPT = """You are a helpful assistant. Your task is to correct any spelling discrepancies 
+in the transcribed text. Add necessary punctuation such as periods, commas, 
+and capitalization. Make the text more readable while preserving its original meaning. 
+Use only the context provided."""
+
+# Application preferences stored in settings.json, next to the API key and
+# system prompt files. Missing keys fall back to these defaults.
+DEFAULT_SETTINGS = {
+    # Upload encoding: "wav", "flac" or "opus" (see core.encoders)
+    "upload_format": "flac",
+    # Write recordings to TEMP_DIR before upload instead of keeping them in memory
+    "spill_to_disk": False,
+    # Keep the microphone stream open between recordings and start each
+    # recording with the last preroll_ms of audio before the click
+    "warm_stream": False,
+    "preroll_ms": 400,
+    # Stream samples to a WAV file in TEMP_DIR while recording, keeping RAM
+    # use bounded for long dictations
+    "record_to_disk": False,
+    # Open the microphone at its native rate and resample to 16 kHz ourselves
+    # instead of relying on the host audio API's converter
+    "capture_native_rate": True,
+    # Show GPT post-processing as it streams in instead of all at once
+    "stream_post_processing": True,
+    # Keep Whisper and post-processed transcripts of recent audio on disk so
+    # retries of the same recording are not uploaded and billed again
+    "transcript_cache": True,
+    "transcript_cache_mb": 20,
+    # Reuse GPT output for transcripts already post-processed with the same
+    # system prompt ("yes", "new paragraph", ...)
+    "post_process_memo": True,
+    "post_process_memo_entries": 256,
+    # Speech recognition: "api" for OpenAI's hosted whisper-1, or "local" to
+    # run Whisper on the CPU (needs the openai-whisper package). The local
+    # model is loaded in the background at startup and kept in memory.
+    "asr_backend": "api",
+    "local_whisper_model": "base",
+    # Recordings of at least parallel_min_seconds are split at pauses into
+    # chunks of about parallel_chunk_seconds, transcribed parallel_workers at
+    # a time (0 = one per core, up to 4). Local Whisper only chunks when this
+    # is set above 1, with one extra process and model copy per worker
+    "parallel_workers": 0,
+    "parallel_min_seconds": 60,
+    "parallel_chunk_seconds": 30,
+    # OpenAI-compatible endpoint, e.g. benchmarks/mock_openai.py or a proxy;
+    # empty means api.openai.com. $OPENAI_BASE_URL takes precedence.
+    "api_base_url": "",
+    # Finished recordings transcribed at once while the next one is recorded;
+    # results always reach the clipboard in recording order
+    "pipeline_jobs": 2,
+    # Keep each recording in jobs.sqlite3 and jobs/ until its text is
+    # delivered, and resume unfinished ones at startup
+    "durable_jobs": True,
+    # Keep every delivered transcript in history.sqlite3, searchable from
+    # the tray's History window
+    "history_enabled": True,
+    # Time each pipeline stage (record.*, asr.*, post_process.*, clipboard)
+    # into rolling histograms of the last metrics_window spans, appended to
+    # metrics.jsonl after every utterance
+    "metrics_enabled": False,
+    "metrics_window": 512,
+    # Shared HTTP connection pool for the OpenAI API (see core.http_client)
+    "http_timeout_seconds": 60.0,
+    "http_connect_timeout_seconds": 10.0,
+    "http_max_connections": 10,
+    "http_max_keepalive": 5,
+    "http_keepalive_seconds": 120.0,
+}
+
+
+class ConfigStore:
+    """Cached access to the files in the config directory.
+
+    Each file is read once and kept in memory together with its mtime and
+    size. Later reads only ``stat`` the file to check it hasn't changed, and
+    once a file watcher reports changes through ``invalidate`` (see
+    ``watched``) not even that. Writes go to a temporary file that is then
+    renamed over the original, so a crash never leaves a half-written key
+    or prompt behind. Safe to use from worker threads.
+    """
+
+    def __init__(self, directory: Path = CONFIG_DIR):
+        self.directory = directory
+        # Set while a file watcher calls invalidate() on changes; cached
+        # entries are then trusted without a stat per read
+        self.watched = False
+        self._cache = {}  # name -> ((mtime_ns, size), text), both None if missing
+        self._lock = threading.Lock()
+
+    def path(self, name: str) -> Path:
+        return self.directory / name
+
+    def read_text(self, name: str) -> Optional[str]:
+        """Return the file's contents, or None if it doesn't exist."""
+        with self._lock:
+            cached = self._cache.get(name)
+            if cached is not None and self.watched:
+                return cached[1]
+            path = self.path(name)
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                self._cache[name] = (None, None)
+                return None
+            signature = (stat.st_mtime_ns, stat.st_size)
+            if cached is not None and cached[0] == signature:
+                return cached[1]
+            try:
+                text = path.read_text()
+            except Exception as e:
+                print(f"Error reading {path}: {e}")
+                return None
+            self._cache[name] = (signature, text)
+            return text
+
+    def write_text(self, name: str, text: str) -> None:
+        """Replace the file atomically and update the cache."""
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            path = self.path(name)
+            fd, temp = tempfile.mkstemp(dir=self.directory, prefix=f".{name}.", suffix=".tmp")
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    f.write(text)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(temp, path)
+            except Exception:
+                Path(temp).unlink(missing_ok=True)
+                raise
+            stat = path.stat()
+            self._cache[name] = ((stat.st_mtime_ns, stat.st_size), text)
+
+    def delete(self, name: str) -> bool:
+        """Remove the file; False if it didn't exist."""
+        with self._lock:
+            self._cache[name] = (None, None)
+            try:
+                self.path(name).unlink()
+                return True
+            except FileNotFoundError:
+                return False
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        """Forget one cached file, or all of them; called on file watcher events."""
+        with self._lock:
+            if name is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(name, None)
+
+    def api_key(self) -> Optional[str]:
+        text = self.read_text(API_KEY_FILE.name)
+        return (text or "").strip() or None
+
+    def set_api_key(self, api_key: str) -> None:
+        self.write_text(API_KEY_FILE.name, api_key.strip())
+
+    def clear_api_key(self) -> bool:
+        return self.delete(API_KEY_FILE.name)
+
+    def system_prompt(self) -> Optional[str]:
+        """The saved system prompt, or None if none is saved."""
+        text = self.read_text(SYSTEM_PROMPT_FILE.name)
+        return (text or "").strip() or None
+
+    def set_system_prompt(self, prompt: str) -> None:
+        self.write_text(SYSTEM_PROMPT_FILE.name, prompt.strip())
+
+    def settings(self) -> dict:
+        """settings.json merged over the defaults."""
+        settings = dict(DEFAULT_SETTINGS)
+        text = self.read_text(SETTINGS_FILE.name)
+        if text:
+            try:
+                stored = json.loads(text)
+                if isinstance(stored, dict):
+                    settings.update(stored)
+            except Exception as e:
+                print(f"Error loading settings: {e}")
+        return settings
+
+    def save_settings(self, settings: dict) -> None:
+        """Write the settings that differ from the defaults."""
+        changed = {k: v for k, v in settings.items() if DEFAULT_SETTINGS.get(k) != v}
+        self.write_text(SETTINGS_FILE.name, json.dumps(changed, indent=2))
+
+
+_store: Optional[ConfigStore] = None
+
+
+def get_store() -> ConfigStore:
+    """The application's shared config store."""
+    global _store
+    if _store is None:
+        _store = ConfigStore()
+    return _store
+
+
+def load_settings() -> dict:
+    """Load settings.json merged over the defaults."""
+    return get_store().settings()
@@ -0,0 +1,261 @@
+import hashlib
+import io
+import mimetypes
+import wave
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Optional
+
+import numpy as np
+
+try:
+    import soundfile
+except (ImportError, OSError):  # OSError: libsndfile missing
+    soundfile = None
+
+
+def pcm_hasher(rate: int, channels: int = 1):
+    """Hash object for ``pcm_digest``; update it with the samples a chunk at a time."""
+    return hashlib.blake2b(f"{rate}:{channels}:".encode(), digest_size=16)
+
+
+def pcm_digest(samples: np.ndarray, rate: int, channels: int = 1) -> str:
+    """Fast hash identifying PCM audio independently of how it is encoded."""
+    digest = pcm_hasher(rate, channels)
+    digest.update(memoryview(np.ascontiguousarray(samples)).cast('B'))
+    return digest.hexdigest()
+
+
+@dataclass
+class EncodedAudio:
+    """Encoded audio ready for upload, held in memory or spilled to disk."""
+    filename: str
+    mime_type: str
+    data: Optional[bytes] = None
+    path: Optional[Path] = None
+    duration: float = 0.0
+    digest: Optional[str] = None  # pcm_digest of the source samples, if known
+
+    @classmethod
+    def from_path(cls, path: Path, mime_type: Optional[str] = None) -> "EncodedAudio":
+        mime_type = (
+            mime_type or _SUFFIX_MIME_TYPES.get(path.suffix.lower())
+            or mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        )
+        return cls(filename=path.name, mime_type=mime_type, path=path)
+
+    @property
+    def size(self) -> int:
+        if self.data is not None:
+            return len(self.data)
+        return self.path.stat().st_size
+
+    def exists(self) -> bool:
+        return self.data is not None or (self.path is not None and self.path.exists())
+
+    def content_digest(self) -> str:
+        """Hash of the source PCM, or of the encoded bytes when that is unknown."""
+        if self.digest is None:
+            content = self.data if self.data is not None else self.path.read_bytes()
+            self.digest = hashlib.blake2b(content, digest_size=16).hexdigest()
+        return self.digest
+
+    def upload_file(self) -> tuple:
+        """Return the (filename, content, mime type) tuple the OpenAI client accepts."""
+        content = self.data if self.data is not None else self.path.read_bytes()
+        return (self.filename, content, self.mime_type)
+
+    def discard(self) -> None:
+        """Drop the audio, deleting the spill file if there is one."""
+        self.data = None
+        if self.path is not None:
+            try:
+                self.path.unlink(missing_ok=True)
+            except Exception:
+                pass
+
+
+def decode_audio(audio: EncodedAudio) -> tuple:
+    """Decode encoded audio back to (int16 samples, rate, channels)."""
+    source = io.BytesIO(audio.data) if audio.data is not None else str(audio.path)
+    if audio.mime_type == WavEncoder.mime_type:
+        with wave.open(source, 'rb') as wf:
+            samples = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+            return samples, wf.getframerate(), wf.getnchannels()
+    if soundfile is None:
+        raise RuntimeError(f"soundfile is not installed, cannot decode {audio.mime_type}")
+    samples, rate = soundfile.read(source, dtype='int16', always_2d=True)
+    return samples.reshape(-1), rate, samples.shape[1]
+
+
+def read_duration(audio: EncodedAudio) -> float:
+    """Length in seconds from the file header, without decoding the samples."""
+    source = io.BytesIO(audio.data) if audio.data is not None else str(audio.path)
+    if audio.mime_type == WavEncoder.mime_type:
+        with wave.open(source, 'rb') as wf:
+            return wf.getnframes() / wf.getframerate()
+    if soundfile is None:
+        raise RuntimeError(f"soundfile is not installed, cannot read {audio.mime_type}")
+    return soundfile.info(source).duration
+
+
+class AudioEncoder:
+    """Turns int16 PCM samples into an upload format Whisper accepts."""
+
+    name = ""
+    suffix = ""
+    mime_type = ""
+
+    def encode(self, samples: np.ndarray, rate: int, channels: int = 1) -> bytes:
+        raise NotImplementedError
+
+    def encode_audio(
+        self,
+        samples: np.ndarray,
+        rate: int,
+        channels: int = 1,
+        name: str = "recording",
+        spill_dir: Optional[Path] = None
+    ) -> EncodedAudio:
+        """Encode the samples for upload.
+        
+        The result stays in memory unless ``spill_dir`` is given, in which
+        case it is written there and read back at upload time.
+        """
+        if spill_dir is not None:
+            path = self.write(spill_dir / name, samples, rate, channels)
+            audio = EncodedAudio.from_path(path, self.mime_type)
+            audio.duration = samples.size / (rate * channels)
+            audio.digest = pcm_digest(samples, rate, channels)
+            return audio
+        return EncodedAudio(
+            filename=f"{name}{self.suffix}",
+            mime_type=self.mime_type,
+            data=self.encode(samples, rate, channels),
+            duration=samples.size / (rate * channels),
+            digest=pcm_digest(samples, rate, channels)
+        )
+
+    def write(self, path: Path, samples: np.ndarray, rate: int, channels: int = 1) -> Path:
+        """Encode the samples into a file; the path gets this encoder's suffix."""
+        path = path.with_suffix(self.suffix)
+        path.write_bytes(self.encode(samples, rate, channels))
+        return path
+
+    def write_chunks(self, path: Path, chunks: Iterable[np.ndarray], rate: int, channels: int = 1) -> Path:
+        """Encode consecutive chunks of samples into one file, like ``write``.
+
+        Encoders that can stream hold one chunk in memory at a time.
+        """
+        return self.write(path, np.concatenate(list(chunks)), rate, channels)
+
+
+class WavEncoder(AudioEncoder):
+    """Uncompressed 16-bit WAV, about 32 KB per second at 16 kHz."""
+
+    name = "wav"
+    suffix = ".wav"
+    mime_type = "audio/wav"
+
+    def encode(self, samples: np.ndarray, rate: int, channels: int = 1) -> bytes:
+        buffer = io.BytesIO()
+        with wave.open(buffer, 'wb') as wf:
+            wf.setnchannels(channels)
+            wf.setsampwidth(2)  # 16-bit audio
+            wf.setframerate(rate)
+            wf.writeframes(samples)
+        return buffer.getvalue()
+
+    def write(self, path: Path, samples: np.ndarray, rate: int, channels: int = 1) -> Path:
+        # Stream straight to disk rather than building the bytes in memory
+        return self.write_chunks(path, [samples], rate, channels)
+
+    def write_chunks(self, path: Path, chunks: Iterable[np.ndarray], rate: int, channels: int = 1) -> Path:
+        path = path.with_suffix(self.suffix)
+        with wave.open(str(path), 'wb') as wf:
+            wf.setnchannels(channels)
+            wf.setsampwidth(2)  # 16-bit audio
+            wf.setframerate(rate)
+            for chunk in chunks:
+                wf.writeframes(chunk)
+        return path
+
+
+class _SoundFileEncoder(AudioEncoder):
+    """Encoder backed by libsndfile through the optional soundfile package."""
+
+    format = ""
+    subtype = ""
+    compression_level = None
+
+    def encode(self, samples: np.ndarray, rate: int, channels: int = 1) -> bytes:
+        buffer = io.BytesIO()
+        data = samples.reshape(-1, channels) if channels > 1 else samples
+        soundfile.write(
+            buffer, data, rate,
+            format=self.format,
+            subtype=self.subtype,
+            compression_level=self.compression_level
+        )
+        return buffer.getvalue()
+
+    def write_chunks(self, path: Path, chunks: Iterable[np.ndarray], rate: int, channels: int = 1) -> Path:
+        path = path.with_suffix(self.suffix)
+        with soundfile.SoundFile(
+            str(path), 'w', rate, channels,
+            format=self.format,
+            subtype=self.subtype,
+            compression_level=self.compression_level
+        ) as f:
+            for chunk in chunks:
+                f.write(chunk.reshape(-1, channels) if channels > 1 else chunk)
+        return path
+
+
+class FlacEncoder(_SoundFileEncoder):
+    """Lossless FLAC; speech typically compresses to 40-60% of the WAV size."""
+
+    name = "flac"
+    suffix = ".flac"
+    mime_type = "audio/flac"
+    format = "FLAC"
+    subtype = "PCM_16"
+
+
+class OpusEncoder(_SoundFileEncoder):
+    """Lossy Ogg/Opus at a speech bitrate, roughly a tenth of the WAV size."""
+
+    name = "opus"
+    suffix = ".ogg"
+    mime_type = "audio/ogg"
+    format = "OGG"
+    subtype = "OPUS"
+    compression_level = 0.9  # libsndfile maps this to roughly 30 kbps for 16 kHz mono
+
+
+ENCODERS = {
+    encoder.name: encoder for encoder in (WavEncoder, FlacEncoder, OpusEncoder)
+}
+
+# Our own mime types for the formats we write, so they round-trip through files
+_SUFFIX_MIME_TYPES = {encoder.suffix: encoder.mime_type for encoder in ENCODERS.values()}
+
+
+def get_encoder_for(audio: EncodedAudio) -> AudioEncoder:
+    """Return an encoder producing the same format as ``audio``, or WAV."""
+    for encoder_class in ENCODERS.values():
+        if encoder_class.mime_type == audio.mime_type:
+            return get_encoder(encoder_class.name)
+    return WavEncoder()
+
+
+def get_encoder(name: str) -> AudioEncoder:
+    """Return the encoder for a settings name, falling back to WAV."""
+    encoder_class = ENCODERS.get((name or "").lower())
+    if encoder_class is None:
+        print(f"Unknown upload format '{name}', using WAV")
+        return WavEncoder()
+    if issubclass(encoder_class, _SoundFileEncoder) and soundfile is None:
+        print(f"soundfile is not installed, cannot encode {name}; using WAV")
+        return WavEncoder()
+    return encoder_class()
@@ -0,0 +1,192 @@
+import json
+import queue
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .config import CONFIG_DIR
+
+HISTORY_FILE = CONFIG_DIR / 'history.sqlite3'
+
+_TERM = re.compile(r"\w+")
+
+
+@dataclass
+class HistoryEntry:
+    """One delivered dictation."""
+    text: str  # What reached the clipboard
+    transcript: str = ""  # Raw Whisper output, before post-processing
+    created: float = field(default_factory=time.time)
+    audio_seconds: float = 0.0
+    latencies: Dict[str, float] = field(default_factory=dict)  # Stage -> ms
+    id: Optional[int] = None  # Set once read back from the store
+
+
+class History:
+    """Searchable on-disk history of every transcript.
+
+    ``add`` only queues the entry; a writer thread inserts whatever has
+    queued up in one transaction, so the GUI thread never waits on disk.
+    Text and transcript are indexed with SQLite FTS5, and ``search`` matches
+    every word of the query as a prefix, newest entries first, stopping at
+    ``limit`` rows so it stays fast however large the history grows. Where
+    SQLite was built without FTS5, search falls back to a LIKE scan.
+    """
+
+    BATCH_SIZE = 256  # Entries written per transaction at most
+
+    def __init__(self, path: Path = HISTORY_FILE):
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Used only by the writer thread after setup
+        self._db = sqlite3.connect(str(path), timeout=5.0, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self.full_text = self._create_schema()
+        # WAL lets searches read while the writer commits
+        self._reader = sqlite3.connect(str(path), timeout=5.0, check_same_thread=False)
+        self._reader_lock = threading.Lock()
+        self._queue: "queue.Queue[Optional[HistoryEntry]]" = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name="history-writer", daemon=True)
+        self._writer.start()
+
+    def _create_schema(self) -> bool:
+        """Create the tables; return whether the FTS5 index is available."""
+        with self._db:
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS entries (
+                    id INTEGER PRIMARY KEY,
+                    created REAL NOT NULL,
+                    text TEXT NOT NULL,
+                    transcript TEXT NOT NULL,
+                    audio_seconds REAL NOT NULL DEFAULT 0,
+                    latencies TEXT NOT NULL DEFAULT '{}'
+                )
+            """)
+            indexed = self._db.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'entries_fts'"
+            ).fetchone() is not None
+            try:
+                self._db.execute("""
+                    CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5(
+                        text, transcript, content='entries', content_rowid='id',
+                        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+                    )
+                """)
+            except sqlite3.OperationalError as e:
+                print(f"Full-text search unavailable, history search will be slower: {e}")
+                return False
+            self._db.execute("""
+                CREATE TRIGGER IF NOT EXISTS entries_ai AFTER INSERT ON entries BEGIN
+                    INSERT INTO entries_fts (rowid, text, transcript)
+                    VALUES (new.id, new.text, new.transcript);
+                END
+            """)
+            self._db.execute("""
+                CREATE TRIGGER IF NOT EXISTS entries_ad AFTER DELETE ON entries BEGIN
+                    INSERT INTO entries_fts (entries_fts, rowid, text, transcript)
+                    VALUES ('delete', old.id, old.text, old.transcript);
+                END
+            """)
+            if not indexed:
+                # Entries written while FTS5 was unavailable
+                self._db.execute("INSERT INTO entries_fts (entries_fts) VALUES ('rebuild')")
+        return True
+
+    def add(self, entry: HistoryEntry) -> None:
+        """Queue the entry for the writer thread; never blocks."""
+        self._queue.put(entry)
+
+    def flush(self) -> None:
+        """Wait until every queued entry is written."""
+        self._queue.join()
+
+    def has_pending(self) -> bool:
+        """Whether entries are queued that ``search`` can't see yet."""
+        return self._queue.unfinished_tasks > 0
+
+    def search(self, query: str = "", limit: int = 100, offset: int = 0) -> List[HistoryEntry]:
+        """Entries containing every word of ``query`` as a word prefix, newest first.
+
+        An empty query returns the most recent entries.
+        """
+        terms = _TERM.findall(query)
+        columns = "e.id, e.created, e.text, e.transcript, e.audio_seconds, e.latencies"
+        if not terms:
+            sql = f"SELECT {columns} FROM entries e ORDER BY e.id DESC LIMIT ? OFFSET ?"
+            params = [limit, offset]
+        elif self.full_text:
+            sql = (
+                f"SELECT {columns} FROM entries_fts f JOIN entries e ON e.id = f.rowid "
+                "WHERE entries_fts MATCH ? ORDER BY f.rowid DESC LIMIT ? OFFSET ?"
+            )
+            params = [" ".join(f'"{term}"*' for term in terms), limit, offset]
+        else:
+            conditions, params = [], []
+            for term in terms:
+                pattern = "%" + term.replace("\\", "\\\\").replace("_", "\\_") + "%"
+                conditions.append("(e.text LIKE ? ESCAPE '\\' OR e.transcript LIKE ? ESCAPE '\\')")
+                params += [pattern, pattern]
+            sql = (
+                f"SELECT {columns} FROM entries e WHERE {' AND '.join(conditions)} "
+                "ORDER BY e.id DESC LIMIT ? OFFSET ?"
+            )
+            params += [limit, offset]
+        with self._reader_lock:
+            rows = self._reader.execute(sql, params).fetchall()
+        return [
+            HistoryEntry(
+                text=text, transcript=transcript, created=created,
+                audio_seconds=audio_seconds, latencies=json.loads(latencies), id=entry_id
+            )
+            for entry_id, created, text, transcript, audio_seconds, latencies in rows
+        ]
+
+    def __len__(self) -> int:
+        with self._reader_lock:
+            return self._reader.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def close(self) -> None:
+        """Write what is queued, then stop the writer thread."""
+        self._queue.put(None)
+        self._writer.join()
+        with self._reader_lock:
+            self._reader.close()
+        self._db.close()
+
+    def _write_loop(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            # Take whatever else queued up meanwhile, so bursts share a commit
+            while len(batch) < self.BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            entries = [entry for entry in batch if entry is not None]
+            try:
+                if entries:
+                    self._write(entries)
+            except Exception as e:
+                print(f"Error writing history: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if len(entries) < len(batch):
+                return
+
+    def _write(self, entries: List[HistoryEntry]) -> None:
+        with self._db:
+            self._db.executemany(
+                "INSERT INTO entries (created, text, transcript, audio_seconds, latencies) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [
+                    (entry.created, entry.text, entry.transcript, entry.audio_seconds,
+                     json.dumps(entry.latencies))
+                    for entry in entries
+                ]
+            )
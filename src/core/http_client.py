@@ -0,0 +1,95 @@
+import threading
+import time
+from typing import Optional
+
+from openai import DEFAULT_CONNECTION_LIMITS, DefaultHttpxClient, Timeout
+
+# openai re-exports its HTTP library's Timeout but not Limits
+Limits = type(DEFAULT_CONNECTION_LIMITS)
+
+
+class SharedHttpClient:
+    """One pooled, keep-alive HTTP client shared by every API call.
+
+    The OpenAI SDK otherwise builds its own client per ``OpenAI`` instance
+    and lets idle connections expire after five seconds, so the first
+    request after launch or after a pause pays DNS, TCP and TLS setup.
+    This client outlives API key changes, keeps connections for
+    ``keepalive_seconds`` and can open one ahead of time with ``warm``.
+    """
+
+    def __init__(
+        self,
+        timeout: float = 60.0,
+        connect_timeout: float = 10.0,
+        max_connections: int = 10,
+        max_keepalive: int = 5,
+        keepalive_seconds: float = 120.0
+    ):
+        self.timeout = Timeout(timeout, connect=connect_timeout)
+        self.limits = Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_seconds
+        )
+        self.keepalive_seconds = keepalive_seconds
+        self._client = None
+        self._lock = threading.Lock()
+        self._warming: Optional[threading.Thread] = None
+        self.last_used = 0.0  # time.monotonic() of the last request or warm-up
+
+    @classmethod
+    def from_settings(cls, settings: dict) -> "SharedHttpClient":
+        return cls(
+            timeout=settings["http_timeout_seconds"],
+            connect_timeout=settings["http_connect_timeout_seconds"],
+            max_connections=settings["http_max_connections"],
+            max_keepalive=settings["http_max_keepalive"],
+            keepalive_seconds=settings["http_keepalive_seconds"]
+        )
+
+    @property
+    def client(self):
+        """The underlying HTTP client, created on first use."""
+        with self._lock:
+            if self._client is None:
+                self._client = DefaultHttpxClient(timeout=self.timeout, limits=self.limits)
+            return self._client
+
+    def mark_used(self) -> None:
+        self.last_used = time.monotonic()
+
+    def is_idle(self) -> bool:
+        """True once pooled connections have likely expired."""
+        return time.monotonic() - self.last_used >= self.keepalive_seconds
+
+    def warm(self, url: str) -> bool:
+        """Open a pooled connection to ``url``'s host with a cheap HEAD request.
+
+        Any HTTP response, even 401 or 404, means the connection is up and
+        back in the pool; only network errors count as failure.
+        """
+        try:
+            start = time.perf_counter()
+            self.client.head(url)
+            self.mark_used()
+            print(f"HTTP connection warmed in {(time.perf_counter() - start) * 1000:.0f} ms")
+            return True
+        except Exception as e:
+            print(f"Error warming HTTP connection: {e}")
+            return False
+
+    def warm_in_background(self, url: str) -> None:
+        """Warm the pool from a daemon thread unless a warm-up is already running."""
+        if self._warming is not None and self._warming.is_alive():
+            return
+        self._warming = threading.Thread(
+            target=self.warm, args=(url,), name="http-warm", daemon=True
+        )
+        self._warming.start()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
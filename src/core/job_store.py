@@ -0,0 +1,235 @@
+import os
+import shutil
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+
+from .config import CONFIG_DIR
+from .encoders import EncodedAudio, WavEncoder, pcm_digest
+
+JOBS_FILE = CONFIG_DIR / 'jobs.sqlite3'
+JOBS_AUDIO_DIR = CONFIG_DIR / 'jobs'
+
+
+@dataclass
+class StoredJob:
+    """An unfinished dictation read back from the store."""
+    id: str
+    stage: str
+    audio: Optional[EncodedAudio]  # None once only the transcript is needed
+    transcript: Optional[str]
+    attempts: int
+    created: float
+
+
+class JobStore:
+    """Durable record of every dictation until its text has been delivered.
+
+    A recording is saved when it stops, next to a row in a small SQLite
+    database that tracks its pipeline stage: ``recorded`` (audio saved),
+    ``transcribed`` (raw transcript saved) and ``failed`` (gave up after
+    ``MAX_ATTEMPTS``). Delivered jobs are deleted together with their
+    audio. Anything left ``recorded`` or ``transcribed`` after a crash,
+    restart or lost connection is returned by ``unfinished`` so it can be
+    resumed. The audio lives in its own directory, which the recorder's
+    temp cleanup doesn't touch.
+
+    Job ids are made up by the caller's thread and every write runs, in
+    call order, on the store's own writer thread, so the GUI thread never
+    waits on the disk. ``flush`` waits for the writes queued so far; a job
+    calls it before reading audio the store may still be moving.
+    """
+
+    STAGE_RECORDED = "recorded"
+    STAGE_TRANSCRIBED = "transcribed"
+    STAGE_FAILED = "failed"
+    MAX_ATTEMPTS = 3
+    # Audio of jobs that failed for good is kept this long for manual recovery
+    FAILED_RETENTION_SECONDS = 7 * 24 * 3600
+
+    def __init__(self, path: Path = JOBS_FILE, audio_dir: Path = JOBS_AUDIO_DIR):
+        self.path = path
+        self.audio_dir = audio_dir
+        self._lock = threading.Lock()
+        audio_dir.mkdir(parents=True, exist_ok=True)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Several app instances may overlap briefly during a restart
+        self._db = sqlite3.connect(str(path), timeout=5.0, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        with self._db:
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    stage TEXT NOT NULL,
+                    audio_path TEXT,
+                    mime_type TEXT,
+                    duration REAL NOT NULL DEFAULT 0,
+                    digest TEXT,
+                    transcript TEXT,
+                    error TEXT,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    created REAL NOT NULL,
+                    updated REAL NOT NULL
+                )
+            """)
+        self._prune_failed()
+        # One thread, so writes land in the order they were queued
+        self._writer = ThreadPoolExecutor(1, thread_name_prefix="job-store")
+
+    def _submit(self, write, *args) -> None:
+        def run():
+            try:
+                write(*args)
+            except Exception as e:
+                print(f"Error updating job store: {e}")
+        self._writer.submit(run)
+
+    def flush(self) -> None:
+        """Wait until every write queued so far has finished."""
+        self._writer.submit(lambda: None).result()
+
+    def add_recording(self, audio: EncodedAudio) -> str:
+        """Queue the recording to be saved and return its job id.
+
+        Audio already spilled to disk is moved into the store and ``audio``
+        is pointed at the new file; audio held in memory is written out and
+        kept in memory for the upload.
+        """
+        job_id = uuid.uuid4().hex
+        self._submit(self._write_recording, job_id, audio, time.time())
+        return job_id
+
+    def add_samples(self, samples: np.ndarray, rate: int, channels: int = 1) -> str:
+        """Queue int16 samples to be saved as WAV and return the job id.
+
+        Encoding and hashing happen on the writer thread too; ``samples``
+        must not be written to afterwards.
+        """
+        job_id = uuid.uuid4().hex
+        self._submit(self._write_samples, job_id, samples, rate, channels, time.time())
+        return job_id
+
+    def _write_samples(self, job_id: str, samples: np.ndarray, rate: int, channels: int, created: float) -> None:
+        encoder = WavEncoder()
+        audio = EncodedAudio(
+            filename=f"job_{job_id}{encoder.suffix}",
+            mime_type=encoder.mime_type,
+            data=encoder.encode(samples, rate, channels),
+            duration=samples.size / (rate * channels),
+            digest=pcm_digest(samples, rate, channels)
+        )
+        self._write_recording(job_id, audio, created)
+
+    def _write_recording(self, job_id: str, audio: EncodedAudio, created: float) -> None:
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT INTO jobs (id, stage, mime_type, duration, digest, created, updated) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_id, self.STAGE_RECORDED, audio.mime_type, audio.duration, audio.digest,
+                 created, created)
+            )
+        path = self.audio_dir / f"job_{job_id}{Path(audio.filename).suffix}"
+        try:
+            if audio.data is not None:
+                self._write_file(path, audio.data)
+            else:
+                shutil.move(str(audio.path), str(path))
+                audio.path = path
+        except Exception:
+            self._delete(job_id)
+            raise
+        with self._lock, self._db:
+            self._db.execute("UPDATE jobs SET audio_path = ? WHERE id = ?", (str(path), job_id))
+
+    def mark_transcribed(self, job_id: str, transcript: str) -> None:
+        """Record the raw transcript so a resumed job skips speech recognition."""
+        self._submit(self._update, job_id,
+                     "stage = ?, transcript = ?", (self.STAGE_TRANSCRIBED, transcript))
+
+    def fail(self, job_id: str, error: str) -> None:
+        """Count a failed attempt; after ``MAX_ATTEMPTS`` the job is no longer resumed."""
+        self._submit(self._update, job_id,
+                     "attempts = attempts + 1, error = ?, "
+                     "stage = CASE WHEN attempts + 1 >= ? THEN ? ELSE stage END",
+                     (error, self.MAX_ATTEMPTS, self.STAGE_FAILED))
+
+    def complete(self, job_id: str) -> None:
+        """The text was delivered; forget the job and its audio."""
+        self._submit(self._delete, job_id)
+
+    def discard(self, job_id: str) -> None:
+        """The user cancelled the job; forget it and its audio."""
+        self._submit(self._delete, job_id)
+
+    def unfinished(self) -> List[StoredJob]:
+        """Jobs to resume, oldest first."""
+        self.flush()
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id, stage, audio_path, mime_type, duration, digest, transcript, attempts, created "
+                "FROM jobs WHERE stage IN (?, ?) ORDER BY created, rowid",
+                (self.STAGE_RECORDED, self.STAGE_TRANSCRIBED)
+            ).fetchall()
+        jobs = []
+        for job_id, stage, audio_path, mime_type, duration, digest, transcript, attempts, created in rows:
+            audio = None
+            if stage == self.STAGE_RECORDED:
+                if not audio_path or not Path(audio_path).exists():
+                    print(f"Recording for job {job_id} is missing, dropping it")
+                    self._delete(job_id)
+                    continue
+                audio = EncodedAudio.from_path(Path(audio_path), mime_type)
+                audio.duration = duration
+                audio.digest = digest
+            jobs.append(StoredJob(job_id, stage, audio, transcript, attempts, created))
+        return jobs
+
+    def __len__(self) -> int:
+        self.flush()
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+    def close(self) -> None:
+        """Finish the queued writes and close the database."""
+        self._writer.shutdown(wait=True)
+        with self._lock:
+            self._db.close()
+
+    def _write_file(self, path: Path, data: bytes) -> None:
+        """Write the file so a crash leaves either all of it or nothing."""
+        temp = path.with_name(path.name + ".tmp")
+        with open(temp, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp, path)
+
+    def _update(self, job_id: str, assignments: str, params: tuple) -> None:
+        with self._lock, self._db:
+            self._db.execute(
+                f"UPDATE jobs SET {assignments}, updated = ? WHERE id = ?",
+                (*params, time.time(), job_id)
+            )
+
+    def _delete(self, job_id: str) -> None:
+        with self._lock, self._db:
+            row = self._db.execute("SELECT audio_path FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            self._db.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+        if row and row[0]:
+            Path(row[0]).unlink(missing_ok=True)
+
+    def _prune_failed(self) -> None:
+        cutoff = time.time() - self.FAILED_RETENTION_SECONDS
+        with self._lock:
+            ids = [row[0] for row in self._db.execute(
+                "SELECT id FROM jobs WHERE stage = ? AND updated < ?", (self.STAGE_FAILED, cutoff)
+            )]
+        for job_id in ids:
+            self._delete(job_id)
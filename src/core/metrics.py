@@ -0,0 +1,241 @@
+import itertools
+import json
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+
+from .config import CONFIG_DIR
+
+METRICS_FILE = CONFIG_DIR / 'metrics.jsonl'
+
+
+@dataclass
+class Trace:
+    """One utterance's trip from the stop click to the clipboard."""
+    id: int
+    started: float = field(default_factory=time.perf_counter)
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+
+# Trace of the utterance being handled on this thread, attached to its spans
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("trace", default=None)
+
+
+class Histogram:
+    """Durations and byte counts of the last ``size`` spans with one name."""
+
+    def __init__(self, size: int = 512):
+        self.seconds = deque(maxlen=size)
+        self.bytes = deque(maxlen=size)
+        self.count = 0  # Since startup, not just the window
+        self.errors = 0
+
+    def add(self, seconds: float, nbytes: int = 0, error: bool = False) -> None:
+        self.seconds.append(seconds)
+        self.bytes.append(nbytes)
+        self.count += 1
+        self.errors += error
+
+    def percentile(self, p: float) -> float:
+        """Duration in seconds at percentile ``p`` (0-100) of the window."""
+        return float(np.percentile(self.seconds, p)) if self.seconds else 0.0
+
+    def summary(self) -> dict:
+        p50, p95, p99 = np.percentile(self.seconds, (50, 95, 99)) if self.seconds else (0, 0, 0)
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "p50_ms": round(float(p50) * 1000, 2),
+            "p95_ms": round(float(p95) * 1000, 2),
+            "p99_ms": round(float(p99) * 1000, 2),
+            "max_ms": round(max(self.seconds, default=0) * 1000, 2),
+            "mean_bytes": round(float(np.mean(self.bytes)), 1) if self.bytes else 0.0,
+        }
+
+
+class Span:
+    """Times a block of code; use through ``Metrics.span``."""
+
+    __slots__ = ("metrics", "name", "nbytes", "fields", "start")
+
+    def __init__(self, metrics: "Metrics", name: str, nbytes: int, fields: dict):
+        self.metrics = metrics
+        self.name = name
+        self.nbytes = nbytes
+        self.fields = fields
+        self.start = 0.0
+
+    def add_bytes(self, nbytes: int) -> None:
+        self.nbytes += nbytes
+
+    def set(self, **fields) -> None:
+        """Attach fields to the exported event."""
+        self.fields.update(fields)
+
+    def __enter__(self) -> "Span":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.metrics.record(
+            self.name, time.perf_counter() - self.start, self.nbytes,
+            error=exc_type is not None, **self.fields
+        )
+        return False
+
+
+class _NullSpan:
+    """Stand-in returned while metrics are disabled; does nothing."""
+
+    __slots__ = ()
+
+    def add_bytes(self, nbytes: int) -> None:
+        pass
+
+    def set(self, **fields) -> None:
+        pass
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Metrics:
+    """Per-stage timings of the record -> transcribe -> clipboard pipeline.
+
+    ``span`` times a block with ``time.perf_counter`` and adds the result,
+    with any byte count, to a rolling ``Histogram`` per span name. Each span
+    is also queued as an event and appended to ``export_path`` as a JSON
+    line by ``flush``; the app calls ``flush_later`` between utterances, so
+    the file is written on a background thread rather than the GUI's. Events carry the id of the current ``Trace`` so the
+    stages of one slow utterance can be lined up. While disabled, ``span``
+    returns a shared no-op object and nothing is recorded.
+    """
+
+    MAX_PENDING = 10000  # Events kept for export if flush is never called
+
+    def __init__(self, enabled: bool = False, window: int = 512, export_path: Optional[Path] = None):
+        self.enabled = enabled
+        self.window = window
+        self.export_path = export_path
+        self._histograms: Dict[str, Histogram] = {}
+        self._pending = deque(maxlen=self.MAX_PENDING)
+        self._trace_ids = itertools.count(1)
+        self._lock = threading.Lock()
+        # Keeps flushes from different threads from interleaving their lines
+        self._flush_lock = threading.Lock()
+        self._flusher: Optional[ThreadPoolExecutor] = None
+
+    def span(self, name: str, nbytes: int = 0, **fields):
+        if not self.enabled:
+            return _NULL_SPAN
+        return Span(self, name, nbytes, fields)
+
+    def record(self, name: str, seconds: float, nbytes: int = 0, error: bool = False, **fields) -> None:
+        """Add a measurement taken elsewhere, e.g. time to first token."""
+        if not self.enabled:
+            return
+        trace = _current_trace.get()
+        event = {
+            "ts": round(time.time(), 3),
+            "span": name,
+            "ms": round(seconds * 1000, 3),
+            "bytes": nbytes,
+        }
+        if trace is not None:
+            event["trace"] = trace.id
+        if error:
+            event["error"] = True
+        event.update(fields)
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram(self.window)
+            histogram.add(seconds, nbytes, error)
+            self._pending.append(event)
+
+    def start_trace(self) -> Optional[Trace]:
+        """A new trace for an utterance, or None while disabled."""
+        return Trace(next(self._trace_ids)) if self.enabled else None
+
+    @contextmanager
+    def tracing(self, trace: Optional[Trace]):
+        """Attach spans recorded on this thread inside the block to ``trace``."""
+        if trace is None:
+            yield
+            return
+        token = _current_trace.set(trace)
+        try:
+            yield
+        finally:
+            _current_trace.reset(token)
+
+    def histogram(self, name: str) -> Optional[Histogram]:
+        with self._lock:
+            return self._histograms.get(name)
+
+    def snapshot(self) -> Dict[str, dict]:
+        """Summary of every histogram, by span name."""
+        with self._lock:
+            return {name: histogram.summary() for name, histogram in sorted(self._histograms.items())}
+
+    def flush(self, summary: bool = False) -> None:
+        """Append queued events, and with ``summary`` every histogram's summary, to ``export_path``."""
+        if self.export_path is None:
+            return
+        with self._flush_lock:
+            with self._lock:
+                events = list(self._pending)
+                self._pending.clear()
+            if summary:
+                now = round(time.time(), 3)
+                events.extend(
+                    dict(ts=now, summary=name, **stats) for name, stats in self.snapshot().items()
+                )
+            if not events:
+                return
+            try:
+                self.export_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.export_path, 'a', encoding='utf-8') as f:
+                    f.writelines(json.dumps(event) + "\n" for event in events)
+            except Exception as e:
+                print(f"Error writing metrics: {e}")
+
+    def flush_later(self) -> Optional[Future]:
+        """Run ``flush`` on a background thread; None if there is nothing to write."""
+        with self._lock:
+            if self.export_path is None or not self._pending:
+                return None
+            if self._flusher is None:
+                self._flusher = ThreadPoolExecutor(1, thread_name_prefix="metrics")
+        return self._flusher.submit(self.flush)
+
+    def configure(self, settings: dict, export_path: Optional[Path] = METRICS_FILE) -> None:
+        """Apply the ``metrics_*`` settings."""
+        self.enabled = bool(settings["metrics_enabled"])
+        self.window = int(settings["metrics_window"])
+        self.export_path = export_path
+
+
+_metrics = Metrics()
+
+
+def get_metrics() -> Metrics:
+    """The application's shared metrics, disabled until configured."""
+    return _metrics
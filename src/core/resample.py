@@ -0,0 +1,81 @@
+from math import gcd
+
+import numpy as np
+
+
+class StreamingResampler:
+    """Polyphase windowed-sinc resampler for mono float32 audio.
+
+    The rate change is reduced to a rational factor ``up / down`` and the
+    low-pass prototype filter is split into ``up`` phases. Each output
+    sample is a dot product of one phase with the most recent inputs, and a
+    block's outputs are computed together with a single gather and
+    ``einsum``, so the cost is linear in the number of samples. Filter
+    history is carried between calls, so consecutive blocks join without
+    seams.
+    """
+
+    ZERO_CROSSINGS = 16  # Filter half-width, in periods of the lower rate
+    CUTOFF = 0.92  # Passband edge as a fraction of the lower Nyquist frequency
+    KAISER_BETA = 8.0
+
+    def __init__(self, in_rate: int, out_rate: int, zero_crossings: int = ZERO_CROSSINGS):
+        divisor = gcd(int(in_rate), int(out_rate))
+        self.in_rate = int(in_rate)
+        self.out_rate = int(out_rate)
+        self.up = self.out_rate // divisor
+        self.down = self.in_rate // divisor
+
+        # Prototype low-pass filter at the upsampled rate in_rate * up
+        ratio = max(self.up, self.down)
+        length = 2 * zero_crossings * ratio + 1
+        n = np.arange(length) - (length - 1) / 2
+        cutoff = self.CUTOFF / ratio
+        prototype = cutoff * np.sinc(cutoff * n) * np.kaiser(length, self.KAISER_BETA)
+        # Unity gain once the zero-stuffed upsampled signal is filtered
+        prototype *= self.up / prototype.sum()
+
+        # phases[p, k] = prototype[p + k * up]; zero-pad to a whole number of taps
+        self.taps = -(-length // self.up)
+        padded = np.zeros(self.taps * self.up)
+        padded[:length] = prototype
+        self._phases = padded.reshape(self.taps, self.up).T.astype(np.float32)
+        self._tap_offsets = np.arange(self.taps)
+
+        self._history = np.zeros(self.taps - 1, dtype=np.float32)
+        # Position of the next output in the upsampled timeline, relative to
+        # the start of the history buffer
+        self._position = (self.taps - 1) * self.up
+
+    @property
+    def ratio(self) -> float:
+        return self.up / self.down
+
+    def reset(self) -> None:
+        """Forget the filter history, e.g. when a new stream starts."""
+        self._history[:] = 0
+        self._position = (self.taps - 1) * self.up
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """Resample one block of mono float32 samples."""
+        if self.up == self.down:
+            return block
+        extended = np.concatenate((self._history, block.astype(np.float32, copy=False)))
+        end = extended.size * self.up
+        count = max(0, -(-(end - self._position) // self.down))
+
+        if count:
+            positions = self._position + self.down * np.arange(count)
+            newest = positions // self.up
+            phase = positions % self.up
+            # Row j holds the inputs newest[j], newest[j] - 1, ... for output j
+            window = extended[newest[:, None] - self._tap_offsets]
+            output = np.einsum('ij,ij->i', window, self._phases[phase])
+        else:
+            output = np.zeros(0, dtype=np.float32)
+
+        self._position += count * self.down
+        consumed = extended.size - self._history.size
+        self._history = extended[consumed:].copy()
+        self._position -= consumed * self.up
+        return output
@@ -0,0 +1,132 @@
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .metrics import Trace
+
+
+class TranscriptAssembler:
+    """Collects per-segment transcripts and stitches them in recording order.
+
+    Segments are transcribed concurrently while the user is still speaking,
+    so results can arrive in any order. The total is only known once the
+    recording stops.
+    """
+
+    def __init__(self):
+        self._parts: dict[int, str] = {}
+        self._total: Optional[int] = None
+
+    @property
+    def received(self) -> int:
+        return len(self._parts)
+
+    def add(self, index: int, text: str) -> None:
+        self._parts[index] = (text or "").strip()
+
+    def set_total(self, total: int) -> None:
+        self._total = total
+
+    def is_complete(self) -> bool:
+        return self._total is not None and all(
+            index in self._parts for index in range(self._total)
+        )
+
+    def text(self) -> str:
+        """Return the transcripts received so far, joined in order."""
+        return " ".join(
+            self._parts[index] for index in sorted(self._parts) if self._parts[index]
+        )
+
+
+@dataclass
+class Utterance:
+    """One recording on its way from the microphone to the clipboard."""
+    assembler: Optional[TranscriptAssembler] = None  # Live transcription segments
+    trace: Optional[Trace] = None
+    slot: Optional[int] = None  # Place in the UtteranceQueue, once recording stopped
+    job_id: Optional[str] = None  # Row in the JobStore, once saved
+    resumed: bool = False  # Recovered from an earlier session
+    failed: bool = False
+    # Kept for the transcript history
+    stopped: float = 0.0  # perf_counter() when recording stopped
+    transcript: str = ""  # Raw transcript, before post-processing
+    audio_seconds: float = 0.0
+    latencies: Dict[str, float] = field(default_factory=dict)  # Stage -> ms
+
+
+class UtteranceQueue:
+    """Runs utterance jobs concurrently and releases their results in recording order.
+
+    A slot is ``reserve``d when a recording stops, so the order is fixed even
+    if its job is only submitted later (live transcription waiting for its
+    last segments). At most ``max_in_flight`` jobs run at once and the rest
+    wait, oldest first; ``start`` is called with each job as it may run.
+    ``finish`` stores a slot's result and returns every result that is now
+    deliverable, oldest first, so a slow utterance holds back later ones.
+    """
+
+    def __init__(self, start: Callable[[Any], None], max_in_flight: int = 2):
+        self.start = start
+        self.max_in_flight = max(1, max_in_flight)
+        self._next_slot = 0
+        self._next_delivery = 0
+        self._waiting: deque = deque()  # (slot, job)
+        self._running: Dict[int, Any] = {}
+        self._results: Dict[int, Any] = {}
+
+    @property
+    def pending(self) -> int:
+        """Slots reserved but not yet delivered."""
+        return self._next_slot - self._next_delivery
+
+    @property
+    def running(self) -> int:
+        return len(self._running)
+
+    def reserve(self) -> int:
+        slot = self._next_slot
+        self._next_slot += 1
+        return slot
+
+    def is_next(self, slot: int) -> bool:
+        """True if ``slot`` is the oldest undelivered one, whose output may be shown live."""
+        return slot == self._next_delivery
+
+    def submit(self, slot: int, job: Any) -> None:
+        if slot < self._next_delivery:
+            return  # Cancelled
+        self._waiting.append((slot, job))
+        self._start_waiting()
+
+    def finish(self, slot: int, result: Any = None) -> List[Tuple[int, Any]]:
+        """Record the slot's result; returns the (slot, result) pairs now in order."""
+        self._running.pop(slot, None)
+        if slot >= self._next_delivery:
+            self._results[slot] = result
+        ready = []
+        while self._next_delivery in self._results:
+            ready.append((self._next_delivery, self._results.pop(self._next_delivery)))
+            self._next_delivery += 1
+        self._start_waiting()
+        return ready
+
+    @property
+    def held(self) -> List[Any]:
+        """Results finished but waiting for an earlier slot."""
+        return list(self._results.values())
+
+    def cancel(self) -> List[Any]:
+        """Drop every reserved slot; returns the jobs that were running or waiting."""
+        jobs = list(self._running.values()) + [job for _, job in self._waiting]
+        self._running.clear()
+        self._waiting.clear()
+        self._results.clear()
+        self._next_delivery = self._next_slot
+        return jobs
+
+    def _start_waiting(self) -> None:
+        while self._waiting and len(self._running) < self.max_in_flight:
+            slot, job = self._waiting.popleft()
+            self._running[slot] = job
+            self.start(job)
@@ -0,0 +1,160 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Union
+
+
+def content_key(*parts: Union[str, bytes]) -> str:
+    """Hash the parts into a cache key; parts are length-prefixed so they can't run together."""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode('utf-8')
+        digest.update(len(part).to_bytes(8, 'little'))
+        digest.update(part)
+    return digest.hexdigest()
+
+
+class TranscriptCache:
+    """Persistent LRU cache of transcripts keyed by content hash.
+
+    Entries live in a small SQLite database so retries and replays of the
+    same audio skip the upload. Each read refreshes an entry's last-used
+    time, and once the stored text exceeds ``max_bytes`` the least recently
+    used entries are evicted. Safe to share between worker threads.
+    """
+
+    def __init__(self, path: Path, max_bytes: int = 20 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        with self._db:
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS entries (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    last_used REAL NOT NULL
+                )
+            """)
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used)"
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    @property
+    def size(self) -> int:
+        """Bytes of cached text."""
+        with self._lock:
+            return self._total_size()
+
+    def _total_size(self) -> int:
+        return self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._db.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            with self._db:
+                self._db.execute(
+                    "UPDATE entries SET last_used = ? WHERE key = ?", (time.time(), key)
+                )
+            return row[0]
+
+    def put(self, key: str, value: str) -> None:
+        size = len(value.encode('utf-8'))
+        if size > self.max_bytes:
+            return
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, last_used) VALUES (?, ?, ?, ?)",
+                (key, value, size, time.time())
+            )
+            self._evict()
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the cache fits ``max_bytes``."""
+        excess = self._total_size() - self.max_bytes
+        if excess <= 0:
+            return
+        freed = 0
+        victims = []
+        for key, size in self._db.execute("SELECT key, size FROM entries ORDER BY last_used"):
+            victims.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        self._db.executemany("DELETE FROM entries WHERE key = ?", victims)
+
+    def clear(self) -> None:
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM entries")
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+def normalize_transcript(text: str) -> str:
+    """Fold case, whitespace and surrounding punctuation so "Yes." and " yes" match."""
+    return " ".join(text.split()).strip(" .,!?;:").casefold()
+
+
+class PostProcessMemo:
+    """LRU memo of post-processed text keyed by (system prompt, transcript).
+
+    Short phrases like "yes" or "new paragraph" are dictated over and over
+    and always post-process the same way. Lookups hit a small in-memory
+    OrderedDict first and fall back to the on-disk ``store``. The prompt is
+    part of every key, so editing it invalidates the memo by itself; the
+    in-memory entries for the old prompt are also dropped right away.
+    """
+
+    def __init__(self, store: Optional[TranscriptCache] = None, max_entries: int = 256):
+        self.store = store
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._prompt_key: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def key(self, system_prompt: str, transcript: str, model: str = "") -> str:
+        prompt_key = content_key(model, system_prompt)
+        with self._lock:
+            if prompt_key != self._prompt_key:
+                self._entries.clear()
+                self._prompt_key = prompt_key
+        return content_key("memo", prompt_key, normalize_transcript(transcript))
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+        value = self.store.get(key) if self.store is not None else None
+        if value is not None:
+            self._remember(key, value)
+        return value
+
+    def put(self, key: str, value: str) -> None:
+        self._remember(key, value)
+        if self.store is not None:
+            self.store.put(key, value)
+
+    def _remember(self, key: str, value: str) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
@@ -1,46 +1,94 @@
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
+from typing import Callable, Optional, Union
 from openai import OpenAI
 
+from .asr import ASRBackend, get_asr_backend, parallel_workers
+from .chunking import split_at_silence, stitch_transcripts
+from .config import CONFIG_DIR, DEFAULT_SYSTEM_PROMPT, ConfigStore, get_store
+from .encoders import EncodedAudio, WavEncoder, decode_audio, get_encoder_for
+from .http_client import SharedHttpClient
+from .metrics import get_metrics
+from .transcript_cache import PostProcessMemo, TranscriptCache, content_key
+
+API_BASE_URL = "https://api.openai.com/v1"
+CACHE_FILE = CONFIG_DIR / 'transcripts.sqlite3'
+
+
+def api_base_url(settings: dict) -> str:
+    """Where API requests go: $OPENAI_BASE_URL, the ``api_base_url`` setting, or OpenAI."""
+    return os.environ.get("OPENAI_BASE_URL") or settings["api_base_url"] or API_BASE_URL
+
+
 class TranscriptionService:
-    def __init__(self):
+    CHAT_MODEL = "gpt-4o-mini"
+    LANGUAGE = "en"
+
+    def __init__(self, settings: Optional[dict] = None, config: Optional[ConfigStore] = None):
+        self.config = config or get_store()
+        settings = settings or self.config.settings()
         self.api_key = None
         self.client = None
+        # Overridable so a local mock server or proxy can stand in for the API
+        self.base_url = api_base_url(settings)
+        # Pooled connections outlive the OpenAI client, which is rebuilt
+        # whenever the API key changes
+        self.http = SharedHttpClient.from_settings(settings)
+        self.cache = self._open_cache(settings)
+        # Repeated short phrases skip GPT entirely; backed by the cache database
+        self.memo = (
+            PostProcessMemo(self.cache, settings["post_process_memo_entries"])
+            if settings["post_process_memo"] else None
+        )
+        # Speech recognition: the hosted API or a local Whisper model
+        self.asr: ASRBackend = get_asr_backend(settings, self._api_client)
+        # Long recordings are split at pauses and the chunks transcribed concurrently
+        self.parallel_workers = parallel_workers(settings)
+        self.parallel_min_seconds = settings["parallel_min_seconds"]
+        self.chunk_seconds = settings["parallel_chunk_seconds"]
         self._load_api_key()
-        
-    def _load_api_key(self):
-        """Load the API key from config file without initializing the client."""
+
+    def _open_cache(self, settings: dict) -> Optional[TranscriptCache]:
+        """Open the transcript cache, or return None if it is disabled or unusable."""
+        if not settings["transcript_cache"]:
+            return None
         try:
-            home = str(Path.home())
-            config_dir = os.path.join(home, '.voice-prompt')
-            config_file = os.path.join(config_dir, 'config')
-            if os.path.exists(config_file):
-                with open(config_file, 'r') as f:
-                    api_key = f.read().strip()
-                    if api_key:
-                        self.api_key = api_key
-            return self.api_key
+            return TranscriptCache(CACHE_FILE, int(settings["transcript_cache_mb"] * 1024 * 1024))
         except Exception as e:
-            print(f"Error loading API key: {e}")
+            print(f"Error opening transcript cache: {e}")
             return None
 
-    def _load_system_prompt(self) -> str:
-        """Load the system prompt from config file."""
-        try:
-            home = str(Path.home())
-            config_dir = os.path.join(home, '.voice-prompt')
-            prompt_file = os.path.join(config_dir, 'system_prompt')
-            if os.path.exists(prompt_file):
-                with open(prompt_file, 'r') as f:
-                    return f.read().strip()
-        except Exception as e:
-            print(f"Error loading system prompt: {e}")
+    def audio_key(self, audio: EncodedAudio) -> str:
+        """Cache key for Whisper's transcript of this audio with the current parameters."""
+        return content_key("whisper", self.asr.model_id, self.LANGUAGE, audio.content_digest())
+
+    def is_ready(self) -> bool:
+        """True if recordings can be transcribed: an API key is set or not needed."""
+        return bool(self.api_key) or not self.asr.requires_api_key
+
+    def _api_client(self) -> OpenAI:
+        """The OpenAI client for a request that is about to be made."""
+        if not self._ensure_client():
+            raise RuntimeError("OpenAI API key not found. Please set it in the settings.")
+        self.http.mark_used()
+        return self.client
         
-        # Return default prompt if file doesn't exist or there's an error
-        return """You are a helpful assistant. Your task is to correct any spelling discrepancies 
-in the transcribed text. Add necessary punctuation such as periods, commas, 
-and capitalization. Make the text more readable while preserving its original meaning. 
-Use only the context provided."""
+    def _load_api_key(self):
+        """Load the API key from the config store without initializing the client."""
+        api_key = self.config.api_key()
+        if api_key != self.api_key:
+            # Rebuild the OpenAI client for the new key; the pooled
+            # connections are kept
+            self.api_key = api_key
+            self.client = None
+        return self.api_key
+
+    def _load_system_prompt(self) -> str:
+        """Return the saved system prompt, or the default one."""
+        return self.config.system_prompt() or DEFAULT_SYSTEM_PROMPT
 
     def load_api_key(self):
         """Public method to load API key and return it."""
@@ -49,17 +97,12 @@ Use only the context provided."""
     def clear_api_key(self) -> bool:
         """Clear the API key from local storage."""
         try:
-            home = str(Path.home())
-            config_dir = os.path.join(home, '.voice-prompt')
-            config_file = os.path.join(config_dir, 'config')
-            
-            if os.path.exists(config_file):
-                os.remove(config_file)
-                self.api_key = None
-                self.client = None
+            removed = self.config.clear_api_key()
+            self.api_key = None
+            self.client = None
+            if removed:
                 print("API key cleared successfully")
-                return True
-            return False
+            return removed
         except Exception as e:
             print(f"Error clearing API key: {e}")
             return False
@@ -70,68 +113,227 @@ Use only the context provided."""
             try:
                 self.client = OpenAI(
                     api_key=self.api_key,
-                    base_url="https://api.openai.com/v1"  # Explicitly set base URL
+                    base_url=self.base_url,
+                    http_client=self.http.client
                 )
             except Exception as e:
                 print(f"Error initializing OpenAI client: {e}")
                 return False
         return self.client is not None
 
-    def post_process_transcript(self, transcript: str) -> str:
-        """Post-process the transcript using GPT-4 for improved accuracy."""
-        if not self._ensure_client():
-            return transcript
+    def warm_up(self, only_if_idle: bool = False) -> None:
+        """Open a connection to the API in the background before it is needed.
+
+        With ``only_if_idle`` nothing happens while pooled connections are
+        still fresh, so this is cheap to call whenever a recording starts.
+        """
+        if not self.api_key or (only_if_idle and not self.http.is_idle()):
+            return
+        self.http.warm_in_background(self.base_url)
+
+    def close(self) -> None:
+        """Close pooled connections and the transcript cache."""
+        self.client = None
+        self.http.close()
+        self.asr.close()
+        if self.cache is not None:
+            self.cache.close()
+            self.cache = None
+
+    def post_process_transcript(
+        self,
+        transcript: str,
+        on_partial: Optional[Callable[[str], None]] = None,
+        is_cancelled: Optional[Callable[[], bool]] = None,
+        audio_key: Optional[str] = None,
+        strict: bool = False
+    ) -> str:
+        """Post-process the transcript using GPT-4 for improved accuracy.
 
+        With ``on_partial`` the completion is streamed and the callback gets
+        the text so far after every chunk. ``is_cancelled`` is checked
+        between chunks so a streamed response can be abandoned early.
+        Given the ``audio_key`` the transcript came from, the result is
+        cached alongside Whisper's; it is also memoized by prompt and
+        transcript text, so repeated phrases are only sent once.
+        A failed request falls back to the raw transcript, unless ``strict``
+        is set, in which case the error is raised.
+        """
+        with get_metrics().span("post_process", len(transcript.encode('utf-8'))):
+            return self._post_process(transcript, on_partial, is_cancelled, audio_key, strict)
+
+    def _post_process(self, transcript, on_partial, is_cancelled, audio_key, strict=False) -> str:
         system_prompt = self._load_system_prompt()
+        cache_key = None
+        if audio_key and self.cache is not None:
+            cache_key = content_key("post", audio_key, self.CHAT_MODEL, system_prompt)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                print("Post-processed transcript found in cache")
+                return cached
+        memo_key = None
+        if self.memo is not None:
+            memo_key = self.memo.key(system_prompt, transcript, self.CHAT_MODEL)
+            memoized = self.memo.get(memo_key)
+            if memoized is not None:
+                print("Post-processed transcript found in memo")
+                return memoized
+
+        if not self._ensure_client():
+            if strict:
+                raise RuntimeError("OpenAI API key not found. Please set it in the settings.")
+            return transcript
 
+        metrics = get_metrics()
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                temperature=0,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": system_prompt
-                    },
-                    {
-                        "role": "user",
-                        "content": transcript
-                    }
-                ]
-            )
-            return response.choices[0].message.content
+            self.http.mark_used()
+            with metrics.span("post_process.request", stream=on_partial is not None) as span:
+                text = self._request_completion(system_prompt, transcript, on_partial, is_cancelled)
+                span.add_bytes(len(text.encode('utf-8')) if text else 0)
         except Exception as e:
+            if strict:
+                raise
             print(f"Post-processing error: {e}")
             return transcript
 
-    def transcribe_audio(self, audio_path: Path) -> str:
+        if not text or (is_cancelled is not None and is_cancelled()):
+            return text or transcript
+        if cache_key is not None:
+            self.cache.put(cache_key, text)
+        if memo_key is not None:
+            self.memo.put(memo_key, text)
+        return text
+
+    def _request_completion(self, system_prompt, transcript, on_partial, is_cancelled) -> str:
+        """Send the chat completion request, streamed if ``on_partial`` is given."""
+        start = time.perf_counter()
+        response = self.client.chat.completions.create(
+            model=self.CHAT_MODEL,
+            temperature=0,
+            messages=[
+                {
+                    "role": "system",
+                    "content": system_prompt
+                },
+                {
+                    "role": "user",
+                    "content": transcript
+                }
+            ],
+            stream=on_partial is not None
+        )
+        if on_partial is None:
+            return response.choices[0].message.content
+        return self._read_stream(response, on_partial, is_cancelled, start)
+
+    def _read_stream(self, stream, on_partial, is_cancelled, start: float) -> str:
+        """Collect a streamed chat completion, reporting the text as it grows."""
+        parts = []
+        try:
+            for chunk in stream:
+                if is_cancelled is not None and is_cancelled():
+                    break
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    if not parts:
+                        get_metrics().record("post_process.first_token", time.perf_counter() - start)
+                    parts.append(delta)
+                    on_partial("".join(parts))
+        finally:
+            # Releases the connection back to the pool, also when abandoned
+            close = getattr(stream, "close", None)
+            if close is not None:
+                close()
+        return "".join(parts)
+
+    def whisper_transcribe(self, audio: Union[Path, EncodedAudio]) -> str:
+        """Transcribe the audio with the ASR backend and return the raw transcript.
+
+        ``audio`` is either encoded audio handed over in memory or a path to
+        an audio file. Unlike ``transcribe_audio`` this raises on failure, so
+        background workers can report the error and the stage it happened in.
+        """
+        if isinstance(audio, Path):
+            audio = EncodedAudio.from_path(audio)
+
+        if not audio.exists():
+            raise FileNotFoundError(f"Audio file not found at {audio.path}")
+
+        print(f"Attempting to transcribe audio: {audio.filename}")
+        print(f"Size: {audio.size} bytes")
+
+        chunked = self.parallel_workers > 1 and audio.duration >= self.parallel_min_seconds
+        with get_metrics().span("asr.transcribe", audio.size, chunked=chunked):
+            if chunked:
+                return self._transcribe_cached(audio, self._transcribe_chunked)
+            return self._transcribe_cached(audio, self._run_asr)
+
+    def _transcribe_cached(self, audio: EncodedAudio, transcribe: Callable) -> str:
+        """Return the cached transcript of the audio, or ``transcribe`` it and cache it."""
+        cache_key = self.audio_key(audio) if self.cache is not None else None
+        if cache_key is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                print(f"Transcript for {audio.filename} found in cache")
+                return cached
+        transcript = transcribe(audio)
+        if cache_key is not None:
+            self.cache.put(cache_key, transcript)
+        return transcript
+
+    def _run_asr(self, audio: EncodedAudio, chunk: bool = False) -> str:
+        print(f"Starting transcription with Whisper ({self.asr.model_id})...")
+        transcribe = self.asr.transcribe_chunk if chunk else self.asr.transcribe
+        with get_metrics().span("asr.request", audio.size, backend=self.asr.name):
+            transcript = transcribe(audio, self.LANGUAGE)
+        print(f"Whisper transcription completed: {transcript[:100]}...")
+        return transcript
+
+    def _transcribe_chunked(self, audio: EncodedAudio) -> str:
+        """Split a long recording at pauses and transcribe the chunks concurrently.
+
+        Each chunk is cached on its own, so retrying after one chunk failed
+        only repeats the chunks that are missing.
+        """
+        samples, rate, channels = decode_audio(audio)
+        if channels != 1:
+            return self._run_asr(audio)
+        chunks = split_at_silence(
+            samples, rate,
+            target_seconds=self.chunk_seconds, max_seconds=self.chunk_seconds * 1.5
+        )
+        if len(chunks) == 1:
+            return self._run_asr(audio)
+
+        # Local Whisper decodes again, so only compress chunks that are uploaded
+        encoder = WavEncoder() if self.asr.name == "local" else get_encoder_for(audio)
+        stem = audio.filename.rsplit('.', 1)[0]
+
+        def transcribe_chunk(chunk) -> str:
+            piece = encoder.encode_audio(
+                samples[chunk.start:chunk.end], rate, name=f"{stem}_{chunk.index:03d}"
+            )
+            return self._transcribe_cached(piece, partial(self._run_asr, chunk=True))
+
+        print(f"Transcribing {len(chunks)} chunks on {self.parallel_workers} workers...")
+        with ThreadPoolExecutor(self.parallel_workers, thread_name_prefix="chunk") as pool:
+            texts = list(pool.map(transcribe_chunk, chunks))
+        return stitch_transcripts(texts, [chunk.overlaps_previous for chunk in chunks])
+
+    def transcribe_audio(self, audio: Union[Path, EncodedAudio]) -> str:
         """Transcribe audio and post-process the result."""
         try:
-            if not self._ensure_client():
-                print("Error: OpenAI client initialization failed")
-                return "Error: OpenAI API key not found. Please set it in the settings."
-
-            if not audio_path.exists():
-                print(f"Error: Audio file not found at {audio_path}")
-                return "Error: Audio file not found"
-
-            print(f"Attempting to transcribe audio file: {audio_path}")
-            print(f"File size: {audio_path.stat().st_size} bytes")
-
-            with open(audio_path, "rb") as audio_file:
-                print("Starting transcription with Whisper...")
-                transcript = self.client.audio.transcriptions.create(
-                    model="whisper-1",
-                    file=audio_file,
-                    response_format="text",
-                    language="en"
-                )
-                print(f"Whisper transcription completed: {transcript[:100]}...")
-                
+            if isinstance(audio, Path):
+                audio = EncodedAudio.from_path(audio)
+            with get_metrics().span("transcribe"):
+                transcript = self.whisper_transcribe(audio)
+
                 # Post-process the transcript
                 if transcript:
                     print("Starting GPT-4 post-processing...")
-                    return self.post_process_transcript(transcript)
+                    return self.post_process_transcript(transcript, audio_key=self.audio_key(audio))
                 return transcript
 
         except Exception as e:
@@ -0,0 +1,159 @@
+import numpy as np
+from dataclasses import dataclass
+
+
+@dataclass
+class VADResult:
+    """Outcome of trimming silence from a recording."""
+    samples: np.ndarray
+    rate: int
+    original_seconds: float
+
+    @property
+    def kept_seconds(self) -> float:
+        return self.samples.size / self.rate
+
+    @property
+    def removed_seconds(self) -> float:
+        return self.original_seconds - self.kept_seconds
+
+    @property
+    def has_speech(self) -> bool:
+        return self.samples.size > 0
+
+
+class VoiceActivityDetector:
+    """Energy and zero-crossing voice activity detection for int16 mono audio.
+
+    All per-frame statistics are computed with whole-array NumPy operations,
+    so trimming a minute of audio costs a handful of vector passes rather
+    than a Python loop over frames.
+    """
+
+    FRAME_MS = 30
+    ENERGY_THRESHOLD_DB = -45.0  # Frames louder than this (dBFS) are speech
+    ZCR_THRESHOLD = 0.15  # Quieter frames with this many sign changes are fricatives
+    ZCR_ENERGY_MARGIN_DB = 10.0  # How far below the energy threshold ZCR may rescue a frame
+    HANGOVER_MS = 150  # Speech padding kept around every detected speech frame
+    MAX_PAUSE_MS = 400  # Longer pauses between speech are shortened to this
+    CHUNK_FRAMES = 1000  # Frames per pass in keep_frames, 30 s at the default frame size
+
+    def __init__(
+        self,
+        rate: int,
+        frame_ms: int = FRAME_MS,
+        energy_threshold_db: float = ENERGY_THRESHOLD_DB,
+        zcr_threshold: float = ZCR_THRESHOLD,
+        hangover_ms: int = HANGOVER_MS,
+        max_pause_ms: int = MAX_PAUSE_MS,
+    ):
+        self.rate = rate
+        self.frame_length = max(1, int(rate * frame_ms / 1000))
+        self.energy_threshold_db = energy_threshold_db
+        self.zcr_threshold = zcr_threshold
+        self.hangover_frames = int(round(hangover_ms / frame_ms))
+        self.max_pause_frames = max(1, int(round(max_pause_ms / frame_ms)))
+
+    def _frames(self, samples: np.ndarray) -> np.ndarray:
+        """View the samples as (n_frames, frame_length), zero-padding the tail."""
+        n_frames = -(-samples.size // self.frame_length)
+        padded_size = n_frames * self.frame_length
+        if padded_size != samples.size:
+            padded = np.zeros(padded_size, dtype=samples.dtype)
+            padded[:samples.size] = samples
+            samples = padded
+        return samples.reshape(n_frames, self.frame_length)
+
+    def frame_energy_db(self, frames: np.ndarray) -> np.ndarray:
+        """Mean power of each frame in dBFS."""
+        scaled = frames.astype(np.float32) / 32768.0
+        power = np.einsum('ij,ij->i', scaled, scaled) / frames.shape[1]
+        return 10.0 * np.log10(power + 1e-12)
+
+    def frame_zcr(self, frames: np.ndarray) -> np.ndarray:
+        """Fraction of adjacent samples in each frame that change sign."""
+        crossings = np.count_nonzero(np.diff(np.signbit(frames), axis=1), axis=1)
+        return crossings / frames.shape[1]
+
+    def _frame_speech(self, samples: np.ndarray) -> np.ndarray:
+        """Per-frame speech decision, before hangover; each frame is judged on its own."""
+        if samples.size == 0:
+            return np.zeros(0, dtype=bool)
+        frames = self._frames(samples)
+        energy = self.frame_energy_db(frames)
+        zcr = self.frame_zcr(frames)
+        return (energy > self.energy_threshold_db) | (
+            (energy > self.energy_threshold_db - self.ZCR_ENERGY_MARGIN_DB)
+            & (zcr > self.zcr_threshold)
+        )
+
+    def speech_mask(self, samples: np.ndarray) -> np.ndarray:
+        """Return a per-frame boolean mask of speech, including hangover."""
+        return self._dilate(self._frame_speech(samples))
+
+    def _dilate(self, speech: np.ndarray) -> np.ndarray:
+        if self.hangover_frames and speech.any():
+            # Dilate the mask: a frame is kept if any speech frame lies within
+            # the hangover window, using a prefix sum instead of a loop
+            width = self.hangover_frames
+            counts = np.concatenate(([0], np.cumsum(speech)))
+            idx = np.arange(speech.size)
+            lo = np.clip(idx - width, 0, speech.size)
+            hi = np.clip(idx + width + 1, 0, speech.size)
+            speech = counts[hi] - counts[lo] > 0
+        return speech
+
+    def _keep_mask(self, speech: np.ndarray) -> np.ndarray:
+        """Frames to keep: speech, plus at most max_pause_frames of each inner pause."""
+        if not speech.any():
+            return np.zeros_like(speech)
+
+        speech_idx = np.flatnonzero(speech)
+        first, last = speech_idx[0], speech_idx[-1]
+        keep = np.zeros_like(speech)
+        inner = speech[first:last + 1]
+
+        # Label each silent run inside the speech span, then keep the frames
+        # near either end of the run
+        silent = ~inner
+        run_start = silent & np.concatenate(([True], inner[:-1]))
+        run_end = silent & np.concatenate((inner[1:], [True]))
+        starts = np.flatnonzero(run_start)
+        ends = np.flatnonzero(run_end)
+
+        inner_keep = inner.copy()
+        if starts.size:
+            run_id = (np.cumsum(run_start) - 1).clip(0)
+            positions = np.arange(inner.size)
+            head = self.max_pause_frames // 2
+            tail = self.max_pause_frames - head
+            inner_keep |= silent & (
+                (positions - starts[run_id] < head) | (ends[run_id] - positions < tail)
+            )
+
+        keep[first:last + 1] = inner_keep
+        return keep
+
+    def keep_frames(self, samples: np.ndarray, chunk_frames: int = CHUNK_FRAMES) -> np.ndarray:
+        """The per-frame mask ``trim`` keeps, reading ``chunk_frames`` frames at a time.
+
+        Only the mask, one bool per frame, spans the whole recording, so a
+        memory-mapped recording is never loaded at once.
+        """
+        step = chunk_frames * self.frame_length
+        speech = [
+            self._frame_speech(samples[start:start + step])
+            for start in range(0, samples.size, step)
+        ]
+        speech = np.concatenate(speech) if speech else np.zeros(0, dtype=bool)
+        return self._keep_mask(self._dilate(speech))
+
+    def trim(self, samples: np.ndarray) -> VADResult:
+        """Drop leading/trailing silence and shorten long pauses."""
+        original_seconds = samples.size / self.rate
+        speech = self.speech_mask(samples)
+        keep = self._keep_mask(speech)
+        if keep.all():
+            return VADResult(samples, self.rate, original_seconds)
+        sample_mask = np.repeat(keep, self.frame_length)[:samples.size]
+        return VADResult(samples[sample_mask], self.rate, original_seconds)
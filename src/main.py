@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 import sys
 import os
+import multiprocessing
 
 # Add the project root directory to the Python path
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -10,6 +11,8 @@ from PyQt6.QtWidgets import QApplication
 from src.ui.main_window import MainWindow
 
 def main():
+    # The app bundle re-runs this script in local Whisper's pool processes
+    multiprocessing.freeze_support()
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
@@ -68,6 +68,8 @@ class CircleButton(QPushButton):
             "ready": "Ready",
             "recording": "Recording...",
             "processing": "Processing...",
+            "transcribing": "Transcribing...",
+            "post_processing": "Refining...",
             "api_missing": "Set API key"
         }
         self.state_text.setText(state_text_map.get(state, state))
@@ -0,0 +1,134 @@
+import threading
+from datetime import datetime
+
+from PyQt6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit,
+    QListWidget, QListWidgetItem, QPlainTextEdit, QPushButton
+)
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal
+import pyperclip
+
+from ...core.history import History, HistoryEntry
+
+class HistoryDialog(QDialog):
+    """Search past transcripts and copy one back to the clipboard."""
+
+    # Emitted from a helper thread once entries queued before opening are written
+    history_flushed = pyqtSignal()
+
+    RESULT_LIMIT = 200
+    SEARCH_DELAY_MS = 150  # Wait for a pause in typing before querying
+
+    def __init__(self, history: History, parent=None):
+        super().__init__(parent)
+        self.history = history
+        self.setWindowTitle("History")
+        self.setMinimumSize(600, 500)
+
+        layout = QVBoxLayout()
+
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Search transcripts...")
+        self.search_input.setClearButtonEnabled(True)
+        self.search_input.textChanged.connect(self.schedule_search)
+        layout.addWidget(self.search_input)
+
+        self.results = QListWidget()
+        self.results.setUniformItemSizes(True)
+        self.results.currentItemChanged.connect(self.show_entry)
+        self.results.itemDoubleClicked.connect(self.copy_selected)
+        layout.addWidget(self.results, 2)
+
+        self.details_label = QLabel()
+        self.details_label.setStyleSheet("color: gray;")
+        layout.addWidget(self.details_label)
+
+        self.text_view = QPlainTextEdit()
+        self.text_view.setReadOnly(True)
+        layout.addWidget(self.text_view, 1)
+
+        button_layout = QHBoxLayout()
+        self.status_label = QLabel()
+        button_layout.addWidget(self.status_label)
+        button_layout.addStretch()
+
+        copy_button = QPushButton("Copy")
+        copy_button.clicked.connect(self.copy_selected)
+        button_layout.addWidget(copy_button)
+
+        close_button = QPushButton("Close")
+        close_button.clicked.connect(self.close)
+        button_layout.addWidget(close_button)
+
+        layout.addLayout(button_layout)
+        self.setLayout(layout)
+
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(self.SEARCH_DELAY_MS)
+        self.search_timer.timeout.connect(self.search)
+
+        self.search()
+        # Entries still queued for the writer thread show up once written;
+        # waiting for them here would freeze the dialog as it opens
+        if self.history.has_pending():
+            self.history_flushed.connect(self.search)
+            threading.Thread(target=self._wait_for_history, name="history-flush", daemon=True).start()
+
+    def _wait_for_history(self):
+        self.history.flush()
+        try:
+            self.history_flushed.emit()
+        except RuntimeError:
+            pass  # The dialog was closed and deleted meanwhile
+
+    def schedule_search(self):
+        self.search_timer.start()
+
+    def search(self):
+        query = self.search_input.text()
+        try:
+            entries = self.history.search(query, limit=self.RESULT_LIMIT)
+        except Exception as e:
+            self.status_label.setText(f"Search failed: {e}")
+            return
+        self.results.clear()
+        for entry in entries:
+            item = QListWidgetItem(self._summary(entry))
+            item.setData(Qt.ItemDataRole.UserRole, entry)
+            self.results.addItem(item)
+        if entries:
+            self.results.setCurrentRow(0)
+        else:
+            self.text_view.clear()
+            self.details_label.clear()
+        more = "+" if len(entries) == self.RESULT_LIMIT else ""
+        self.status_label.setText(f"{len(entries)}{more} matches" if query.strip() else f"{len(entries)}{more} recent")
+
+    def show_entry(self, item: QListWidgetItem, previous=None):
+        if item is None:
+            return
+        entry: HistoryEntry = item.data(Qt.ItemDataRole.UserRole)
+        details = [datetime.fromtimestamp(entry.created).strftime("%Y-%m-%d %H:%M:%S")]
+        if entry.audio_seconds:
+            details.append(f"{entry.audio_seconds:.1f}s of audio")
+        details += [f"{stage.removesuffix('_ms')} {ms:.0f} ms" for stage, ms in entry.latencies.items()]
+        self.details_label.setText(" · ".join(details))
+        text = entry.text
+        if entry.transcript and entry.transcript != entry.text:
+            text += f"\n\nRaw transcript:\n{entry.transcript}"
+        self.text_view.setPlainText(text)
+
+    def copy_selected(self):
+        item = self.results.currentItem()
+        if item is None:
+            return
+        try:
+            pyperclip.copy(item.data(Qt.ItemDataRole.UserRole).text)
+            self.status_label.setText("Copied to clipboard")
+        except Exception as e:
+            self.status_label.setText(f"Error: {e}")
+
+    def _summary(self, entry: HistoryEntry) -> str:
+        when = datetime.fromtimestamp(entry.created).strftime("%b %d %H:%M")
+        return f"{when}  {' '.join(entry.text.split())[:120]}"
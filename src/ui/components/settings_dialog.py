@@ -1,5 +1,3 @@
-import os
-from pathlib import Path
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QLabel, QLineEdit, QPushButton,
     QHBoxLayout, QMessageBox, QTabWidget, QWidget,
@@ -7,37 +5,23 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import Qt
 
+from ...core.config import DEFAULT_SYSTEM_PROMPT, get_store
+
 class SettingsDialog(QDialog):
     @classmethod
     def get_config_dir(cls):
-        home = str(Path.home())
-        config_dir = os.path.join(home, '.voice-prompt')
-        if not os.path.exists(config_dir):
-            os.makedirs(config_dir)
-        return config_dir
+        config_dir = get_store().directory
+        config_dir.mkdir(parents=True, exist_ok=True)
+        return str(config_dir)
 
     @classmethod
     def get_api_key(cls):
-        try:
-            config_file = os.path.join(cls.get_config_dir(), 'config')
-            if os.path.exists(config_file):
-                with open(config_file, 'r') as f:
-                    return f.read().strip()
-        except Exception:
-            return None
-        return None
+        return get_store().api_key()
 
     @classmethod
     def get_system_prompt(cls):
-        """Load the system prompt from config file."""
-        try:
-            prompt_file = os.path.join(cls.get_config_dir(), 'system_prompt')
-            if os.path.exists(prompt_file):
-                with open(prompt_file, 'r') as f:
-                    return f.read().strip()
-        except Exception:
-            return None
-        return None
+        """Load the system prompt from the config store."""
+        return get_store().system_prompt()
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -111,15 +95,7 @@ in the transcribed text. Add necessary punctuation such as periods, commas,
 and capitalization. Make the text more readable while preserving its original meaning.""")
         
         current_prompt = self.get_system_prompt()
-        if current_prompt:
-            self.prompt_input.setPlainText(current_prompt)
-        else:
-            # Set default prompt
-            default_prompt = """You are a helpful assistant. Your task is to correct any spelling discrepancies 
-in the transcribed text. Add necessary punctuation such as periods, commas, 
-and capitalization. Make the text more readable while preserving its original meaning. 
-Use only the context provided."""
-            self.prompt_input.setPlainText(default_prompt)
+        self.prompt_input.setPlainText(current_prompt or DEFAULT_SYSTEM_PROMPT)
         
         prompt_layout.addWidget(self.prompt_input)
         
@@ -150,9 +126,7 @@ Use only the context provided."""
         """Save the API key to config file."""
         api_key = self.api_key_input.text().strip()
         try:
-            config_file = os.path.join(self.get_config_dir(), 'config')
-            with open(config_file, 'w') as f:
-                f.write(api_key)
+            get_store().set_api_key(api_key)
             self.accept()
         except Exception as e:
             print(f"Error saving API key: {e}")
@@ -162,9 +136,7 @@ Use only the context provided."""
         """Save the system prompt to config file."""
         prompt = self.prompt_input.toPlainText().strip()
         try:
-            prompt_file = os.path.join(self.get_config_dir(), 'system_prompt')
-            with open(prompt_file, 'w') as f:
-                f.write(prompt)
+            get_store().set_system_prompt(prompt)
             
             # Show success message
             msg = QMessageBox(self)
@@ -203,11 +175,7 @@ Use only the context provided."""
 
     def reset_prompt(self):
         """Reset the system prompt to default."""
-        default_prompt = """You are a helpful assistant. Your task is to correct any spelling discrepancies 
-in the transcribed text. Add necessary punctuation such as periods, commas, 
-and capitalization. Make the text more readable while preserving its original meaning. 
-Use only the context provided."""
-        self.prompt_input.setPlainText(default_prompt)
+        self.prompt_input.setPlainText(DEFAULT_SYSTEM_PROMPT)
             
     def clear_api_key(self):
         """Clear the API key from local storage."""
@@ -241,9 +209,7 @@ Use only the context provided."""
         
         if msg.exec() == QMessageBox.StandardButton.Yes:
             try:
-                config_file = os.path.join(self.get_config_dir(), 'config')
-                if os.path.exists(config_file):
-                    os.remove(config_file)
+                if get_store().clear_api_key():
                     self.api_key_input.clear()
                     QMessageBox.information(self, "Success", "API key cleared successfully")
                     if self.parent():
@@ -6,6 +6,7 @@ import sys
 import subprocess
 from .settings_dialog import SettingsDialog
 from .about_dialog import AboutDialog
+from .history_dialog import HistoryDialog
 
 class SystemTray(QSystemTrayIcon):
     def __init__(self, parent=None):
@@ -73,14 +74,35 @@ class SystemTray(QSystemTrayIcon):
         self.always_on_top_action.setChecked(True)  # Default to on
         self.always_on_top_action.triggered.connect(self.toggle_always_on_top)
         
+        # Live transcription action
+        self.live_transcription_action = self.menu.addAction("Live Transcription")
+        self.live_transcription_action.setCheckable(True)
+        self.live_transcription_action.setChecked(self.parent().live_transcription)
+        self.live_transcription_action.triggered.connect(self.toggle_live_transcription)
+        
+        # Auto-stop action
+        self.auto_stop_action = self.menu.addAction("Auto-Stop on Silence")
+        self.auto_stop_action.setCheckable(True)
+        self.auto_stop_action.setChecked(self.parent().auto_stop)
+        self.auto_stop_action.triggered.connect(self.toggle_auto_stop)
+        
         self.menu.addSeparator()
         
         # Record action
         record_action = self.menu.addAction("Record")
         record_action.triggered.connect(lambda: self.parent().toggle_recording())
         
+        # Cancel action
+        cancel_action = self.menu.addAction("Cancel Processing")
+        cancel_action.triggered.connect(lambda: self.parent().cancel_processing())
+        
         self.menu.addSeparator()
         
+        # History action
+        history_action = self.menu.addAction("History")
+        history_action.setEnabled(self.parent().history is not None)
+        history_action.triggered.connect(self.show_history)
+        
         # Settings action
         settings_action = self.menu.addAction("Settings")
         settings_action.triggered.connect(self.show_settings)
@@ -146,6 +168,22 @@ class SystemTray(QSystemTrayIcon):
             if not was_visible and not self.window_visible:
                 self.parent().hide()
 
+    def show_history(self):
+        """Show the transcript history search."""
+        # Store current visibility state
+        was_visible = self.parent().isVisible()
+        
+        # Ensure window is visible while history dialog is open
+        self.parent().show()
+        self.parent().activateWindow()
+        
+        dialog = HistoryDialog(self.parent().history, self.parent())
+        dialog.exec()
+        
+        # Restore window visibility state
+        if not was_visible and not self.window_visible:
+            self.parent().hide()
+
     def show_about(self):
         """Show the about dialog."""
         # Store current visibility state
@@ -201,6 +239,14 @@ class SystemTray(QSystemTrayIcon):
             menu_pos.setY(menu_pos.y() - self.menu.sizeHint().height())
             self.menu.popup(menu_pos)
 
+    def toggle_live_transcription(self, checked: bool):
+        """Toggle transcribing segments while the user is still speaking."""
+        self.parent().live_transcription = checked
+
+    def toggle_auto_stop(self, checked: bool):
+        """Toggle stopping the recording automatically after a pause."""
+        self.parent().auto_stop = checked
+
     def toggle_always_on_top(self, checked: bool):
         """Toggle the always-on-top state of the main window."""
         window = self.parent()
@@ -0,0 +1,79 @@
+from pathlib import Path
+
+from PyQt6.QtCore import QFileSystemWatcher, QObject, pyqtSignal
+
+from ..core.config import API_KEY_FILE, SETTINGS_FILE, SYSTEM_PROMPT_FILE, ConfigStore
+
+
+class ConfigWatcher(QObject):
+    """Invalidates a ConfigStore when the API key, system prompt or settings change.
+
+    While the watcher runs the store trusts its cache instead of checking
+    mtimes, so reads from the GUI state machine never touch the disk. The
+    directory is watched only to see those files appear; it also holds the
+    caches, job store, history and metrics, whose writes are ignored.
+    """
+    changed = pyqtSignal()
+
+    FILES = (API_KEY_FILE.name, SYSTEM_PROMPT_FILE.name, SETTINGS_FILE.name)
+
+    def __init__(self, store: ConfigStore, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self.on_directory_changed)
+        self.watcher.fileChanged.connect(self.on_file_changed)
+        try:
+            store.directory.mkdir(parents=True, exist_ok=True)
+        except Exception as e:
+            print(f"Error creating config directory: {e}")
+        self._watch_files()
+        # (mtime_ns, size) of each file, to tell its changes from other writes
+        self._signatures = self._read_signatures()
+        self.store.watched = bool(self.watcher.directories())
+
+    def _watch_files(self) -> None:
+        # Atomic replaces drop the old file from the watch list, so re-add
+        # whatever exists after every change
+        directory = str(self.store.directory)
+        if directory not in self.watcher.directories() and self.store.directory.exists():
+            self.watcher.addPath(directory)
+        watched = self.watcher.files()
+        for name in self.FILES:
+            path = self.store.path(name)
+            if str(path) not in watched and path.exists():
+                self.watcher.addPath(str(path))
+
+    def _read_signatures(self) -> dict:
+        signatures = {}
+        for name in self.FILES:
+            try:
+                stat = self.store.path(name).stat()
+                signatures[name] = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                signatures[name] = None
+        return signatures
+
+    def on_file_changed(self, path: str) -> None:
+        self._watch_files()
+        self._signatures = self._read_signatures()
+        self.store.invalidate(Path(path).name)
+        self.changed.emit()
+
+    def on_directory_changed(self, path: str) -> None:
+        signatures = self._read_signatures()
+        names = [name for name in self.FILES if signatures[name] != self._signatures[name]]
+        if not names:
+            return
+        self._watch_files()
+        self._signatures = signatures
+        for name in names:
+            self.store.invalidate(name)
+        self.changed.emit()
+
+    def stop(self) -> None:
+        """Stop watching; the store goes back to checking mtimes."""
+        self.store.watched = False
+        paths = self.watcher.files() + self.watcher.directories()
+        if paths:
+            self.watcher.removePaths(paths)
@@ -5,19 +5,30 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import (
     Qt, QPropertyAnimation, QEasingCurve, 
-    pyqtSlot, QTimer, QSize, QPoint, QObject, pyqtProperty
+    pyqtSlot, pyqtSignal, QTimer, QSize, QPoint, QObject, pyqtProperty, QThreadPool
 )
 from PyQt6.QtGui import QPalette, QColor, QIcon, QPainter, QPainterPath, QFont, QKeySequence, QShortcut
 import sys
 import os
+import numpy as np
 import pyperclip
 from pathlib import Path
 import threading
+import time
+from typing import Optional
 
 from .components.circle_button import CircleButton
 from .components.system_tray import SystemTray
 from .components.settings_dialog import SettingsDialog
+from .config_watcher import ConfigWatcher
+from .workers import TranscriptionJob, SegmentJob, PostProcessJob
 from ..core.audio_recorder import AudioRecorder
+from ..core.config import get_store, load_settings
+from ..core.encoders import EncodedAudio, get_encoder, read_duration
+from ..core.history import History, HistoryEntry
+from ..core.job_store import JobStore
+from ..core.metrics import get_metrics
+from ..core.streaming import TranscriptAssembler, Utterance, UtteranceQueue
 from ..core.transcription import TranscriptionService
 
 class PulseEffect(QObject):
@@ -105,6 +116,11 @@ class FloatingText(QFrame):
         shadow.setOffset(0, 2)
         self.setGraphicsEffect(shadow)
         
+        # One timer, so an earlier message can't hide text that is still streaming
+        self.hide_timer = QTimer(self)
+        self.hide_timer.setSingleShot(True)
+        self.hide_timer.timeout.connect(self.hide)
+        
         self.hide()
         
     def showText(self, text: str):
@@ -112,7 +128,12 @@ class FloatingText(QFrame):
         self.confirmation.setText("✓ Copied to clipboard")
         self.confirmation.show()
         self.adjustSize()
-        
+        self._place()
+        self.show()
+        # Hide after 10 seconds
+        self.hide_timer.start(10000)
+    
+    def _place(self):
         # Position above the button
         parent_rect = self.parent().rect()
         button_pos = self.parent().record_button.pos()
@@ -122,21 +143,82 @@ class FloatingText(QFrame):
         y_pos = max(20, button_pos.y() - self.height() - 20)
         
         self.move(x_pos, y_pos)
+    
+    def showPartial(self, text: str):
+        """Show text that is still arriving; stays up until showText or hide."""
+        self.hide_timer.stop()
+        self.text_edit.setText(text)
+        self.confirmation.hide()
+        self.adjustSize()
+        self._place()
         self.show()
-        # Hide after 10 seconds
-        QTimer.singleShot(10000, self.hide)
 
 class MainWindow(QMainWindow):
     STATE_IDLE = "idle"
     STATE_RECORDING = "recording"
     STATE_PROCESSING = "processing"
     
+    # Emitted from the capture worker thread with each live AudioSegment and its Utterance
+    segment_ready = pyqtSignal(object, object)
+    # Emitted from the capture worker thread after sustained silence
+    auto_stop_requested = pyqtSignal()
+    
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Voice Prompt")
-        self.audio_recorder = AudioRecorder()
-        self.transcription_service = TranscriptionService()
+        self.settings = load_settings()
+        self.metrics = get_metrics()
+        self.metrics.configure(self.settings)
+        # API key and prompt are cached; the watcher invalidates them on edits
+        self.config_watcher = ConfigWatcher(get_store(), self)
+        self.config_watcher.changed.connect(self.on_config_changed)
+        self.audio_recorder = AudioRecorder(
+            encoder=get_encoder(self._upload_format()),
+            spill_to_disk=self.settings["spill_to_disk"],
+            warm=self.settings["warm_stream"],
+            preroll_ms=self.settings["preroll_ms"],
+            record_to_disk=self.settings["record_to_disk"],
+            native_rate=self.settings["capture_native_rate"]
+        )
+        if self.audio_recorder.warm:
+            try:
+                self.audio_recorder.open_warm_stream()
+            except Exception as e:
+                print(f"Error opening warm input stream: {e}")
+        self.transcription_service = TranscriptionService(self.settings)
+        # Connect to the API now so the first transcription skips TLS setup
+        self.transcription_service.warm_up()
+        # Load a local Whisper model in the background, if one is configured
+        self.transcription_service.asr.preload()
         self.current_state = self.STATE_IDLE
+        self.thread_pool = QThreadPool(self)
+        self.active_jobs = []
+        # Finished recordings, processed pipeline_jobs at a time and
+        # delivered to the clipboard in recording order
+        self.utterances = UtteranceQueue(self._start_job, self.settings["pipeline_jobs"])
+        # The utterance being recorded, if any
+        self.recording: Optional[Utterance] = None
+        # Recordings are kept on disk until delivered, so a crash loses nothing
+        self.job_store: Optional[JobStore] = None
+        if self.settings["durable_jobs"]:
+            try:
+                self.job_store = JobStore()
+            except Exception as e:
+                print(f"Error opening job store: {e}")
+            else:
+                self._store_recovered()
+        self.jobs_resumed = False
+        # Every delivered transcript, searchable from the tray
+        self.history: Optional[History] = None
+        if self.settings["history_enabled"]:
+            try:
+                self.history = History()
+            except Exception as e:
+                print(f"Error opening history: {e}")
+        self.live_transcription = True
+        self.segment_ready.connect(self.on_segment_ready)
+        self.auto_stop = False
+        self.auto_stop_requested.connect(self.on_auto_stop)
         self.last_click_pos = None
         self.is_dragging = False
         
@@ -145,8 +227,10 @@ class MainWindow(QMainWindow):
         self.setup_system_tray()
         
         # Check for API key on startup
-        if not self.transcription_service.api_key:
+        if not self.transcription_service.is_ready():
             QTimer.singleShot(500, self.show_api_key_warning)
+        else:
+            self.resume_jobs()
         
         self.setMinimumSize(300, 500)
         self.resize(300, 500)
@@ -186,6 +270,10 @@ class MainWindow(QMainWindow):
         hide_shortcut = QShortcut(QKeySequence('Alt+H'), self)
         hide_shortcut.activated.connect(self.toggle_visibility)
         
+        # Clicking while processing starts the next recording, so cancel has its own key
+        cancel_shortcut = QShortcut(QKeySequence('Ctrl+.'), self)
+        cancel_shortcut.activated.connect(self.cancel_processing)
+        
     def setup_system_tray(self):
         self.system_tray = SystemTray(self)
         
@@ -226,17 +314,20 @@ class MainWindow(QMainWindow):
             if result == QDialog.DialogCode.Accepted:
                 # Reload API key and system prompt
                 self.transcription_service._load_api_key()
+                self.transcription_service.warm_up()
                 self.set_state(self.STATE_IDLE)
+                self.resume_jobs()
             
     def set_state(self, state: str, message: str = ""):
         self.current_state = state
-        self.record_button.setEnabled(state != self.STATE_PROCESSING)
+        # Recording can start again while earlier utterances are processed
+        self.record_button.setEnabled(True)
         self.update_glow(state)
         
         # Update button state text
         if state == self.STATE_IDLE:
-            api_key = self.transcription_service.load_api_key()
-            if not api_key:
+            self.transcription_service.load_api_key()
+            if not self.transcription_service.is_ready():
                 self.record_button.update_state("api_missing")
                 self.record_button.setEnabled(False)
             else:
@@ -245,45 +336,366 @@ class MainWindow(QMainWindow):
             self.record_button.update_state("recording")
         elif state == self.STATE_PROCESSING:
             self.record_button.update_state("processing")
+    
+    def _update_state(self):
+        """Show recording, processing or idle from the recorder and the utterance queue."""
+        if self.recording is not None:
+            self.set_state(self.STATE_RECORDING)
+        elif self.utterances.pending:
+            self.set_state(self.STATE_PROCESSING)
+        else:
+            self.set_state(self.STATE_IDLE)
             
     def toggle_recording(self):
-        if not self.transcription_service.api_key:
+        if not self.transcription_service.is_ready():
             dialog = SettingsDialog(self)
             dialog.exec()
             self.set_state(self.STATE_IDLE)
+            self.resume_jobs()
             return
             
-        if self.current_state == self.STATE_IDLE:
-            self.start_recording()
-        elif self.current_state == self.STATE_RECORDING:
+        if self.current_state == self.STATE_RECORDING:
             self.stop_recording()
+        else:
+            self.start_recording()
     
     def start_recording(self):
+        utterance = Utterance()
+        if self.live_transcription:
+            # Segments are transcribed while the user keeps talking
+            utterance.assembler = TranscriptAssembler()
+            self.audio_recorder.segment_callback = (
+                lambda segment: self.segment_ready.emit(segment, utterance)
+            )
+        else:
+            self.audio_recorder.segment_callback = None
+        self.audio_recorder.auto_stop_callback = (
+            self.auto_stop_requested.emit if self.auto_stop else None
+        )
         self.audio_recorder.start_recording()
+        self.recording = utterance
+        # Reconnect while the user talks if the pooled connections went stale
+        self.transcription_service.warm_up(only_if_idle=True)
         self.set_state(self.STATE_RECORDING)
         
     def stop_recording(self):
-        self.set_state(self.STATE_PROCESSING)
-        audio_path = self.audio_recorder.stop_recording()
+        utterance = self.recording
+        self.recording = None
+        # Results are delivered in this order, however long each one takes
+        utterance.slot = self.utterances.reserve()
+        # Times the utterance from here until its text is on the clipboard
+        utterance.trace = self.metrics.start_trace()
+        utterance.stopped = time.perf_counter()
+        self._update_state()
+        
+        if utterance.assembler is not None:
+            total = self.audio_recorder.stop_segmented_recording()
+            if total == 0:
+                self._finish_utterance(utterance)
+                return
+            utterance.assembler.set_total(total)
+            # Kept until delivered, so a crash or failed segment loses nothing
+            self._save_live_job(utterance)
+            self._maybe_finish_segments(utterance)
+            return
         
-        if audio_path:
-            QTimer.singleShot(100, lambda: self.process_recording(audio_path))
+        with self.metrics.tracing(utterance.trace):
+            audio = self.audio_recorder.stop_recording()
+        
+        if audio:
+            self._save_job(utterance, audio)
+            self.process_recording(audio, utterance)
+        else:
+            self._finish_utterance(utterance)
     
-    def process_recording(self, audio_path: Path):
+    @pyqtSlot()
+    def on_config_changed(self):
+        self._apply_warm_stream()
+        # Pick up an API key added or removed outside the settings dialog
+        if self.current_state == self.STATE_IDLE:
+            self.set_state(self.STATE_IDLE)
+        self.resume_jobs()
+    
+    def _apply_warm_stream(self):
+        """Open or release the microphone when warm_stream is edited in settings.json."""
+        warm = bool(load_settings()["warm_stream"])
+        if warm == self.audio_recorder.warm:
+            return
+        self.settings["warm_stream"] = warm
         try:
-            transcript = self.transcription_service.transcribe_audio(audio_path)
-            
-            if transcript:
-                self.floating_text.showText(transcript)
-                pyperclip.copy(transcript)
-            
-            audio_path.unlink()
-            
+            self.audio_recorder.set_warm(warm)
+        except Exception as e:
+            print(f"Error opening warm input stream: {e}")
+    
+    @pyqtSlot()
+    def on_auto_stop(self):
+        if self.current_state == self.STATE_RECORDING:
+            print("Silence detected, stopping recording")
+            self.stop_recording()
+    
+    def process_recording(self, audio: EncodedAudio, utterance: Utterance):
+        """Queue a background job for the recording so the GUI stays responsive."""
+        utterance.audio_seconds = audio.duration
+        job = TranscriptionJob(
+            self.transcription_service, audio,
+            stream=self.settings["stream_post_processing"], trace=utterance.trace
+        )
+        self._submit(utterance, job)
+    
+    def _save_job(self, utterance: Utterance, audio: Optional[EncodedAudio]):
+        """Queue the recording to be saved in the job store; written off the GUI thread."""
+        if self.job_store is not None and audio:
+            utterance.job_id = self.job_store.add_recording(audio)
+    
+    def _save_live_job(self, utterance: Utterance):
+        """Queue the whole live recording for the job store, which encodes it off the GUI thread."""
+        if self.job_store is None:
+            return
+        recording = self.audio_recorder.take_recording()
+        if isinstance(recording, np.ndarray):
+            recorder = self.audio_recorder
+            utterance.job_id = self.job_store.add_samples(recording, recorder.RATE, recorder.CHANNELS)
+        else:
+            self._save_job(utterance, recording)
+    
+    def _store_recovered(self):
+        """Hand the recordings a crash left behind to the job store, which resumes them."""
+        for path in self.audio_recorder.recovered:
+            audio = EncodedAudio.from_path(path)
+            try:
+                audio.duration = read_duration(audio)
+            except Exception as e:
+                print(f"Error reading recovered recording {path.name}: {e}")
+                continue
+            self.job_store.add_recording(audio)
+    
+    def resume_jobs(self):
+        """Queue the dictations a crash or restart left unfinished, oldest first.
+        
+        Runs once, as soon as the service can transcribe; until an API key
+        is set the jobs wait in the store.
+        """
+        if self.job_store is None or self.jobs_resumed or not self.transcription_service.is_ready():
+            return
+        self.jobs_resumed = True
+        try:
+            stored_jobs = self.job_store.unfinished()
+        except Exception as e:
+            print(f"Error reading job store: {e}")
+            return
+        if not stored_jobs:
+            return
+        print(f"Resuming {len(stored_jobs)} unfinished dictation(s)")
+        stream = self.settings["stream_post_processing"]
+        for stored in stored_jobs:
+            utterance = Utterance(job_id=stored.id, resumed=True, stopped=time.perf_counter())
+            utterance.slot = self.utterances.reserve()
+            utterance.trace = self.metrics.start_trace()
+            utterance.transcript = stored.transcript or ""
+            if stored.audio is not None:
+                utterance.audio_seconds = stored.audio.duration
+            if stored.stage == JobStore.STAGE_RECORDED:
+                job = TranscriptionJob(self.transcription_service, stored.audio, stream=stream, trace=utterance.trace)
+            elif stored.transcript:
+                job = PostProcessJob(self.transcription_service, stored.transcript, stream=stream, trace=utterance.trace)
+            else:
+                # Nothing was said; there is no text to deliver
+                self._finish_utterance(utterance)
+                continue
+            self._submit(utterance, job)
+        self._update_state()
+    
+    def _submit(self, utterance: Utterance, job):
+        """Queue the job producing the utterance's final text."""
+        job.utterance = utterance
+        if utterance.job_id is not None:
+            job.persist(self.job_store, utterance.job_id)
+        job.signals.stage_changed.connect(self.on_transcription_stage)
+        job.signals.partial.connect(self.on_transcription_partial)
+        job.signals.finished.connect(self.on_transcription_finished)
+        job.signals.failed.connect(self.on_transcription_failed)
+        self.utterances.submit(utterance.slot, job)
+    
+    def _start_job(self, job):
+        job.signals.cancelled.connect(self.on_transcription_cancelled)
+        self.active_jobs.append(job)
+        self.thread_pool.start(job)
+    
+    def _sender_job(self):
+        """The job that sent the current signal, or None if it was dropped."""
+        for job in self.active_jobs:
+            if job.signals is self.sender():
+                return job
+        return None
+    
+    def _take_job(self):
+        """Forget the job that sent the current signal and return it; None if it was already dropped."""
+        job = self._sender_job()
+        if job is not None:
+            self.active_jobs.remove(job)
+        return job
+    
+    def _abort_jobs(self, keep: Optional[Utterance] = None) -> list:
+        """Cancel every job except those of the ``keep`` utterance; return the utterances dropped."""
+        dropped = [utterance for utterance, _, _ in self.utterances.held]
+        for job in self.active_jobs:
+            if job.utterance is not keep:
+                job.cancel()
+                dropped.append(job.utterance)
+        self.active_jobs = [job for job in self.active_jobs if job.utterance is keep]
+        for job in self.utterances.cancel():
+            job.cancel()
+            dropped.append(job.utterance)
+        return dropped
+    
+    def cancel_processing(self):
+        """Cancel the utterances being transcribed; a recording in progress carries on."""
+        for utterance in self._abort_jobs(keep=self.recording):
+            if utterance.job_id is not None:
+                self.job_store.discard(utterance.job_id)
+                utterance.job_id = None
+        self.floating_text.hide()
+        self._update_state()
+    
+    @pyqtSlot(object, object)
+    def on_segment_ready(self, segment, utterance: Utterance):
+        if utterance.failed:
+            return
+        print(f"Live segment {segment.index}: {segment.duration:.1f}s")
+        utterance.audio_seconds += segment.duration
+        job = SegmentJob(
+            self.transcription_service, segment,
+            self.audio_recorder.vad, self.audio_recorder.encoder,
+            self.audio_recorder.spill_dir
+        )
+        job.utterance = utterance
+        job.signals.segment_finished.connect(self.on_segment_transcribed)
+        job.signals.failed.connect(self.on_transcription_failed)
+        self._start_job(job)
+    
+    @pyqtSlot(int, str)
+    def on_segment_transcribed(self, index: int, transcript: str):
+        job = self._take_job()
+        if job is None or job.utterance.failed:
+            return
+        job.utterance.assembler.add(index, transcript)
+        self._maybe_finish_segments(job.utterance)
+    
+    def _maybe_finish_segments(self, utterance: Utterance):
+        """Post-process the stitched transcript once every segment is back."""
+        if not utterance.assembler.is_complete():
+            return
+        transcript = utterance.assembler.text()
+        utterance.transcript = transcript
+        # Only the segments still running at the stop count towards the wait
+        utterance.latencies["transcribe_ms"] = (time.perf_counter() - utterance.stopped) * 1000
+        if not transcript:
+            self._finish_utterance(utterance)
+            return
+        if utterance.job_id is not None:
+            self.job_store.mark_transcribed(utterance.job_id, transcript)
+        job = PostProcessJob(
+            self.transcription_service, transcript,
+            stream=self.settings["stream_post_processing"], trace=utterance.trace
+        )
+        self._submit(utterance, job)
+    
+    @pyqtSlot(str)
+    def on_transcription_stage(self, stage: str):
+        job = self._sender_job()
+        if (job is not None and self.current_state == self.STATE_PROCESSING
+                and self.utterances.is_next(job.utterance.slot)):
+            self.record_button.update_state(stage)
+    
+    @pyqtSlot(str)
+    def on_transcription_partial(self, text: str):
+        # Shown as it streams in, for the oldest utterance only so the popup
+        # never runs ahead of the clipboard; the clipboard gets the finished text
+        job = self._sender_job()
+        if job is not None and self.utterances.is_next(job.utterance.slot):
+            self.floating_text.showPartial(text)
+    
+    @pyqtSlot(str)
+    def on_transcription_finished(self, transcript: str):
+        job = self._take_job()
+        if job is None:
+            return
+        job.utterance.latencies.update(job.timings)
+        if job.transcript:
+            job.utterance.transcript = job.transcript
+        self._finish_utterance(job.utterance, transcript)
+    
+    @pyqtSlot(str)
+    def on_transcription_failed(self, message: str):
+        job = self._take_job()
+        if job is None or job.utterance.failed:
+            return
+        utterance = job.utterance
+        utterance.failed = True
+        # One failed segment means the utterance can't be stitched back together
+        for other in [j for j in self.active_jobs if j.utterance is utterance]:
+            other.cancel()
+            self.active_jobs.remove(other)
+        if utterance is self.recording:
+            self.recording = None
+            self.audio_recorder.stop_segmented_recording()
+            utterance.slot = self.utterances.reserve()
+            # Retried from the whole recording at the next start
+            self._save_live_job(utterance)
+        self._finish_utterance(utterance, error=message)
+    
+    def _finish_utterance(self, utterance: Utterance, text: str = "", error: str = ""):
+        """Hand over the utterance's outcome and deliver whatever is now next in order."""
+        if utterance.slot is None:
+            return
+        for _, (done, text, error) in self.utterances.finish(utterance.slot, (utterance, text, error)):
+            self._deliver(done, text, error)
+        self._update_state()
+    
+    def _deliver(self, utterance: Utterance, text: str, error: str):
+        """Show the utterance's text and copy it to the clipboard."""
+        if utterance.job_id is not None:
+            self._settle_job(utterance.job_id, error)
+        try:
+            if error and utterance.resumed:
+                # Not something the user is waiting on; it is retried next start
+                print(f"Error resuming dictation: {error}")
+            elif error:
+                self.floating_text.showText(f"Error: {error}")
+            elif text:
+                self.floating_text.showText(text)
+                with self.metrics.tracing(utterance.trace), self.metrics.span("clipboard", len(text)):
+                    pyperclip.copy(text)
+                self._remember(utterance, text)
         except Exception as e:
             self.floating_text.showText(f"Error: {str(e)}")
-            
         finally:
-            self.set_state(self.STATE_IDLE)
+            if utterance.trace is not None:
+                with self.metrics.tracing(utterance.trace):
+                    self.metrics.record("pipeline", utterance.trace.elapsed, error=bool(error))
+                self.metrics.flush_later()
+    
+    def _remember(self, utterance: Utterance, text: str):
+        """Queue the delivered text for the history; written off the GUI thread."""
+        if self.history is None:
+            return
+        utterance.latencies["total_ms"] = (time.perf_counter() - utterance.stopped) * 1000
+        self.history.add(HistoryEntry(
+            text=text,
+            transcript=utterance.transcript or text,
+            audio_seconds=round(utterance.audio_seconds, 2),
+            latencies={stage: round(ms, 1) for stage, ms in utterance.latencies.items()}
+        ))
+    
+    def _settle_job(self, job_id: str, error: str):
+        if error:
+            self.job_store.fail(job_id, error)
+        else:
+            self.job_store.complete(job_id)
+    
+    @pyqtSlot()
+    def on_transcription_cancelled(self):
+        print("Transcription cancelled")
     
     def mousePressEvent(self, event):
         if event.button() == Qt.MouseButton.LeftButton:
@@ -314,9 +726,26 @@ class MainWindow(QMainWindow):
         super().changeEvent(event)
     
     def closeEvent(self, event):
+        # Unfinished jobs stay in the store and are resumed on the next start
+        self._abort_jobs()
+        self.config_watcher.stop()
+        # Release the microphone the warm stream holds
+        self.audio_recorder.close_warm_stream()
+        self.transcription_service.close()
+        if self.job_store is not None:
+            self.job_store.close()
+        if self.history is not None:
+            self.history.close()
+        self.metrics.flush(summary=True)
         self.system_tray.hide()
         event.accept()
     
+    def _upload_format(self) -> str:
+        # Local Whisper decodes the audio again, so compressing it is wasted work
+        if self.settings["asr_backend"] == "local":
+            return "wav"
+        return self.settings["upload_format"]
+    
     def center(self):
         qr = self.frameGeometry()
         cp = self.screen().availableGeometry().center()
@@ -0,0 +1,222 @@
+import threading
+import time
+import traceback
+from pathlib import Path
+from typing import Optional
+
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+
+from ..core.audio_recorder import AudioSegment
+from ..core.encoders import AudioEncoder, EncodedAudio, WavEncoder
+from ..core.job_store import JobStore
+from ..core.metrics import Trace, get_metrics
+from ..core.transcription import TranscriptionService
+from ..core.vad import VoiceActivityDetector
+
+
+class TranscriptionSignals(QObject):
+    """Signals emitted by the transcription jobs.
+
+    The signals object is created on the GUI thread, so connected slots run
+    there too and can safely touch widgets and the clipboard.
+    """
+    stage_changed = pyqtSignal(str)
+    segment_finished = pyqtSignal(int, str)
+    partial = pyqtSignal(str)
+    finished = pyqtSignal(str)
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+
+class CancelledError(Exception):
+    """Raised inside a job to stop at the next stage boundary."""
+
+
+class _Job(QRunnable):
+    """Base class for cancellable background jobs."""
+
+    STAGE_TRANSCRIBING = "transcribing"
+    STAGE_POST_PROCESSING = "post_processing"
+
+    def __init__(self, service: TranscriptionService, trace: Optional[Trace] = None):
+        super().__init__()
+        self.service = service
+        # Utterance the job's metrics spans belong to
+        self.trace = trace
+        # Set by the window to the Utterance the job works on
+        self.utterance = None
+        # Durable record of the job, if it is being persisted (see persist)
+        self.store: Optional[JobStore] = None
+        self.job_id: Optional[str] = None
+        self.signals = TranscriptionSignals()
+        # Raw transcript and stage durations in ms, read by the window once finished
+        self.transcript = ""
+        self.timings = {}
+        self._cancel_event = threading.Event()
+
+    def persist(self, store: JobStore, job_id: str) -> None:
+        """Save the job's progress in ``store`` so it can be resumed after a crash."""
+        self.store = store
+        self.job_id = job_id
+
+    def _wait_for_store(self) -> None:
+        """Let the store finish saving the recording, which may move its file."""
+        if self.store is not None:
+            self.store.flush()
+
+    def _save_transcript(self, transcript: str) -> None:
+        if self.store is not None:
+            self.store.mark_transcribed(self.job_id, transcript)
+
+    def cancel(self) -> None:
+        """Request cancellation.
+
+        A request that is already on the wire can't be aborted, but its
+        result is discarded and no further stages are started.
+        """
+        self._cancel_event.set()
+
+    def is_cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def _checkpoint(self) -> None:
+        if self.is_cancelled():
+            raise CancelledError()
+
+    def _enter_stage(self, stage: str) -> None:
+        self._checkpoint()
+        self.signals.stage_changed.emit(stage)
+
+    def _post_process(self, transcript: str, stream: bool, audio_key: Optional[str] = None) -> str:
+        """Run GPT post-processing, streaming partial text to ``partial`` if asked."""
+        start = time.perf_counter()
+        text = self.service.post_process_transcript(
+            transcript,
+            on_partial=self.signals.partial.emit if stream else None,
+            is_cancelled=self.is_cancelled,
+            audio_key=audio_key
+        )
+        self.timings["post_process_ms"] = (time.perf_counter() - start) * 1000
+        return text
+
+    def run(self) -> None:
+        try:
+            with get_metrics().tracing(self.trace):
+                self.execute()
+        except CancelledError:
+            self.signals.cancelled.emit()
+        except Exception as e:
+            print(f"Transcription error: {str(e)}")
+            print(f"Traceback: {traceback.format_exc()}")
+            self.signals.failed.emit(str(e))
+        finally:
+            self.cleanup()
+
+    def execute(self) -> None:
+        raise NotImplementedError
+
+    def cleanup(self) -> None:
+        pass
+
+
+class TranscriptionJob(_Job):
+    """Runs the Whisper upload and GPT post-processing off the GUI thread."""
+
+    def __init__(
+        self,
+        service: TranscriptionService,
+        audio: EncodedAudio,
+        stream: bool = False,
+        trace: Optional[Trace] = None
+    ):
+        super().__init__(service, trace)
+        self.audio = audio
+        self.stream = stream
+
+    def execute(self) -> None:
+        self._enter_stage(self.STAGE_TRANSCRIBING)
+        self._wait_for_store()
+        start = time.perf_counter()
+        transcript = self.service.whisper_transcribe(self.audio)
+        self.timings["transcribe_ms"] = (time.perf_counter() - start) * 1000
+        self.transcript = transcript or ""
+        self._save_transcript(transcript)
+
+        if transcript:
+            self._enter_stage(self.STAGE_POST_PROCESSING)
+            transcript = self._post_process(
+                transcript, self.stream, audio_key=self.service.audio_key(self.audio)
+            )
+
+        self._checkpoint()
+        self.signals.finished.emit(transcript)
+
+    def cleanup(self) -> None:
+        if self.store is None:
+            self.audio.discard()
+        else:
+            # The store's copy stays until the text is delivered
+            self.audio.data = None
+
+
+class SegmentJob(_Job):
+    """Transcribes one live segment with Whisper, without post-processing."""
+
+    def __init__(
+        self,
+        service: TranscriptionService,
+        segment: AudioSegment,
+        vad: Optional[VoiceActivityDetector] = None,
+        encoder: Optional[AudioEncoder] = None,
+        spill_dir: Optional[Path] = None
+    ):
+        super().__init__(service)
+        self.segment = segment
+        self.vad = vad
+        self.encoder = encoder or WavEncoder()
+        self.spill_dir = spill_dir
+        self.audio: Optional[EncodedAudio] = None
+
+    def execute(self) -> None:
+        self._checkpoint()
+        samples = self.segment.samples
+        if self.vad is not None:
+            result = self.vad.trim(samples)
+            print(f"Segment {self.segment.index}: {result.removed_seconds:.1f}s of silence trimmed")
+            if not result.has_speech:
+                # Nothing worth uploading, but the slot still has to be filled
+                self.signals.segment_finished.emit(self.segment.index, "")
+                return
+            samples = result.samples
+        self.audio = self.encoder.encode_audio(
+            samples, self.segment.rate, self.segment.channels,
+            name=f"segment_{self.segment.index:03d}", spill_dir=self.spill_dir
+        )
+        transcript = self.service.whisper_transcribe(self.audio)
+        self._checkpoint()
+        self.signals.segment_finished.emit(self.segment.index, transcript or "")
+
+    def cleanup(self) -> None:
+        if self.audio is not None:
+            self.audio.discard()
+
+
+class PostProcessJob(_Job):
+    """Runs GPT post-processing on an already transcribed text."""
+
+    def __init__(
+        self,
+        service: TranscriptionService,
+        transcript: str,
+        stream: bool = False,
+        trace: Optional[Trace] = None
+    ):
+        super().__init__(service, trace)
+        self.transcript = transcript
+        self.stream = stream
+
+    def execute(self) -> None:
+        self._enter_stage(self.STAGE_POST_PROCESSING)
+        transcript = self._post_process(self.transcript, self.stream)
+        self._checkpoint()
+        self.signals.finished.emit(transcript)
@@ -0,0 +1,62 @@
+import sys
+import types
+import numpy as np
+import pytest
+from src.core.asr import HostedWhisperBackend, LocalWhisperBackend, get_asr_backend, parallel_workers
+from src.core.config import DEFAULT_SETTINGS
+from src.core.encoders import WavEncoder
+
+class FakeModel:
+    def __init__(self):
+        self.inputs = []
+
+    def transcribe(self, audio, **options):
+        self.inputs.append((audio, options))
+        return {"text": " hello there "}
+
+@pytest.fixture
+def fake_whisper(monkeypatch):
+    module = types.SimpleNamespace(loads=[])
+    def load_model(size, device=None):
+        module.loads.append(size)
+        return FakeModel()
+    module.load_model = load_model
+    monkeypatch.setitem(sys.modules, "whisper", module)
+    return module
+
+def test_local_model_is_loaded_once_and_gets_16k_float_audio(fake_whisper):
+    backend = LocalWhisperBackend("tiny")
+    backend.preload()
+    backend.preload()
+    samples = (np.sin(np.arange(48000) / 10) * 8000).astype(np.int16)
+    audio = WavEncoder().encode_audio(samples, 48000)
+    assert backend.transcribe(audio, "en") == "hello there"
+    assert backend.transcribe(audio, "en") == "hello there"
+    assert fake_whisper.loads == ["tiny"]
+    pcm, options = backend._model.inputs[0]
+    assert pcm.dtype == np.float32 and abs(pcm.size - 16000) < 100
+    assert options["language"] == "en" and options["fp16"] is False
+
+def test_missing_package_is_reported(monkeypatch):
+    monkeypatch.setitem(sys.modules, "whisper", None)
+    backend = LocalWhisperBackend()
+    audio = WavEncoder().encode_audio(np.zeros(160, dtype=np.int16), 16000)
+    with pytest.raises(RuntimeError, match="unavailable"):
+        backend.transcribe(audio, "en")
+
+def test_backend_is_chosen_from_settings():
+    local = get_asr_backend(dict(DEFAULT_SETTINGS, asr_backend="local"), lambda: None)
+    assert isinstance(local, LocalWhisperBackend) and not local.requires_api_key
+    assert local.model_id != get_asr_backend(DEFAULT_SETTINGS, lambda: None).model_id
+    assert isinstance(get_asr_backend(dict(DEFAULT_SETTINGS, asr_backend="?"), lambda: None),
+                      HostedWhisperBackend)
+
+def test_local_pool_is_opt_in_and_lazy(fake_whisper):
+    assert parallel_workers(dict(DEFAULT_SETTINGS, asr_backend="local")) == 1
+    assert parallel_workers(dict(DEFAULT_SETTINGS, asr_backend="local", parallel_workers=3)) == 3
+    backend = LocalWhisperBackend("tiny", workers=2)
+    backend.preload()
+    audio = WavEncoder().encode_audio(np.zeros(1600, dtype=np.int16), 16000)
+    # Short recordings use the one resident model; no processes are started
+    assert backend.transcribe(audio, "en") == "hello there"
+    assert backend._pool is None and fake_whisper.loads == ["tiny"]
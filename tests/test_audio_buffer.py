@@ -0,0 +1,97 @@
+import numpy as np
+import wave
+from src.core.audio_buffer import AudioBuffer, BlockQueue, DiskAudioBuffer, RingBuffer
+
+def test_write_float_converts_to_int16():
+    """Float samples are clipped and scaled into the int16 arena."""
+    buffer = AudioBuffer(rate=16000, initial_seconds=1)
+    buffer.write_float(np.array([0.0, 0.5, -1.0, 2.0], dtype=np.float32))
+    assert buffer.view().tolist() == [0, 16383, -32767, 32767]
+    assert buffer.view().dtype == np.int16
+
+def test_buffer_grows_and_keeps_samples():
+    """Writing past the initial capacity grows the arena without losing data."""
+    buffer = AudioBuffer(rate=100, initial_seconds=0.1)
+    blocks = [np.full(7, i / 10, dtype=np.float32) for i in range(10)]
+    for block in blocks:
+        buffer.write_float(block)
+    assert len(buffer) == 70
+    assert buffer.capacity >= 70
+    expected = (np.concatenate(blocks) * 32767).astype(np.int16)
+    assert np.array_equal(buffer.view(), expected)
+
+def test_earlier_view_survives_growth():
+    """A view taken before growth still sees the samples it covered."""
+    buffer = AudioBuffer(rate=10, initial_seconds=1)
+    buffer.write_float(np.full(10, 0.25, dtype=np.float32))
+    first = buffer.view()
+    buffer.write_float(np.full(50, -0.25, dtype=np.float32))
+    assert np.all(first == 8191)
+    assert buffer.duration == 6.0
+
+def test_clear_reuses_allocation():
+    buffer = AudioBuffer(rate=16000)
+    capacity = buffer.capacity
+    buffer.write_float(np.ones(100, dtype=np.float32))
+    buffer.clear()
+    assert len(buffer) == 0
+    assert buffer.capacity == capacity
+
+def test_detach_hands_over_samples_without_copying():
+    buffer = AudioBuffer(rate=10, initial_seconds=1)
+    buffer.write_float(np.full(10, 0.25, dtype=np.float32))
+    taken = buffer.detach()
+    assert len(buffer) == 0 and buffer.capacity == 10
+    buffer.write_float(np.full(10, -0.25, dtype=np.float32))
+    assert np.all(taken == 8191)
+
+def test_ring_buffer_keeps_most_recent_samples():
+    """The pre-roll ring returns the newest samples, oldest first."""
+    ring = RingBuffer(5)
+    ring.write(np.arange(3, dtype=np.float32))
+    assert ring.read().tolist() == [0, 1, 2]
+    ring.write(np.arange(3, 7, dtype=np.float32))
+    assert ring.read().tolist() == [2, 3, 4, 5, 6]
+    ring.write(np.arange(10, 20, dtype=np.float32))
+    assert ring.read().tolist() == [15, 16, 17, 18, 19]
+    ring.clear()
+    assert len(ring) == 0
+
+def test_disk_buffer_streams_valid_wav(tmp_path):
+    """Flushed blocks form a valid WAV file while recording continues."""
+    buffer = DiskAudioBuffer(tmp_path, rate=100, flush_seconds=0.1)
+    buffer.write_float(np.full(25, 0.5, dtype=np.float32))
+    # Two full staging blocks have been flushed, five samples are staged
+    with wave.open(str(buffer.path), 'rb') as wf:
+        assert wf.getnframes() == 20
+    assert len(buffer) == 25
+    view = buffer.view()
+    assert view.size == 25
+    assert np.all(view == 16383)
+
+def test_disk_buffer_clear_and_detach(tmp_path):
+    buffer = DiskAudioBuffer(tmp_path, rate=100)
+    buffer.write_float(np.ones(10, dtype=np.float32))
+    first = buffer.path
+    buffer.clear()
+    assert not first.exists()
+    assert len(buffer) == 0
+    buffer.write_float(np.ones(10, dtype=np.float32))
+    detached = buffer.detach()
+    assert detached.exists() and buffer.path != detached
+    with wave.open(str(detached), 'rb') as wf:
+        assert wf.getnframes() == 10
+    buffer.close()
+    assert not buffer.path.exists()
+
+def test_block_queue_drops_when_full():
+    """A full queue drops and counts new blocks instead of waiting."""
+    queue = BlockQueue(slots=2, block_size=4)
+    blocks = [np.full(4, i, dtype=np.float32).tobytes() for i in range(3)]
+    assert [queue.push(block) for block in blocks] == [True, True, False]
+    assert queue.dropped == 1
+    assert queue.peek().tolist() == [0, 0, 0, 0]
+    queue.advance()
+    assert queue.push(blocks[2])
+    assert queue.peek().tolist() == [1, 1, 1, 1]
+    assert len(queue) == 2
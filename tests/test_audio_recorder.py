@@ -0,0 +1,201 @@
+import os
+import time
+import tracemalloc
+import wave
+import numpy as np
+import pytest
+from src.core import audio_recorder
+from src.core.audio_buffer import DiskAudioBuffer
+from src.core.audio_recorder import AudioRecorder
+from src.core.audio_source import INPUT_OVERFLOW, ReplaySource
+from src.core.encoders import FlacEncoder, decode_audio
+from src.core.metrics import Metrics
+
+RATE = AudioRecorder.RATE
+
+def speech_like(seconds, pause_seconds=0.0):
+    t = np.arange(int(seconds * RATE)) / RATE
+    voiced = (np.sin(2 * np.pi * 220 * t) * 0.3).astype(np.float32)
+    return np.concatenate([voiced, np.zeros(int(pause_seconds * RATE), dtype=np.float32)])
+
+@pytest.fixture(autouse=True)
+def temp_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(audio_recorder, "TEMP_DIR", tmp_path)
+    monkeypatch.setattr(audio_recorder, "RECOVERED_DIR", tmp_path / "recovered")
+    return tmp_path
+
+def record(source, recorder):
+    recorder.start_recording()
+    assert source.wait(timeout=10)
+
+def test_replay_recording_is_encoded_in_memory():
+    source = ReplaySource(speech_like(2.0), RATE, realtime=False)
+    recorder = AudioRecorder(source=source)
+    recorder.vad = None
+    record(source, recorder)
+    audio = recorder.stop_recording()
+    assert audio.path is None
+    assert audio.filename.endswith(".wav")
+    assert abs(audio.duration - 2.0) < 0.1
+
+def test_live_segments_are_cut_at_pauses():
+    source = ReplaySource(
+        np.concatenate([speech_like(9.0, pause_seconds=1.0), speech_like(2.0)]),
+        RATE, realtime=False
+    )
+    recorder = AudioRecorder(source=source)
+    segments = []
+    recorder.segment_callback = segments.append
+    record(source, recorder)
+    assert recorder.stop_segmented_recording() == 2
+    assert [segment.index for segment in segments] == [0, 1]
+    assert segments[-1].is_final
+    assert abs(sum(segment.duration for segment in segments) - 12.0) < 0.1
+
+def test_segments_survive_the_next_recording():
+    source = ReplaySource(speech_like(2.0), RATE, realtime=False)
+    recorder = AudioRecorder(source=source)
+    segments = []
+    recorder.segment_callback = segments.append
+    record(source, recorder)
+    recorder.stop_segmented_recording()
+    recorded = segments[0].samples.copy()
+    # The next recording starts before the first one's segments are uploaded
+    source.samples = np.zeros_like(source.samples)
+    record(source, recorder)
+    recorder.stop_segmented_recording()
+    assert len(segments) == 2
+    assert np.array_equal(segments[0].samples, recorded)
+
+def test_live_recording_is_kept_whole():
+    source = ReplaySource(speech_like(9.0, pause_seconds=1.0), RATE, realtime=False)
+    recorder = AudioRecorder(source=source)
+    recorder.segment_callback = lambda segment: None
+    record(source, recorder)
+    recorder.stop_segmented_recording()
+    samples = recorder.take_recording()
+    assert samples.dtype == np.int16 and abs(samples.size / RATE - 10.0) < 0.1
+    # The next recording doesn't write into the handed-over samples
+    record(source, recorder)
+    recorder.stop_segmented_recording()
+    assert np.shares_memory(samples, recorder.buffer.view()) is False
+
+def test_live_stop_is_timed(monkeypatch):
+    metrics = Metrics(enabled=True)
+    monkeypatch.setattr(audio_recorder, "get_metrics", lambda: metrics)
+    source = ReplaySource(speech_like(2.0), RATE, realtime=False)
+    recorder = AudioRecorder(source=source)
+    recorder.segment_callback = lambda segment: None
+    record(source, recorder)
+    recorder.stop_segmented_recording()
+    assert metrics.histogram("record.stop").count == 1
+    assert metrics.histogram("record.drain").count == 1
+
+def test_auto_stop_fires_after_silence():
+    source = ReplaySource(speech_like(1.0, pause_seconds=2.0), RATE, realtime=False)
+    recorder = AudioRecorder(source=source)
+    fired = []
+    recorder.auto_stop_callback = lambda: fired.append(len(recorder.buffer))
+    record(source, recorder)
+    recorder.stop_recording()
+    assert len(fired) == 1
+    expected = (1.0 + recorder.AUTO_STOP_SILENCE_MS / 1000) * RATE
+    assert abs(fired[0] - expected) <= recorder.CHUNK
+
+def test_native_rate_capture_is_resampled_to_16k():
+    rate = 48000
+    t = np.arange(2 * rate) / rate
+    mono = (np.sin(2 * np.pi * 220 * t) * 0.3).astype(np.float32)
+    stereo = np.repeat(mono, 2)
+    source = ReplaySource(stereo, rate, channels=2, realtime=False)
+    recorder = AudioRecorder(source=source, native_rate=True)
+    recorder.vad = None
+    record(source, recorder)
+    audio = recorder.stop_recording()
+    assert recorder.capture_rate == rate and recorder.capture_channels == 2
+    assert abs(audio.duration - 2.0) < 0.1
+
+def test_unpaced_replay_waits_for_the_worker():
+    source = ReplaySource(speech_like(60.0), RATE, realtime=False)
+    recorder = AudioRecorder(source=source)
+    recorder.vad = None
+    record(source, recorder)
+    assert recorder.stats.dropped_blocks == 0
+    audio = recorder.stop_recording()
+    assert abs(audio.duration - 60.0) < 0.1
+
+def test_stats_count_status_flags_and_drops():
+    source = ReplaySource(speech_like(1.0), RATE, realtime=False)
+    recorder = AudioRecorder(source=source)
+    recorder.vad = None
+    record(source, recorder)
+    stats = recorder.stats
+    assert stats.dropped_blocks == 0 and not stats.lost_audio
+    recorder._audio_callback(b"", 0, None, INPUT_OVERFLOW)
+    assert recorder.stats.input_overflows == 1
+    recorder.stop_recording()
+
+def test_capture_interrupted_by_a_crash_is_recovered(temp_dir):
+    buffer = DiskAudioBuffer(temp_dir, RATE)
+    buffer.write_float(speech_like(2.0))
+    buffer.flush()
+    # No close(): the app died mid-recording
+    recorder = AudioRecorder(source=ReplaySource(speech_like(1.0), RATE, realtime=False))
+    [path] = recorder.recovered
+    assert path.parent == temp_dir / "recovered" and not buffer.path.exists()
+    with wave.open(str(path), 'rb') as wf:
+        assert wf.getnframes() == 2 * RATE
+
+def test_disk_capture_is_trimmed_like_an_in_memory_one():
+    pytest.importorskip("soundfile")
+    samples = np.concatenate([np.zeros(RATE, dtype=np.float32), speech_like(40.0, pause_seconds=3.0), speech_like(5.0)])
+    encoded = []
+    for record_to_disk in (False, True):
+        source = ReplaySource(samples, RATE, realtime=False)
+        recorder = AudioRecorder(encoder=FlacEncoder(), source=source, record_to_disk=record_to_disk)
+        record(source, recorder)
+        encoded.append(recorder.stop_recording())
+    in_memory, on_disk = encoded
+    assert on_disk.path is not None and on_disk.path.suffix == ".flac"
+    assert np.array_equal(decode_audio(on_disk)[0], decode_audio(in_memory)[0])
+    assert (on_disk.duration, on_disk.digest) == (in_memory.duration, in_memory.digest)
+
+def test_long_disk_capture_is_encoded_in_bounded_memory():
+    pytest.importorskip("soundfile")
+    source = ReplaySource(speech_like(300.0), RATE, realtime=False)
+    recorder = AudioRecorder(encoder=FlacEncoder(), source=source, record_to_disk=True)
+    record(source, recorder)
+    tracemalloc.start()
+    try:
+        audio = recorder.stop_recording()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert abs(audio.duration - 300.0) < 0.1
+    # Five minutes are 9.6 MB as int16 and twice that as float32 for VAD
+    assert peak < 6 * 1024 * 1024
+
+def test_turning_warm_mode_off_releases_the_stream():
+    source = ReplaySource(speech_like(1.0), RATE, realtime=False)
+    recorder = AudioRecorder(source=source, warm=True)
+    recorder.open_warm_stream()
+    assert recorder.stream is not None
+    recorder.set_warm(False)
+    assert recorder.stream is None and not recorder.warm
+    recorder.set_warm(True)
+    assert recorder.stream is not None
+    recorder.close_warm_stream()
+    assert recorder.stream is None
+
+def test_old_recovered_recordings_are_pruned(temp_dir, monkeypatch):
+    monkeypatch.setattr(AudioRecorder, "RECOVERED_MAX_FILES", 2)
+    recovered = temp_dir / "recovered"
+    recovered.mkdir()
+    now = time.time()
+    ages = {"expired": AudioRecorder.RECOVERED_RETENTION_SECONDS + 60, "oldest": 30, "older": 20, "newest": 10}
+    for name, age in ages.items():
+        path = recovered / f"capture_{name}.wav"
+        path.write_bytes(b"audio")
+        os.utime(path, (now - age, now - age))
+    AudioRecorder(source=ReplaySource(speech_like(1.0), RATE, realtime=False))
+    assert sorted(p.name for p in recovered.iterdir()) == ["capture_newest.wav", "capture_older.wav"]
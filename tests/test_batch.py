@@ -0,0 +1,74 @@
+import json
+import numpy as np
+from src.core.batch import BatchTranscriber, find_audio_files, load_completed
+from src.core.encoders import WavEncoder
+
+class FakeService:
+    def __init__(self, fail=(), fail_post_process=()):
+        self.fail = set(fail)
+        self.fail_post_process = set(fail_post_process)
+        self.transcribed = []
+
+    def whisper_transcribe(self, audio):
+        if audio.filename in self.fail:
+            raise RuntimeError("upload failed")
+        self.transcribed.append(audio.filename)
+        return f"words of {audio.filename}"
+
+    def audio_key(self, audio):
+        return audio.filename
+
+    def post_process_transcript(self, transcript, audio_key=None, strict=False):
+        if audio_key in self.fail_post_process:
+            assert strict  # otherwise the raw transcript would come back as success
+            raise RuntimeError("rate limited")
+        return transcript.capitalize() + "."
+
+def write_memos(directory, names):
+    samples = np.zeros(16000, dtype=np.int16)
+    for name in names:
+        WavEncoder().write(directory / name, samples, 16000)
+
+def test_find_audio_files_expands_directories_and_globs(tmp_path):
+    write_memos(tmp_path, ["a", "b"])
+    (tmp_path / "notes.txt").write_text("not audio")
+    (tmp_path / "sub").mkdir()
+    write_memos(tmp_path / "sub", ["c"])
+    assert [p.name for p in find_audio_files([str(tmp_path)])] == ["a.wav", "b.wav"]
+    assert len(find_audio_files([str(tmp_path)], recursive=True)) == 3
+    assert [p.name for p in find_audio_files([str(tmp_path / "*" / "*.wav")])] == ["c.wav"]
+
+def test_batch_writes_jsonl_and_resumes(tmp_path):
+    write_memos(tmp_path, ["a", "b", "c"])
+    files = find_audio_files([str(tmp_path)])
+    output = tmp_path / "out" / "results.jsonl"
+
+    service = FakeService(fail={"b.wav"})
+    summary = BatchTranscriber(service, output, jobs=2).run(files)
+    assert (summary.processed, summary.failed, summary.skipped) == (3, 1, 0)
+    assert summary.audio_seconds == 2.0 and len(summary.latencies_ms) == 2
+    records = {json.loads(line)["path"]: json.loads(line) for line in output.read_text().splitlines()}
+    assert records[str(files[0])]["text"] == "Words of a.wav."
+    assert records[str(files[1])]["status"] == "error"
+
+    # A rerun only retries the failed file and one that changed since
+    WavEncoder().write(tmp_path / "c", np.zeros(8000, dtype=np.int16), 16000)
+    output.open("a").write('{"path": "trunc')
+    service = FakeService()
+    summary = BatchTranscriber(service, output).run(files)
+    assert sorted(service.transcribed) == ["b.wav", "c.wav"]
+    assert summary.skipped == 1
+    assert len(load_completed(output)) == 3
+
+def test_failed_post_processing_is_retried_on_resume(tmp_path):
+    write_memos(tmp_path, ["a"])
+    files = find_audio_files([str(tmp_path)])
+    output = tmp_path / "results.jsonl"
+    summary = BatchTranscriber(FakeService(fail_post_process={"a.wav"}), output).run(files)
+    assert summary.failed == 1
+    [record] = [json.loads(line) for line in output.read_text().splitlines()]
+    assert record["status"] == "error" and record["transcript"] == "words of a.wav"
+    assert load_completed(output) == {}
+    service = FakeService()
+    BatchTranscriber(service, output).run(files)
+    assert service.transcribed == ["a.wav"]
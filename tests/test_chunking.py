@@ -0,0 +1,29 @@
+import numpy as np
+from src.core.chunking import split_at_silence, stitch_transcripts
+
+RATE = 16000
+
+def speech(seconds):
+    t = np.arange(int(seconds * RATE)) / RATE
+    return (np.sin(2 * np.pi * 220 * t) * 8000).astype(np.int16)
+
+def test_cuts_fall_in_pauses():
+    pause = np.zeros(RATE, dtype=np.int16)
+    samples = np.concatenate([speech(35), pause, speech(35), pause, speech(20)])
+    chunks = split_at_silence(samples, RATE, target_seconds=30, max_seconds=45)
+    assert len(chunks) == 3
+    assert chunks[0].start == 0 and chunks[-1].end == samples.size
+    for chunk, pause_start in zip(chunks, (35, 71)):
+        assert pause_start * RATE <= chunk.end <= (pause_start + 1) * RATE
+        assert not chunk.overlaps_previous
+
+def test_continuous_speech_is_cut_with_overlap():
+    chunks = split_at_silence(speech(100), RATE, target_seconds=30, max_seconds=45)
+    assert all(chunk.length <= 45 * RATE for chunk in chunks)
+    assert [chunk.overlaps_previous for chunk in chunks] == [False, True, True]
+    assert chunks[1].start < chunks[0].end
+
+def test_stitch_drops_repeated_words_only_across_overlaps():
+    texts = ["So we should ship it.", "Ship it on Friday, then", "then rest."]
+    assert stitch_transcripts(texts, [False, True, False]) == \
+        "So we should ship it. on Friday, then then rest."
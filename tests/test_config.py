@@ -0,0 +1,34 @@
+import os
+from src.core.config import DEFAULT_SETTINGS, ConfigStore
+
+def test_reads_are_cached_until_the_file_changes(tmp_path, monkeypatch):
+    store = ConfigStore(tmp_path)
+    store.set_api_key("key-1")
+    reads = []
+    original = type(tmp_path).read_text
+    monkeypatch.setattr(type(tmp_path), "read_text", lambda self: reads.append(self) or original(self))
+    assert store.api_key() == "key-1"
+    assert store.api_key() == "key-1"
+    assert reads == []  # the write already filled the cache
+    path = tmp_path / "config"
+    path.write_text("key-2 ")
+    os.utime(path, ns=(0, 1))  # make sure the mtime differs
+    assert store.api_key() == "key-2"
+    assert len(reads) == 1
+
+def test_watched_store_trusts_cache_until_invalidated(tmp_path):
+    store = ConfigStore(tmp_path)
+    store.set_system_prompt("first")
+    store.watched = True
+    (tmp_path / "system_prompt").write_text("second")
+    assert store.system_prompt() == "first"
+    store.invalidate()
+    assert store.system_prompt() == "second"
+
+def test_writes_are_atomic_and_leave_no_temp_files(tmp_path):
+    store = ConfigStore(tmp_path)
+    store.save_settings(dict(DEFAULT_SETTINGS, upload_format="opus"))
+    assert [p.name for p in tmp_path.iterdir()] == ["settings.json"]
+    assert store.settings()["upload_format"] == "opus"
+    assert store.clear_api_key() is False
+    assert store.api_key() is None
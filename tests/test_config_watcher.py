@@ -0,0 +1,38 @@
+from src.core.config import ConfigStore
+from src.ui.config_watcher import ConfigWatcher
+
+def make_watcher(tmp_path):
+    store = ConfigStore(tmp_path)
+    store.set_api_key("key-1")
+    watcher = ConfigWatcher(store)
+    events = []
+    watcher.changed.connect(lambda: events.append(True))
+    return store, watcher, events
+
+def test_other_files_in_the_directory_are_ignored(tmp_path):
+    store, watcher, events = make_watcher(tmp_path)
+    (tmp_path / "transcripts.sqlite3").write_bytes(b"cache")
+    (tmp_path / "metrics.jsonl").write_text("{}\n")
+    watcher.on_directory_changed(str(tmp_path))
+    assert events == []
+    assert store.api_key() == "key-1"
+    watcher.stop()
+
+def test_config_file_appearing_is_picked_up(tmp_path):
+    store, watcher, events = make_watcher(tmp_path)
+    (tmp_path / "system_prompt").write_text("Be brief.")
+    watcher.on_directory_changed(str(tmp_path))
+    assert events == [True]
+    assert str(tmp_path / "system_prompt") in watcher.watcher.files()
+    watcher.stop()
+
+def test_replaced_file_is_reloaded_and_watched_again(tmp_path):
+    store, watcher, events = make_watcher(tmp_path)
+    path = tmp_path / "config"
+    watcher.watcher.removePath(str(path))  # as an atomic replace does
+    path.write_text("key-2")
+    watcher.on_file_changed(str(path))
+    assert events == [True]
+    assert store.api_key() == "key-2"
+    assert str(path) in watcher.watcher.files()
+    watcher.stop()
@@ -0,0 +1,30 @@
+import io
+import wave
+import numpy as np
+import pytest
+from src.core.encoders import WavEncoder, FlacEncoder, get_encoder
+
+SAMPLES = (np.sin(np.linspace(0, 200, 16000)) * 10000).astype(np.int16)
+
+def test_wav_encoder_round_trip():
+    data = WavEncoder().encode(SAMPLES, 16000)
+    with wave.open(io.BytesIO(data), 'rb') as wf:
+        assert wf.getframerate() == 16000
+        decoded = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+    assert np.array_equal(decoded, SAMPLES)
+
+def test_flac_encoder_is_lossless_and_smaller():
+    soundfile = pytest.importorskip("soundfile")
+    data = FlacEncoder().encode(SAMPLES, 16000)
+    decoded, rate = soundfile.read(io.BytesIO(data), dtype='int16')
+    assert rate == 16000
+    assert np.array_equal(decoded, SAMPLES)
+    assert len(data) < len(WavEncoder().encode(SAMPLES, 16000))
+
+def test_write_uses_encoder_suffix(tmp_path):
+    path = WavEncoder().write(tmp_path / "recording", SAMPLES, 16000)
+    assert path.suffix == ".wav"
+    assert path.exists()
+
+def test_unknown_format_falls_back_to_wav():
+    assert isinstance(get_encoder("mp9"), WavEncoder)
@@ -0,0 +1,64 @@
+import threading
+import pytest
+from src.core.history import History, HistoryEntry
+
+@pytest.fixture
+def history(tmp_path):
+    history = History(tmp_path / "history.sqlite3")
+    yield history
+    history.close()
+
+def add(history, *texts):
+    for i, text in enumerate(texts):
+        history.add(HistoryEntry(text=text, transcript=text.lower(), created=1000.0 + i))
+    history.flush()
+
+def test_entries_round_trip(history):
+    history.add(HistoryEntry(
+        text="Hello there.", transcript="hello there", audio_seconds=1.5,
+        latencies={"transcribe_ms": 410.0, "total_ms": 900.0}
+    ))
+    history.flush()
+    [entry] = history.search()
+    assert (entry.text, entry.transcript, entry.audio_seconds) == ("Hello there.", "hello there", 1.5)
+    assert entry.latencies == {"transcribe_ms": 410.0, "total_ms": 900.0}
+    assert entry.id is not None
+
+def test_search_matches_word_prefixes_newest_first(history):
+    add(history, "Meeting notes for Monday.", "Budget review tomorrow.", "Notes on the meeting room.")
+    assert [e.text for e in history.search("meet")] == ["Notes on the meeting room.", "Meeting notes for Monday."]
+    assert [e.text for e in history.search("budg rev")] == ["Budget review tomorrow."]
+    assert history.search("eting") == []
+    assert len(history.search("", limit=2)) == 2
+
+def test_search_ignores_query_syntax(history):
+    add(history, 'She said "don\'t" -- twice, AND left (quickly).')
+    assert len(history.search('"don\'t" AND (quick* -')) == 1
+
+def test_like_fallback_matches_substrings(history):
+    add(history, "Meeting notes for Monday.", "Under_score test.")
+    history.full_text = False
+    assert [e.text for e in history.search("notes mon")] == ["Meeting notes for Monday."]
+    assert [e.text for e in history.search("under_score")] == ["Under_score test."]
+
+def test_has_pending_until_written(history, monkeypatch):
+    assert not history.has_pending()
+    release = threading.Event()
+    write = history._write
+    monkeypatch.setattr(history, "_write", lambda entries: (release.wait(), write(entries)))
+    history.add(HistoryEntry(text="queued"))
+    assert history.has_pending()
+    release.set()
+    history.flush()
+    assert not history.has_pending()
+    assert len(history) == 1
+
+def test_close_writes_queued_entries(tmp_path):
+    history = History(tmp_path / "history.sqlite3")
+    for i in range(1000):
+        history.add(HistoryEntry(text=f"entry {i}"))
+    history.close()
+    reopened = History(tmp_path / "history.sqlite3")
+    assert len(reopened) == 1000
+    assert reopened.search("entry")[0].text == "entry 999"
+    reopened.close()
@@ -0,0 +1,63 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+from src.core.config import DEFAULT_SETTINGS, ConfigStore
+from src.core.http_client import SharedHttpClient
+from src.core.transcription import TranscriptionService
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    connections = 0
+
+    def setup(self):
+        super().setup()
+        Handler.connections += 1
+
+    def do_HEAD(self):
+        self.send_response(401)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def server():
+    Handler.connections = 0
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}/v1"
+    httpd.shutdown()
+    httpd.server_close()
+
+def test_warm_connection_is_reused(server):
+    """A warm-up leaves a pooled connection the next request reuses."""
+    http = SharedHttpClient(keepalive_seconds=30)
+    assert http.warm(server)
+    assert not http.is_idle()
+    http.client.head(server)
+    assert Handler.connections == 1
+    http.close()
+
+def test_warm_failure_is_reported_not_raised():
+    http = SharedHttpClient(connect_timeout=0.5)
+    assert not http.warm("http://127.0.0.1:9/v1")
+    assert http.is_idle()
+
+def test_pool_survives_api_key_changes(tmp_path):
+    config = ConfigStore(tmp_path)
+    config.set_api_key("key-1")
+    with patch("src.core.transcription.OpenAI") as openai:
+        service = TranscriptionService(dict(DEFAULT_SETTINGS, transcript_cache=False), config)
+        pool = service.http.client
+        assert service._ensure_client()
+        assert openai.call_args.kwargs["http_client"] is pool
+        service.clear_api_key()
+        config.set_api_key("key-2")
+        service.load_api_key()
+        assert service._ensure_client()
+        assert openai.call_args.kwargs["api_key"] == "key-2"
+        assert service.http.client is pool
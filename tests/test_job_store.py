@@ -0,0 +1,89 @@
+import threading
+import numpy as np
+from src.core.encoders import EncodedAudio, decode_audio, pcm_digest
+from src.core.job_store import JobStore
+
+def make_store(tmp_path):
+    return JobStore(tmp_path / "jobs.sqlite3", tmp_path / "jobs")
+
+def make_audio(data=b"RIFF audio"):
+    return EncodedAudio(filename="recording.wav", mime_type="audio/wav", data=data, duration=1.5, digest="abc")
+
+def test_recording_is_resumed_until_completed(tmp_path):
+    store = make_store(tmp_path)
+    job_id = store.add_recording(make_audio())
+    store.close()
+
+    # As after a crash: a new store sees the job and its audio
+    store = make_store(tmp_path)
+    [job] = store.unfinished()
+    assert job.id == job_id and job.stage == JobStore.STAGE_RECORDED
+    assert job.audio.path.read_bytes() == b"RIFF audio"
+    assert (job.audio.duration, job.audio.digest) == (1.5, "abc")
+
+    store.complete(job_id)
+    assert store.unfinished() == []
+    assert not job.audio.path.exists()
+
+def test_transcribed_job_resumes_with_its_transcript(tmp_path):
+    store = make_store(tmp_path)
+    job_id = store.add_recording(make_audio())
+    store.mark_transcribed(job_id, "hello there")
+    other_id = store.add_recording(make_audio())
+    jobs = store.unfinished()
+    assert [(job.id, job.stage, job.transcript) for job in jobs] == [
+        (job_id, JobStore.STAGE_TRANSCRIBED, "hello there"),
+        (other_id, JobStore.STAGE_RECORDED, None),
+    ]
+    assert jobs[0].audio is None
+
+def test_spilled_recording_is_moved_into_the_store(tmp_path):
+    spill = tmp_path / "temp_recording.wav"
+    spill.write_bytes(b"spilled")
+    audio = EncodedAudio.from_path(spill)
+    store = make_store(tmp_path)
+    store.add_recording(audio)
+    store.flush()
+    assert not spill.exists()
+    assert audio.path.parent == tmp_path / "jobs"
+    assert audio.path.read_bytes() == b"spilled"
+
+def test_job_gives_up_after_max_attempts(tmp_path):
+    store = make_store(tmp_path)
+    job_id = store.add_recording(make_audio())
+    for _ in range(JobStore.MAX_ATTEMPTS - 1):
+        store.fail(job_id, "connection error")
+    assert store.unfinished()[0].attempts == JobStore.MAX_ATTEMPTS - 1
+    store.fail(job_id, "connection error")
+    assert store.unfinished() == []
+    # Kept for manual recovery, not resumed
+    assert len(store) == 1
+
+def test_discard_deletes_audio(tmp_path):
+    store = make_store(tmp_path)
+    job_id = store.add_recording(make_audio())
+    store.discard(job_id)
+    assert len(store) == 0
+    assert list((tmp_path / "jobs").iterdir()) == []
+
+def test_writes_wait_for_the_writer_thread(tmp_path, monkeypatch):
+    store = make_store(tmp_path)
+    release = threading.Event()
+    monkeypatch.setattr(store, "_write_file", lambda path, data: (release.wait(), path.write_bytes(data)))
+    job_id = store.add_recording(make_audio())
+    store.complete(job_id)
+    # Neither call waited on the disk
+    assert not release.is_set()
+    release.set()
+    assert len(store) == 0
+    store.close()
+
+def test_samples_are_encoded_on_the_writer_thread(tmp_path):
+    store = make_store(tmp_path)
+    samples = np.zeros(16000, dtype=np.int16)
+    job_id = store.add_samples(samples, 16000)
+    [job] = store.unfinished()
+    assert job.id == job_id and job.audio.mime_type == "audio/wav"
+    assert (job.audio.duration, job.audio.digest) == (1.0, pcm_digest(samples, 16000))
+    assert np.array_equal(decode_audio(job.audio)[0], samples)
+    store.close()
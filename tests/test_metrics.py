@@ -0,0 +1,54 @@
+import json
+import pytest
+from src.core.metrics import Metrics
+
+def test_disabled_metrics_record_nothing(tmp_path):
+    metrics = Metrics(enabled=False, export_path=tmp_path / "metrics.jsonl")
+    first, second = metrics.span("a"), metrics.span("b", 10)
+    assert first is second
+    with first as span:
+        span.add_bytes(5)
+    metrics.record("c", 1.0)
+    assert metrics.start_trace() is None
+    metrics.flush(summary=True)
+    assert metrics.snapshot() == {} and not (tmp_path / "metrics.jsonl").exists()
+
+def test_spans_fill_rolling_histograms():
+    metrics = Metrics(enabled=True, window=10)
+    for ms in range(1, 21):
+        metrics.record("asr.request", ms / 1000, nbytes=100)
+    with pytest.raises(ValueError):
+        with metrics.span("post_process"):
+            raise ValueError()
+    histogram = metrics.histogram("asr.request")
+    assert histogram.count == 20 and len(histogram.seconds) == 10
+    summary = metrics.snapshot()["asr.request"]
+    assert summary["p50_ms"] == pytest.approx(15.5) and summary["max_ms"] == 20
+    assert summary["mean_bytes"] == 100
+    assert metrics.snapshot()["post_process"]["errors"] == 1
+
+def test_flush_exports_traced_events_as_json_lines(tmp_path):
+    path = tmp_path / "metrics.jsonl"
+    metrics = Metrics(enabled=True, export_path=path)
+    trace = metrics.start_trace()
+    with metrics.tracing(trace):
+        with metrics.span("record.encode", format="flac") as span:
+            span.add_bytes(2048)
+    with metrics.span("clipboard"):
+        pass
+    metrics.flush(summary=True)
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert lines[0]["span"] == "record.encode" and lines[0]["trace"] == trace.id
+    assert lines[0]["bytes"] == 2048 and lines[0]["format"] == "flac"
+    assert "trace" not in lines[1]
+    assert {line.get("summary") for line in lines[2:]} == {"record.encode", "clipboard"}
+    metrics.flush()
+    assert len(path.read_text().splitlines()) == 4
+
+def test_flush_later_writes_off_the_calling_thread(tmp_path):
+    path = tmp_path / "metrics.jsonl"
+    metrics = Metrics(enabled=True, export_path=path)
+    assert metrics.flush_later() is None  # nothing queued
+    metrics.record("clipboard", 0.001)
+    metrics.flush_later().result()
+    assert json.loads(path.read_text())["span"] == "clipboard"
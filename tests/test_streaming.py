@@ -0,0 +1,46 @@
+from src.core.streaming import TranscriptAssembler, UtteranceQueue
+
+def test_assembler_stitches_out_of_order_segments():
+    """Segments finishing out of order are joined in recording order."""
+    assembler = TranscriptAssembler()
+    assembler.add(2, "third")
+    assembler.add(0, " first ")
+    assert not assembler.is_complete()
+    assembler.add(1, "second")
+    assert not assembler.is_complete()  # total unknown until recording stops
+    assembler.set_total(3)
+    assert assembler.is_complete()
+    assert assembler.text() == "first second third"
+
+def test_assembler_skips_empty_segments():
+    assembler = TranscriptAssembler()
+    assembler.add(0, "hello")
+    assembler.add(1, "")
+    assembler.add(2, "world")
+    assembler.set_total(3)
+    assert assembler.text() == "hello world"
+
+def test_utterance_queue_limits_concurrency_and_keeps_order():
+    started = []
+    queue = UtteranceQueue(started.append, max_in_flight=2)
+    slots = [queue.reserve() for _ in range(4)]
+    for slot in slots:
+        queue.submit(slot, f"job{slot}")
+    assert started == ["job0", "job1"]
+    assert queue.finish(1, "second") == []  # held back until the first is done
+    assert started == ["job0", "job1", "job2"]
+    assert queue.finish(0, "first") == [(0, "first"), (1, "second")]
+    assert queue.is_next(2) and queue.pending == 2
+
+def test_utterance_queue_waits_for_late_submissions_and_cancels():
+    started = []
+    queue = UtteranceQueue(started.append, max_in_flight=1)
+    live, plain = queue.reserve(), queue.reserve()
+    queue.submit(plain, "plain")
+    assert queue.finish(plain, "b") == []  # the live utterance is still waiting for segments
+    queue.submit(live, "live")
+    assert queue.finish(live, "a") == [(live, "a"), (plain, "b")]
+    late = queue.reserve()
+    queue.submit(late, "late")
+    assert queue.cancel() == ["late"]
+    assert queue.finish(late, "ignored") == [] and queue.pending == 0
@@ -0,0 +1,36 @@
+from src.core.transcript_cache import PostProcessMemo, TranscriptCache, content_key
+
+def test_entries_persist_across_reopen(tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    cache = TranscriptCache(path)
+    cache.put("a", "hello")
+    cache.close()
+    assert TranscriptCache(path).get("a") == "hello"
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = TranscriptCache(tmp_path / "cache.sqlite3", max_bytes=10)
+    cache.put("a", "aaaa")
+    cache.put("b", "bbbb")
+    assert cache.get("a") == "aaaa"  # b is now the least recently used
+    cache.put("c", "cccc")
+    assert cache.get("b") is None
+    assert cache.get("a") == "aaaa" and cache.get("c") == "cccc"
+    assert cache.size <= 10
+
+def test_content_key_separates_parts():
+    assert content_key("ab", "c") != content_key("a", "bc")
+    assert content_key("ab", "c") == content_key("ab", "c")
+
+def test_memo_matches_normalized_transcripts(tmp_path):
+    memo = PostProcessMemo(TranscriptCache(tmp_path / "cache.sqlite3"))
+    memo.put(memo.key("prompt", "Yes."), "Yes.")
+    assert memo.get(memo.key("prompt", "  yes ")) == "Yes."
+    assert memo.get(memo.key("other prompt", "Yes.")) is None
+
+def test_memo_prompt_change_clears_memory_but_disk_survives(tmp_path):
+    memo = PostProcessMemo(TranscriptCache(tmp_path / "cache.sqlite3"), max_entries=2)
+    key = memo.key("prompt", "next item")
+    memo.put(key, "Next item.")
+    memo.key("new prompt", "next item")
+    assert len(memo) == 0
+    assert memo.get(key) == "Next item."
@@ -1,49 +1,141 @@
+import numpy as np
 import pytest
 from pathlib import Path
 from unittest.mock import Mock, patch
+from benchmarks.mock_openai import MockOpenAIServer
+from src.core.config import DEFAULT_SETTINGS, ConfigStore
+from src.core.encoders import WavEncoder
 from src.core.transcription import TranscriptionService
 
+@pytest.fixture(autouse=True)
+def cache_file(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.core.transcription.CACHE_FILE", tmp_path / "transcripts.sqlite3")
+
 @pytest.fixture
 def mock_openai():
     with patch('src.core.transcription.OpenAI') as mock:
         yield mock
 
 @pytest.fixture
-def transcription_service(mock_openai):
-    mock_openai.return_value.api_key = 'test_key'
-    return TranscriptionService()
-
-def test_transcription_service_initialization(mock_openai):
-    """Test that TranscriptionService initializes correctly with API key."""
-    mock_openai.return_value.api_key = 'test_key'
-    service = TranscriptionService()
-    assert service.client is not None
-
-def test_transcription_service_initialization_no_api_key(mock_openai):
-    """Test that TranscriptionService raises error without API key."""
-    mock_openai.return_value.api_key = None
-    with pytest.raises(ValueError):
-        TranscriptionService()
-
-def test_transcribe_audio_success(transcription_service, tmp_path):
-    """Test successful audio transcription."""
-    # Create a dummy audio file
-    audio_path = tmp_path / "test.wav"
-    audio_path.write_bytes(b"dummy audio content")
-    
-    # Mock the transcription response
-    mock_response = "Test transcription"
-    transcription_service.client.audio.transcriptions.create.return_value = mock_response
-    
-    result = transcription_service.transcribe_audio(audio_path)
-    assert result == mock_response
-
-def test_refine_prompt_success(transcription_service):
-    """Test successful prompt refinement."""
-    mock_response = Mock()
-    mock_response.choices = [Mock()]
-    mock_response.choices[0].message.content = "Refined test prompt"
-    transcription_service.client.chat.completions.create.return_value = mock_response
-    
-    result = transcription_service.refine_prompt("Test prompt")
-    assert result == "Refined test prompt" 
\ No newline at end of file
+def mock_api():
+    with MockOpenAIServer(latency_ms=0, token_ms=0, transcript="hello from the mock") as server:
+        yield server
+
+@pytest.fixture
+def transcription_service(mock_api, tmp_path, monkeypatch):
+    """A real service and OpenAI client talking to the local mock server."""
+    monkeypatch.delenv("OPENAI_BASE_URL", raising=False)
+    config = ConfigStore(tmp_path)
+    config.set_api_key("test_key")
+    settings = dict(DEFAULT_SETTINGS, api_base_url=mock_api.url)
+    service = TranscriptionService(settings, config)
+    yield service
+    service.close()
+
+def test_transcription_service_initialization(transcription_service, mock_api):
+    """The service loads the stored key and sends requests to the configured base URL."""
+    assert transcription_service.api_key == "test_key"
+    assert transcription_service.is_ready()
+    assert transcription_service._ensure_client()
+    assert str(transcription_service.client.base_url).rstrip("/") == mock_api.url
+
+def test_transcription_service_initialization_no_api_key(tmp_path):
+    """Without an API key the service is not ready and transcription fails clearly."""
+    service = TranscriptionService(config=ConfigStore(tmp_path))
+    assert not service.is_ready()
+    audio = WavEncoder().encode_audio(np.zeros(1600, dtype=np.int16), 16000)
+    with pytest.raises(RuntimeError, match="API key"):
+        service.whisper_transcribe(audio)
+
+def test_base_url_from_environment(tmp_path, monkeypatch):
+    monkeypatch.setenv("OPENAI_BASE_URL", "http://127.0.0.1:9/v1")
+    service = TranscriptionService(dict(DEFAULT_SETTINGS, api_base_url="http://proxy/v1"), ConfigStore(tmp_path))
+    assert service.base_url == "http://127.0.0.1:9/v1"
+
+def test_transcribe_audio_success(transcription_service, mock_api, tmp_path):
+    """A recording on disk is transcribed and post-processed end to end."""
+    audio_path = WavEncoder().write(tmp_path / "test", np.zeros(16000, dtype=np.int16), 16000)
+    assert transcription_service.transcribe_audio(audio_path) == "Hello from the mock."
+    assert mock_api.requests["/v1/audio/transcriptions"] == 1
+    assert mock_api.requests["/v1/chat/completions"] == 1
+
+def test_post_process_streams_from_server(transcription_service):
+    partials = []
+    result = transcription_service.post_process_transcript("one two three", on_partial=partials.append)
+    assert result == "One two three."
+    assert partials == ["One", "One two", "One two three."]
+
+def stream_chunk(text):
+    chunk = Mock()
+    chunk.choices = [Mock()]
+    chunk.choices[0].delta.content = text
+    return chunk
+
+@pytest.fixture
+def streaming_service(mock_openai, tmp_path):
+    config = ConfigStore(tmp_path)
+    config.set_api_key("test_key")
+    return TranscriptionService(config=config)
+
+def test_post_process_streams_partial_text(streaming_service):
+    """Streamed completions report the growing text and return the whole of it."""
+    stream = Mock()
+    stream.__iter__ = Mock(return_value=iter([stream_chunk("Hello"), stream_chunk(", world.")]))
+    streaming_service._ensure_client()
+    streaming_service.client.chat.completions.create.return_value = stream
+    partials = []
+    result = streaming_service.post_process_transcript("hello world", on_partial=partials.append)
+    assert result == "Hello, world."
+    assert partials == ["Hello", "Hello, world."]
+    assert streaming_service.client.chat.completions.create.call_args.kwargs["stream"] is True
+    stream.close.assert_called_once()
+
+def test_post_process_stream_stops_when_cancelled(streaming_service):
+    chunks = [stream_chunk("One"), stream_chunk(" two")]
+    streaming_service._ensure_client()
+    streaming_service.client.chat.completions.create.return_value = chunks
+    partials = []
+    streaming_service.post_process_transcript(
+        "one two", on_partial=partials.append, is_cancelled=lambda: bool(partials)
+    )
+    assert partials == ["One"]
+
+def test_strict_post_process_raises_instead_of_falling_back(streaming_service):
+    streaming_service._ensure_client()
+    streaming_service.client.chat.completions.create.side_effect = RuntimeError("rate limited")
+    assert streaming_service.post_process_transcript("one two") == "one two"
+    with pytest.raises(RuntimeError, match="rate limited"):
+        streaming_service.post_process_transcript("one two", strict=True)
+
+def test_whisper_results_are_cached_by_audio(streaming_service):
+    """The same samples are only uploaded once, whatever the file is called."""
+    samples = (np.sin(np.arange(1600) / 5) * 8000).astype(np.int16)
+    streaming_service._ensure_client()
+    create = streaming_service.client.audio.transcriptions.create
+    create.return_value = "cached words"
+    first = WavEncoder().encode_audio(samples, 16000, name="first")
+    second = WavEncoder().encode_audio(samples, 16000, name="second")
+    assert streaming_service.whisper_transcribe(first) == "cached words"
+    assert streaming_service.whisper_transcribe(second) == "cached words"
+    assert create.call_count == 1
+
+def test_repeated_phrases_are_post_processed_once(streaming_service):
+    streaming_service._ensure_client()
+    create = streaming_service.client.chat.completions.create
+    create.return_value.choices[0].message.content = "Next item."
+    assert streaming_service.post_process_transcript("next item") == "Next item."
+    assert streaming_service.post_process_transcript("Next item") == "Next item."
+    assert create.call_count == 1
+
+def test_long_recordings_are_transcribed_in_chunks(streaming_service):
+    t = np.arange(16000 * 35) / 16000
+    voiced = (np.sin(2 * np.pi * 220 * t) * 8000).astype(np.int16)
+    samples = np.concatenate([voiced, np.zeros(16000, dtype=np.int16), voiced])
+    audio = WavEncoder().encode_audio(samples, 16000)
+    streaming_service.parallel_workers = 2
+    streaming_service.parallel_min_seconds = 60
+    seen = []
+    streaming_service.asr.transcribe = lambda piece, language: seen.append(piece.duration) or \
+        f"part {len(seen)}"
+    assert streaming_service.whisper_transcribe(audio) in ("part 1 part 2", "part 2 part 1")
+    assert len(seen) == 2 and all(30 < seconds < 40 for seconds in seen)
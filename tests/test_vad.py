@@ -0,0 +1,46 @@
+import numpy as np
+from src.core.vad import VoiceActivityDetector
+
+RATE = 16000
+
+def tone(seconds, amplitude=8000):
+    t = np.arange(int(seconds * RATE)) / RATE
+    return (np.sin(2 * np.pi * 220 * t) * amplitude).astype(np.int16)
+
+def silence(seconds):
+    rng = np.random.default_rng(0)
+    return (rng.standard_normal(int(seconds * RATE)) * 10).astype(np.int16)
+
+def test_trim_removes_leading_and_trailing_silence():
+    vad = VoiceActivityDetector(RATE)
+    audio = np.concatenate([silence(1.0), tone(1.0), silence(1.0)])
+    result = vad.trim(audio)
+    assert result.original_seconds == 3.0
+    # Speech plus the hangover padding on each side
+    assert 1.0 <= result.kept_seconds <= 1.0 + 2 * vad.HANGOVER_MS / 1000 + 0.05
+    assert abs(result.removed_seconds - (3.0 - result.kept_seconds)) < 1e-9
+
+def test_trim_compresses_long_pauses():
+    vad = VoiceActivityDetector(RATE, max_pause_ms=300)
+    audio = np.concatenate([tone(0.5), silence(3.0), tone(0.5)])
+    result = vad.trim(audio)
+    assert result.kept_seconds < 1.0 + 0.3 + 2 * vad.HANGOVER_MS / 1000 + 0.1
+    assert result.removed_seconds > 2.0
+
+def test_trim_keeps_short_pauses():
+    vad = VoiceActivityDetector(RATE)
+    audio = np.concatenate([tone(0.5), silence(0.2), tone(0.5)])
+    result = vad.trim(audio)
+    assert result.removed_seconds < 0.05
+
+def test_trim_silence_only_has_no_speech():
+    vad = VoiceActivityDetector(RATE)
+    assert not vad.trim(silence(2.0)).has_speech
+    assert not vad.trim(np.zeros(0, dtype=np.int16)).has_speech
+
+def test_keep_frames_in_chunks_matches_trim():
+    vad = VoiceActivityDetector(RATE, max_pause_ms=300)
+    audio = np.concatenate([silence(0.7), tone(0.5), silence(2.0), tone(0.3), silence(0.5)])
+    keep = vad.keep_frames(audio, chunk_frames=7)
+    samples = audio[np.repeat(keep, vad.frame_length)[:audio.size]]
+    assert np.array_equal(samples, vad.trim(audio).samples)
@@ -0,0 +1,94 @@
+import numpy as np
+from unittest.mock import Mock
+from src.core.audio_recorder import AudioSegment
+from src.core.encoders import EncodedAudio
+from src.ui.workers import PostProcessJob, SegmentJob, TranscriptionJob
+
+def make_service(transcript="hello there", text="Hello there."):
+    service = Mock()
+    service.whisper_transcribe.return_value = transcript
+    service.post_process_transcript.return_value = text
+    service.audio_key.return_value = "key"
+    return service
+
+def make_audio(tmp_path):
+    path = tmp_path / "recording.wav"
+    path.write_bytes(b"RIFF audio")
+    return EncodedAudio.from_path(path)
+
+def connect(job):
+    """Collect what the job emits; run() is called directly, so slots run inline."""
+    events = []
+    for name in ("stage_changed", "segment_finished", "finished", "failed", "cancelled"):
+        getattr(job.signals, name).connect(lambda *args, name=name: events.append((name, *args)))
+    return events
+
+def test_transcription_job_emits_post_processed_text(tmp_path):
+    service = make_service()
+    job = TranscriptionJob(service, make_audio(tmp_path))
+    events = connect(job)
+    job.run()
+    assert events == [
+        ("stage_changed", TranscriptionJob.STAGE_TRANSCRIBING),
+        ("stage_changed", TranscriptionJob.STAGE_POST_PROCESSING),
+        ("finished", "Hello there."),
+    ]
+    assert job.transcript == "hello there"
+    assert set(job.timings) == {"transcribe_ms", "post_process_ms"}
+    # Not persisted, so the spill file goes with the job
+    assert not job.audio.exists()
+
+def test_cancelled_job_emits_no_result(tmp_path):
+    service = make_service()
+    job = TranscriptionJob(service, make_audio(tmp_path))
+    # The user cancels while the upload is on the wire
+    service.whisper_transcribe.side_effect = lambda audio: (job.cancel(), "hello there")[1]
+    events = connect(job)
+    job.run()
+    assert events[-1] == ("cancelled",)
+    assert not any(name in ("finished", "failed") for name, *_ in events)
+    service.post_process_transcript.assert_not_called()
+
+def test_job_cancelled_before_it_starts_does_nothing():
+    service = make_service()
+    job = PostProcessJob(service, "hello there")
+    job.cancel()
+    events = connect(job)
+    job.run()
+    assert events == [("cancelled",)]
+    service.post_process_transcript.assert_not_called()
+
+def test_errors_are_routed_to_failed(tmp_path):
+    service = make_service()
+    service.whisper_transcribe.side_effect = RuntimeError("connection error")
+    job = TranscriptionJob(service, make_audio(tmp_path))
+    events = connect(job)
+    job.run()
+    assert events[-1] == ("failed", "connection error")
+    assert not any(name in ("finished", "cancelled") for name, *_ in events)
+
+def test_persisted_job_saves_its_transcript_and_keeps_the_audio(tmp_path):
+    store = Mock()
+    job = TranscriptionJob(make_service(), make_audio(tmp_path))
+    job.persist(store, "job-1")
+    job.run()
+    store.flush.assert_called_once()
+    store.mark_transcribed.assert_called_once_with("job-1", "hello there")
+    assert job.audio.path.exists()
+
+def test_segment_job_emits_its_index(tmp_path):
+    segment = AudioSegment(index=3, samples=np.zeros(1600, dtype=np.int16), rate=16000)
+    job = SegmentJob(make_service(), segment, spill_dir=tmp_path)
+    events = connect(job)
+    job.run()
+    assert events == [("segment_finished", 3, "hello there")]
+    assert not job.audio.exists()
+
+def test_failed_segment_is_routed_to_failed(tmp_path):
+    service = make_service()
+    service.whisper_transcribe.side_effect = RuntimeError("rate limited")
+    segment = AudioSegment(index=0, samples=np.zeros(1600, dtype=np.int16), rate=16000)
+    job = SegmentJob(service, segment)
+    events = connect(job)
+    job.run()
+    assert events == [("failed", "rate limited")]